@@ -0,0 +1,87 @@
+"""
+Compare request concurrency of the threaded (pymongo in threadpool) and asyncio
+(motor) driver paths.
+
+Each mocked MongoDB call sleeps for LATENCY seconds to stand in for a database round
+trip. The threaded path is bounded by the Starlette threadpool (40 threads by
+default), the async path is not.
+
+"""
+
+import time
+import asyncio
+import httpx
+
+from harness import mock_driver_module, load, report
+from mocked_utils import mock_mongo_api  # type: ignore
+
+LATENCY = 0.05
+
+CONCURRENCY = [1, 10, 40, 100, 200]
+
+
+class SlowMongoAPI(mock_mongo_api.MongoAPI):
+    # The mocked iter_column() and read_overrides() read through read_column().
+    def read_column(self, query=None, fields=None):
+        time.sleep(LATENCY)
+        return super().read_column(query, fields)
+
+
+class SlowAsyncMongoAPI(mock_mongo_api.AsyncMongoAPI):
+    async def read_column(self, query=None, fields=None):
+        await asyncio.sleep(LATENCY)
+        return await super().read_column(query, fields)
+
+    async def iter_column(self, query=None, fields=None, sort=None):
+        await asyncio.sleep(LATENCY)
+        async for document in super().iter_column(query, fields, sort):
+            yield document
+
+    async def read_overrides(self, query=None, sort=None, limit=0):
+        await asyncio.sleep(LATENCY)
+        return await super().read_overrides(query, sort, limit)
+
+
+async def burst(app, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://netdb') as c:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(c.get('/column/device/ROUTER1') for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start
+
+    assert all(r.status_code == 200 for r in responses)
+
+    return elapsed
+
+
+def main():
+    app_module = load(
+        'main',
+        mock_driver_module(MongoAPI=SlowMongoAPI, AsyncMongoAPI=SlowAsyncMongoAPI),
+    )
+    settings = app_module.NetdbSettings.__settings__
+
+    rows = []
+    for concurrency in CONCURRENCY:
+        row: dict = {'concurrency': concurrency}
+
+        for name, async_driver in [('threaded', False), ('async', True)]:
+            settings.async_driver = async_driver
+            elapsed = asyncio.run(burst(app_module.app, concurrency))
+
+            row[f'{name}_ms'] = round(elapsed * 1000, 1)
+            row[f'{name}_req_s'] = round(concurrency / elapsed, 1)
+
+        rows.append(row)
+
+    report(
+        f'GET /column/device/ROUTER1, {LATENCY * 1000:.0f} ms per MongoDB call',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare encode time, decode time and size of the column response formats for the
+mocked ROUTER1 interface set copied to N devices.
+
+pretty:   PrettyJSONResponse (the previous default), decoded with json.loads
+json:     compact NetDBJSONResponse, decoded with json.loads
+msgpack:  MsgPackResponse (Accept: application/msgpack), decoded with msgpack
+cbor:     CBORResponse (Accept: application/cbor), decoded with cbor2
+
+"""
+
+import json
+
+import cbor2
+import msgpack
+
+from harness import load, timeit, report
+from mocked_data import interface  # type: ignore
+
+SIZES = [10, 100, 1000]
+
+FORMATS = [
+    ('pretty', 'application/json', True, json.loads),
+    ('json', 'application/json', False, json.loads),
+    ('msgpack', 'application/msgpack', False, msgpack.unpackb),
+    ('cbor', 'application/cbor', False, cbor2.loads),
+]
+
+
+def main():
+    column_odm = load('odm.column_odm')
+    api_resources = load('util.api_resources')
+
+    container_class = column_odm.COLUMN_FACTORY['interface']
+    router1 = interface.mock_standard_interface_data()['ROUTER1']
+
+    for size in SIZES:
+        out = column_odm.ColumnODM(
+            container=container_class(
+                datasource='netbox',
+                weight=150,
+                column={f'ROUTER{i}': router1 for i in range(size)},
+            )
+        ).pruned_column
+
+        repeat = 5 if size >= 1000 else 20
+
+        rows = []
+        for name, media_type, pretty, decode in FORMATS:
+
+            def encode():
+                return api_resources.netdb_response(
+                    out, 'Column.', pretty, media_type=media_type
+                ).body
+
+            body = bytes(encode())
+            assert decode(body)['out'] == out
+
+            rows.append(
+                {
+                    'format': name,
+                    'kb': round(len(body) / 1024, 1),
+                    'encode_ms': timeit(encode, repeat)['median_ms'],
+                    'decode_ms': timeit(lambda: decode(body), repeat)['median_ms'],
+                }
+            )
+
+        report(f'/column/interface response, {size} devices (medians)', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare PUT /column latency of the former per document replace path (one full device
+column read plus one replace_one round trip per document) against the bulk path
+(one device read for the affected sets plus a single bulk_write).
+
+Each mocked MongoDB call sleeps for LATENCY seconds to stand in for a database round
+trip.
+
+"""
+
+import time
+import copy
+
+from harness import mock_driver_module, load, timeit, report
+from mocked_data import interface  # type: ignore
+from mocked_utils import mock_mongo_api  # type: ignore
+
+LATENCY = 0.002
+
+ELEMENTS = [1, 8, 48, 200]
+
+
+class SlowMongoAPI(mock_mongo_api.MongoAPI):
+    def read_column(self, query=None):
+        time.sleep(LATENCY)
+        return super().read_column(query)
+
+    def replace_one(self, document):
+        time.sleep(LATENCY)
+        return super().replace_one(document)
+
+    def replace_many(self, documents):
+        time.sleep(LATENCY)
+        return super().replace_many(documents)
+
+    def bump_revision(self, column_type):
+        time.sleep(LATENCY)
+        return super().bump_revision(column_type)
+
+
+def interfaces(count: int) -> dict:
+    template = interface.mock_standard_interface_data()['ROUTER1']['bond0']
+
+    return {'ROUTER1': {f'bond{i}': copy.deepcopy(template) for i in range(count)}}
+
+
+def main():
+    column_odm = load('odm.column_odm', mock_driver_module(MongoAPI=SlowMongoAPI))
+    container_class = column_odm.COLUMN_FACTORY['interface']
+    settings = column_odm.NetdbSettings.get_settings()
+
+    rows = []
+    for count in ELEMENTS:
+        container = container_class(
+            datasource='netbox', weight=150, column=interfaces(count)
+        )
+
+        def per_document():
+            odm = column_odm.ColumnODM(container=container)
+            devices = odm.__mongo_api__(settings.db_name, 'device').read_column()
+            odm._check_registered(frozenset(device.set_id for device in devices))
+            for document in odm.documents:
+                odm.mongo.replace_one(document)
+            odm.bump_revision()
+
+        def bulk():
+            column_odm.ColumnODM(container=container).replace()
+
+        rows.append(
+            {
+                'elements': count,
+                'per_document': timeit(per_document, repeat=5)['median_ms'],
+                'bulk': timeit(bulk, repeat=5)['median_ms'],
+            }
+        )
+
+    report(
+        f'ColumnODM.replace(), median ms, {LATENCY * 1000:.0f} ms per MongoDB call',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
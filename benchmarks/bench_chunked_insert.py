@@ -0,0 +1,141 @@
+"""
+Compare reload insert throughput (documents per second) and peak memory of a single
+insert_many() of all dumped documents (the former reload path) against
+MongoAPI.insert_chunked() for several chunk sizes and concurrencies. Documents are
+generated lazily from an interface column container of N documents in both cases.
+
+By default inserts go to an in-process stand in for a MongoDB collection, which BSON
+encodes each chunk (as pymongo does) and then waits for a network round trip of
+LATENCY seconds plus BANDWIDTH bytes per second without holding the GIL. Set
+NETDB_BENCH_MONGO_URL to insert into a local mongod instead (the `netdb_bench'
+database is dropped). Peak memory is the Python heap peak measured with tracemalloc.
+
+"""
+
+import gc
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+
+import bson
+import pymongo
+from pymongo.results import InsertManyResult
+
+from harness import timeit, report
+from mocked_data import interface  # type: ignore
+
+from config.settings import NetdbSettings
+from models.columns.interface import InterfaceContainer
+from odm.column_odm import ColumnODM
+from util.mongo_api import MongoAPI
+from util.mongo_client import MongoClientRegistry
+
+SIZES = [10000, 50000]
+
+CHUNK_SIZES = [1000, 5000]
+
+CONCURRENCY = [1, 4, 8]
+
+LATENCY = 0.001
+
+BANDWIDTH = 100 * 2**20
+
+
+class StandInCollection:
+    def insert_many(self, documents, ordered=True, session=None):
+        size = sum(len(bson.encode(document)) for document in documents)
+        time.sleep(LATENCY + size / BANDWIDTH)
+
+        return InsertManyResult([None] * len(documents), True)
+
+    def drop(self):
+        pass
+
+
+def stand_in_client() -> dict:
+    return defaultdict(lambda: defaultdict(StandInCollection))
+
+
+def container(size: int) -> InterfaceContainer:
+    template = interface.mock_standard_interface_data()['ROUTER1']
+
+    return InterfaceContainer(
+        datasource='netbox',
+        weight=150,
+        column={f'ROUTER{i:05}': template for i in range(size // len(template) + 1)},
+    )
+
+
+def peak_mb(func) -> float:
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return round(peak / 2**20, 1)
+
+
+def main():
+    NetdbSettings.initialize()
+    settings = NetdbSettings.__settings__
+    settings.db_name = 'netdb_bench'
+
+    if url := os.environ.get('NETDB_BENCH_MONGO_URL'):
+        client = pymongo.MongoClient(url)
+        target = f'mongod at {url}'
+    else:
+        client = stand_in_client()
+        target = f'stand in, {LATENCY * 1000:g} ms + {BANDWIDTH // 2**20} MiB/s'
+
+    MongoClientRegistry.get_client = classmethod(lambda cls, *args: client)
+
+    api = MongoAPI(settings.db_name, 'interface')
+
+    rows = []
+    for size in SIZES:
+        odm = ColumnODM(container=container(size))
+        count = len(list(odm._pending_documents()))
+
+        def single():
+            api.collection.drop()
+            api.collection.insert_many(
+                [document.model_dump() for document in odm._pending_documents()],
+                ordered=False,
+            )
+
+        modes = [('single', single)]
+
+        for chunk_size in CHUNK_SIZES:
+            for concurrency in CONCURRENCY:
+
+                def chunked(chunk_size=chunk_size, concurrency=concurrency):
+                    settings.insert_chunk_size = chunk_size
+                    settings.insert_concurrency = concurrency
+
+                    api.collection.drop()
+                    assert api.insert_chunked(odm._pending_documents()) == count
+
+                modes.append((f'chunked/{chunk_size}x{concurrency}', chunked))
+
+        for mode, func in modes:
+            stats = timeit(func, 3)
+
+            rows.append(
+                {
+                    'documents': count,
+                    'mode': mode,
+                    **stats,
+                    'docs_per_s': round(count / stats['median_ms'] * 1000),
+                    'peak_mb': peak_mb(func),
+                }
+            )
+
+    api.collection.drop()
+
+    report(f'Reload inserts ({target})', rows)
+
+
+if __name__ == '__main__':
+    main()
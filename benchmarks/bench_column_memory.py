@@ -0,0 +1,99 @@
+"""
+Compare peak memory of generating a full interface column from a materialized list
+of documents (fetch() + generate_column()) against streaming the documents from the
+cursor into generate_column() (stream_column(), used by GET /column).
+
+The mocked driver decodes documents lazily, one at a time, like a MongoDB cursor.
+Peak memory is the Python heap peak measured with tracemalloc.
+
+"""
+
+import gc
+import tracemalloc
+
+from harness import mock_driver_module, load, report
+from mocked_data import interface  # type: ignore
+from mocked_utils import mock_mongo_api  # type: ignore
+
+DEVICES = 1000
+
+
+def raw_documents():
+    """
+    Stand in for a MongoDB cursor: yields freshly decoded raw documents.
+    """
+    template = [
+        document.model_dump()
+        for document in interface.mock_standard_interface_documents()
+    ]
+
+    for i in range(DEVICES):
+        for document in template:
+            yield {**document, 'set_id': f'ROUTER{i}', 'data': dict(document['data'])}
+
+
+class CursorMongoAPI(mock_mongo_api.MongoAPI):
+    def iter_column(self, query=None, fields=None, sort=None):
+        model = mock_mongo_api.NetdbDocument
+
+        if self.collection != 'interface':
+            yield from super().iter_column(query, fields, sort)
+            return
+
+        # Documents are yielded grouped by set_id, as a sort by set_id would.
+        for document in raw_documents():
+            yield model(**document)
+
+    def read_column(self, query=None, fields=None):
+        if self.collection != 'interface':
+            return super().read_column(query, fields)
+
+        return list(self.iter_column(query, fields))
+
+    def read_overrides(self, query=None, sort=None, limit=0):
+        return []
+
+
+def peak_mb(func) -> float:
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return round(peak / 2**20, 1)
+
+
+def main():
+    column_odm = load('odm.column_odm', mock_driver_module(MongoAPI=CursorMongoAPI))
+    settings = column_odm.NetdbSettings.__settings__
+
+    def materialized():
+        column_odm.ColumnODM(
+            column_type='interface'
+        ).fetch().generate_column().pruned_column
+
+    def streamed():
+        column_odm.ColumnODM(column_type='interface').stream_column()
+
+    rows = []
+    for trusted in [False, True]:
+        settings.trusted_reads = trusted
+
+        rows.append(
+            {
+                'trusted_reads': trusted,
+                'materialized_mb': peak_mb(materialized),
+                'streamed_mb': peak_mb(streamed),
+            }
+        )
+
+    report(
+        f'Peak Python heap, full interface column, {DEVICES} devices, '
+        f'{DEVICES * len(interface.mock_standard_interface_documents())} documents',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
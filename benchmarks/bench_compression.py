@@ -0,0 +1,111 @@
+"""
+Compare response size and compression CPU time per content coding for the compact
+/column/interface response (mocked ROUTER1 interface set copied to N devices), and
+GET /column/interface with and without the compressed response cache.
+
+Only the content codings available (see util.compression.ENCODERS) are measured;
+install zstandard and brotli to include zstd and br.
+
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from harness import mock_driver_module, load, timeit, report
+from mocked_data import interface  # type: ignore
+from mocked_utils import mock_mongo_api  # type: ignore
+
+SIZES = [10, 100, 1000]
+
+DEVICES = max(SIZES)
+
+ROUTER1 = [
+    document
+    for document in mock_mongo_api.COLLECTION_FACTORY['interface']()
+    if document.set_id == 'ROUTER1'
+]
+
+FLEET = [
+    document.model_copy(update={'set_id': f'ROUTER{i}'})
+    for i in range(DEVICES)
+    for document in ROUTER1
+]
+
+
+class FleetMongoAPI(mock_mongo_api.MongoAPI):
+    def read_column(self, query=None, fields=None):
+        if self.collection != 'interface':
+            return super().read_column(query, fields)
+
+        return FLEET
+
+
+def cpu_ms(func, repeat: int = 10) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+
+    return round((time.process_time() - start) * 1000 / repeat, 3)
+
+
+def main():
+    column_odm = load('odm.column_odm')
+    api_resources = load('util.api_resources')
+    compression = load('util.compression')
+
+    container_class = column_odm.COLUMN_FACTORY['interface']
+    router1 = interface.mock_standard_interface_data()['ROUTER1']
+
+    rows = []
+    for size in SIZES:
+        odm = column_odm.ColumnODM(
+            container=container_class(
+                datasource='netbox',
+                weight=150,
+                column={f'ROUTER{i}': router1 for i in range(size)},
+            )
+        )
+        body = bytes(api_resources.netdb_response(odm.pruned_column, 'Column.').body)
+
+        row: dict = {'devices': size, 'identity_kb': round(len(body) / 1024, 1)}
+        for encoding, encoder in compression.ENCODERS.items():
+            row[f'{encoding}_kb'] = round(len(encoder(body)) / 1024, 1)
+            row[f'{encoding}_cpu_ms'] = cpu_ms(lambda: encoder(body))
+
+        rows.append(row)
+
+    report('Compact column response, size and compression CPU per request', rows)
+
+    app_module = load('main', mock_driver_module(MongoAPI=FleetMongoAPI))
+    settings = app_module.NetdbSettings.__settings__
+    client = TestClient(app_module.app)
+    settings.compress_min_size = 1024
+
+    # The util.compression module imported by main.
+    cache = app_module.cached_response.__globals__['CompressedResponseCache']
+
+    rows = []
+    for cache_size in [0, 8]:
+        settings.compress_cache_size = cache_size
+        cache.invalidate()
+
+        def get():
+            response = client.get(
+                '/column/interface', headers={'Accept-Encoding': 'gzip'}
+            )
+            assert response.headers['content-encoding'] == 'gzip'
+
+        rows.append(
+            {
+                'compress_cache_size': cache_size,
+                'cpu_ms': cpu_ms(get, 5),
+                **timeit(get, 5),
+            }
+        )
+
+    report(f'GET /column/interface, {DEVICES} devices, gzip', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare fetching the bundles (all columns) of N devices with N sequential
+GET /device/{set_id}/bundle requests and with a single POST /device/batch request.
+
+Each mocked MongoDB call sleeps for LATENCY seconds to stand in for a database round
+trip. The mocked columns hold the ROUTER1 test data copied to DEVICES devices.
+
+sequential:  N bundle requests, each reading every column and the overrides
+batch:       one batch request reading every column (`$in' on set_id) and the
+             overrides once, generating each column once for all N devices
+
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from harness import mock_driver_module, load, timeit, report
+from mocked_utils import mock_mongo_api  # type: ignore
+
+LATENCY = 0.002
+
+DEVICES = 1000
+
+SIZES = [1, 10, 100, 250]
+
+
+def _fleet(collection: str) -> dict:
+    template = [
+        document
+        for document in mock_mongo_api.COLLECTION_FACTORY[collection]()
+        if document.set_id == 'ROUTER1'
+    ]
+
+    # Column documents keyed by set_id, standing in for an indexed collection
+    return {
+        f'ROUTER{i}': [
+            document.model_copy(update={'set_id': f'ROUTER{i}'})
+            for document in template
+        ]
+        for i in range(DEVICES)
+    }
+
+
+FLEET = {
+    column_type: _fleet(column_type)
+    for column_type in mock_mongo_api.COLLECTION_FACTORY
+    if column_type != 'override'
+}
+
+
+class FleetMongoAPI(mock_mongo_api.MongoAPI):
+    def read_column(self, query=None, fields=None):
+        time.sleep(LATENCY)
+
+        if self.collection not in FLEET:
+            return super().read_column(query, fields)
+
+        set_ids = query['set_id']
+        if isinstance(set_ids, str):
+            set_ids = {'$in': [set_ids]}
+
+        return [
+            document
+            for set_id in set_ids['$in']
+            for document in FLEET[self.collection].get(set_id, [])
+        ]
+
+    def read_revision(self, column_type):
+        time.sleep(LATENCY)
+        return super().read_revision(column_type)
+
+
+def main():
+    app_module = load('main', mock_driver_module(MongoAPI=FleetMongoAPI))
+    client = TestClient(app_module.app)
+
+    rows = []
+    for size in SIZES:
+        set_ids = [f'ROUTER{i}' for i in range(size)]
+
+        def sequential():
+            for set_id in set_ids:
+                assert client.get(f'/device/{set_id}/bundle').status_code == 200
+
+        def batch():
+            response = client.post('/device/batch', json={'set_ids': set_ids})
+            assert len(response.json()['out']) == size
+
+        repeat = 3 if size >= 100 else 10
+        rows.append(
+            {
+                'devices': size,
+                'sequential_ms': timeit(sequential, repeat)['median_ms'],
+                'batch_ms': timeit(batch, repeat)['median_ms'],
+            }
+        )
+
+    report(
+        f'Device bundles, {LATENCY * 1000:.0f} ms per MongoDB call (medians)',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
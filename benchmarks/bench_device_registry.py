@@ -0,0 +1,97 @@
+"""
+Compare the device registration check (run by every reload, replace and validate)
+before and after the DeviceRegistry, with 5,000 registered devices.
+
+before:  full device column read (NetdbDocuments including data) and list
+         membership checks
+cold:    distinct set_id read of the device column into the registry (first check
+         after a device column write)
+warm:    device column revision read and set membership checks
+
+"""
+
+import copy
+
+from harness import mock_driver_module, load, timeit, report
+from mocked_data import device, interface  # type: ignore
+from mocked_utils import mock_mongo_api  # type: ignore
+
+DEVICES = 5000
+
+SETS = [1, 100, 1000]
+
+TEMPLATE = device.mock_standard_device_documents()[0].model_dump()
+
+RAW_DEVICES = [
+    {**copy.deepcopy(TEMPLATE), 'set_id': f'ROUTER{i}'} for i in range(DEVICES)
+]
+
+
+class RegistryMongoAPI(mock_mongo_api.MongoAPI):
+    def read_set_ids(self, query=None):
+        if self.collection != 'device':
+            return super().read_set_ids(query)
+
+        # MongoDB returns only the (distinct) set_ids
+        return [document['set_id'] for document in RAW_DEVICES]
+
+    def iter_column(self, query=None, fields=None):
+        if self.collection != 'device':
+            yield from super().iter_column(query, fields)
+            return
+
+        model = mock_mongo_api.NetdbDocument
+
+        for document in RAW_DEVICES:
+            if fields:
+                yield model.model_construct(**{k: document[k] for k in fields})
+            else:
+                yield model(**document)
+
+
+def main():
+    column_odm = load('odm.column_odm', mock_driver_module(MongoAPI=RegistryMongoAPI))
+    settings = column_odm.NetdbSettings.get_settings()
+    container_class = column_odm.COLUMN_FACTORY['interface']
+    element = interface.mock_standard_interface_data()['ROUTER1']['bond0']
+
+    rows = []
+    for sets in SETS:
+        odm = column_odm.ColumnODM(
+            container=container_class(
+                datasource='netbox',
+                weight=150,
+                column={
+                    f'ROUTER{i * (DEVICES // sets)}': {'bond0': element}
+                    for i in range(sets)
+                },
+            )
+        )
+
+        def before():
+            devices = list(RegistryMongoAPI(settings.db_name, 'device').iter_column())
+            registered = [document.set_id for document in devices]
+            for set_id in odm.container.column.keys():
+                assert set_id in registered
+
+        def cold():
+            column_odm.DeviceRegistry.invalidate()
+            odm._is_registered()
+
+        def warm():
+            odm._is_registered()
+
+        rows.append(
+            {
+                'sets': sets,
+                'before_ms': timeit(before, repeat=5)['median_ms'],
+                'cold_ms': timeit(cold, repeat=5)['median_ms'],
+                'warm_ms': timeit(warm, repeat=5)['median_ms'],
+            }
+        )
+
+    report(f'ColumnODM._is_registered(), {DEVICES} devices, median ms', rows)
+
+
+if __name__ == '__main__':
+    main()
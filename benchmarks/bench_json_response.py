@@ -0,0 +1,77 @@
+"""
+Compare the column response serialization before and after the compact JSON path,
+for the mocked ROUTER1 interface set copied to N devices.
+
+before:  pruned_column via jsonable_encoder, FastAPI response model revalidation
+         and encoding of NetDBReturn, then PrettyJSONResponse (indented json.dumps)
+after:   pruned_column via model_dump (pydantic-core), then a NetDBJSONResponse
+         rendered by pydantic-core to_json without response model revalidation
+pretty:  as after, but rendered by PrettyJSONResponse (?pretty=true)
+
+"""
+
+import asyncio
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from harness import load, timeit, report
+from mocked_data import interface  # type: ignore
+
+SIZES = [10, 100, 1000]
+
+
+def main():
+    column_odm = load('odm.column_odm')
+    api_resources = load('util.api_resources')
+    NetDBReturn = api_resources.NetDBReturn
+
+    container_class = column_odm.COLUMN_FACTORY['interface']
+    router1 = interface.mock_standard_interface_data()['ROUTER1']
+    field = create_response_field('Response_get_column', NetDBReturn)
+
+    rows = []
+    for size in SIZES:
+        odm = column_odm.ColumnODM(
+            container=container_class(
+                datasource='netbox',
+                weight=150,
+                column={f'ROUTER{i}': router1 for i in range(size)},
+            )
+        )
+
+        def before():
+            out = {
+                set_id: jsonable_encoder(set_data, exclude_none=True)
+                for set_id, set_data in odm.container.column.items()
+            }
+            content = asyncio.run(
+                serialize_response(
+                    field=field,
+                    response_content=NetDBReturn(out=out, comment='Column data.'),
+                    is_coroutine=True,
+                )
+            )
+            return api_resources.PrettyJSONResponse(content=content).body
+
+        def after():
+            return api_resources.netdb_response(odm.pruned_column, 'Column data.').body
+
+        def pretty():
+            return api_resources.netdb_response(
+                odm.pruned_column, 'Column data.', pretty=True
+            ).body
+
+        row: dict = {'devices': size}
+        for name, func in [('before', before), ('after', after), ('pretty', pretty)]:
+            row[f'{name}_ms'] = timeit(func, 5 if size >= 1000 else 20)['median_ms']
+            row[f'{name}_kb'] = round(len(func()) / 1024, 1)
+
+        rows.append(row)
+
+    report('GET /column/interface serialization (medians)', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure raw document export and import throughput (documents per second) through
+the /export/{table} and /import/{table} endpoints, for the mocked ROUTER1 interface
+documents copied to N devices. Imports are measured for several chunk sizes; the
+mocked driver does not store documents, so import figures cover request body
+parsing, document validation and the per chunk round trip overhead of the API.
+
+"""
+
+from fastapi.testclient import TestClient
+
+from harness import mock_driver_module, load, timeit, report
+from mocked_utils import mock_mongo_api  # type: ignore
+
+SIZES = [1000, 10000, 50000]
+
+CHUNK_SIZES = [100, 1000, 5000]
+
+ROUTER1 = [
+    document
+    for document in mock_mongo_api.COLLECTION_FACTORY['interface']()
+    if document.set_id == 'ROUTER1'
+]
+
+FLEET: list = []
+
+
+class FleetMongoAPI(mock_mongo_api.MongoAPI):
+    def iter_raw(self, query=None):
+        if self.collection != 'interface':
+            yield from super().iter_raw(query)
+            return
+
+        for document in FLEET:
+            yield document.model_dump()
+
+    def insert_unordered(self, documents):
+        return {'inserted': len(documents), 'failed': 0}
+
+
+def rate(count: int, stats: dict) -> dict:
+    return {**stats, 'docs_per_s': round(count / stats['median_ms'] * 1000)}
+
+
+def main():
+    main = load('main', mock_driver_module(MongoAPI=FleetMongoAPI))
+    client = TestClient(main.app)
+
+    rows = []
+    for size in SIZES:
+        FLEET[:] = [
+            document.model_copy(update={'set_id': f'ROUTER{i:05}'})
+            for i in range(size // len(ROUTER1) + 1)
+            for document in ROUTER1
+        ][:size]
+
+        body = client.get('/export/interface').content
+        assert len(body.splitlines()) == size
+
+        rows.append(
+            {
+                'documents': size,
+                'mode': 'export',
+                **rate(size, timeit(lambda: client.get('/export/interface'), 5)),
+            }
+        )
+
+        for chunk_size in CHUNK_SIZES:
+
+            def post():
+                response = client.post(
+                    f'/import/interface?chunk_size={chunk_size}', content=body
+                )
+                assert response.status_code == 200
+
+            rows.append(
+                {
+                    'documents': size,
+                    'mode': f'import/{chunk_size}',
+                    **rate(size, timeit(post, 5)),
+                }
+            )
+
+    report('Raw NDJSON export / import', rows)
+
+
+if __name__ == '__main__':
+    main()
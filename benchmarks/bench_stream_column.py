@@ -0,0 +1,100 @@
+"""
+Compare time to first set (i.e. to the first response chunk holding column data),
+total time and peak memory (tracemalloc) of a full column response built in memory
+and streamed set by set, for the mocked ROUTER1 interface set copied to N devices.
+
+buffered:  ColumnODM.fetch_column() and a compact NetDBJSONResponse
+streamed:  ColumnODM.iter_sets() encoded by iter_netdb_return() (?stream=true)
+
+Stored documents are allocated before measuring, so peak memory only covers the
+request itself.
+
+"""
+
+import time
+import tracemalloc
+
+from harness import mock_driver_module, load, report
+from mocked_utils import mock_mongo_api  # type: ignore
+
+SIZES = [100, 1000, 5000]
+
+ROUTER1 = [
+    document
+    for document in mock_mongo_api.COLLECTION_FACTORY['interface']()
+    if document.set_id == 'ROUTER1'
+]
+
+FLEET: list = []
+
+
+class FleetMongoAPI(mock_mongo_api.MongoAPI):
+    def read_column(self, query=None, fields=None):
+        if self.collection != 'interface':
+            return super().read_column(query, fields)
+
+        return FLEET
+
+    def iter_column(self, query=None, fields=None, sort=None):
+        if self.collection != 'interface':
+            yield from super().iter_column(query, fields, sort)
+            return
+
+        # Already sorted by set_id
+        yield from FLEET
+
+
+def measure(chunks, head: int) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    first, size = None, 0
+    for count, chunk in enumerate(chunks()):
+        # Skip chunks holding only the NetDBReturn envelope
+        if first is None and count >= head:
+            first = time.perf_counter() - start
+        size += len(chunk)
+
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'first_set_ms': round((first or 0) * 1000, 1),
+        'total_ms': round(total * 1000, 1),
+        'peak_mb': round(peak / 2**20, 1),
+        'kb': round(size / 1024),
+    }
+
+
+def main():
+    column_odm = load('odm.column_odm', mock_driver_module(MongoAPI=FleetMongoAPI))
+    api_resources = load('util.api_resources')
+
+    rows = []
+    for size in SIZES:
+        FLEET[:] = [
+            document.model_copy(update={'set_id': f'ROUTER{i:05}'})
+            for i in range(size)
+            for document in ROUTER1
+        ]
+
+        def buffered():
+            out = column_odm.ColumnODM(column_type='interface').fetch_column()
+            yield api_resources.netdb_response(out, 'Column.').body
+
+        def streamed():
+            odm = column_odm.ColumnODM(column_type='interface')
+            yield from api_resources.iter_netdb_return(odm.iter_sets(), 'Column.')
+
+        for name, chunks, head in [
+            ('buffered', buffered, 0),
+            ('streamed', streamed, 1),
+        ]:
+            rows.append({'devices': size, 'mode': name, **measure(chunks, head)})
+
+    report('GET /column/interface', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare column generation with full Pydantic revalidation against trusted read mode
+(`trusted_reads' setting) for a large interface column.
+
+"""
+
+from harness import load, timeit, report
+from mocked_data import interface  # type: ignore
+
+DEVICES = 1800
+
+
+def documents(stale_devices: int = 0) -> list:
+    out = []
+    for i in range(DEVICES):
+        for document in interface.mock_standard_interface_documents():
+            update: dict = {'set_id': f'ROUTER{i}'}
+            if i < stale_devices:
+                update['schema_version'] = None
+            out.append(document.model_copy(update=update, deep=True))
+
+    return out
+
+
+def main():
+    column_odm = load('odm.column_odm')
+    settings = column_odm.NetdbSettings.__settings__
+
+    rows = []
+    for label, stale in [('all current', 0), ('10% stale', DEVICES // 10)]:
+        docs = documents(stale)
+
+        for trusted in [False, True]:
+            settings.trusted_reads = trusted
+
+            def run():
+                odm = column_odm.ColumnODM(column_type='interface')
+                odm.documents = docs
+                odm.generate_column().pruned_column
+
+            rows.append(
+                {
+                    'documents': label,
+                    'trusted_reads': trusted,
+                    **timeit(run, repeat=5),
+                }
+            )
+
+    report(
+        f'interface column generate_column() + pruned_column, {DEVICES} devices, '
+        f'{len(docs)} documents',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared helpers for the NetDB benchmarks.
+
+Benchmarks run in-process against the FastAPI app and ODM using the mocked MongoDB
+driver from the unit tests (netdb/tests/mocked_utils) so that they can be run without
+a mongod instance. Where a benchmark measures database round trips, the mocked driver
+is wrapped to inject a fixed per-call latency.
+
+Run from the repository root, e.g.:
+
+    python benchmarks/bench_async_driver.py
+
+"""
+
+import os
+import sys
+import time
+import types
+import statistics
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path[:0] = [os.path.join(ROOT, 'netdb'), os.path.join(ROOT, 'netdb', 'tests')]
+
+os.environ.setdefault('MONGO_URL', 'mongodb://192.0.2.1:27017/')
+
+
+def mock_driver_module(**attrs) -> types.ModuleType:
+    """
+    Return a stand in for the util.mongo_api module. Defaults to the unit test mock;
+    keyword arguments replace individual attributes (e.g. MongoAPI=SlowMongoAPI).
+
+    """
+    from mocked_utils import mock_mongo_api  # type: ignore
+
+    module = types.ModuleType('util.mongo_api')
+    module.__dict__.update(
+        {k: v for k, v in vars(mock_mongo_api).items() if not k.startswith('__')}
+    )
+    module.__dict__.update(attrs)
+
+    return module
+
+
+def load(module_name: str, driver_module=None):
+    """
+    Import a NetDB module (e.g. 'main') with util.mongo_api replaced by driver_module.
+
+    """
+    with patch.dict(
+        'sys.modules', {'util.mongo_api': driver_module or mock_driver_module()}
+    ):
+        return __import__(module_name, fromlist=['*'])
+
+
+def timeit(func, repeat: int = 20) -> dict:
+    """
+    Call func repeat times and return wall clock statistics in milliseconds.
+
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'max_ms': round(max(samples), 3),
+    }
+
+
+def report(title: str, rows: list) -> None:
+    """
+    Print benchmark results as a simple aligned table.
+
+    """
+    print(f'\n{title}')
+
+    if not rows:
+        return
+
+    headers = list(rows[0].keys())
+    widths = [max(len(str(h)), *(len(str(r[h])) for r in rows)) for h in headers]
+
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(str(row[h]).ljust(w) for h, w in zip(headers, widths)))
@@ -27,6 +27,95 @@ class _Settings(BaseSettings):
     # Overrides status
     overrides_enabled: bool = True
 
+    # Used for column revision counters. Must not confict with column names.
+    revision_table: str = 'revision'
+
+    # Number of documents per insert of a column reload. Reload documents are generated
+    # and encoded one chunk at a time.
+    insert_chunk_size: int = 5000
+
+    # Maximum number of concurrent chunk inserts of a column reload. Chunks are
+    # inserted one at a time within transactions.
+    insert_concurrency: int = 4
+
+    # Reload columns (without transactions) by bulk loading a staging collection which
+    # then replaces the column collection (renameCollection) rather than by deleting
+    # and reinserting documents in place. Column writes are then serialized with the
+    # swap itself (the staging collection replacing the column) by lock documents.
+    swap_reloads: bool = False
+
+    # Seconds after which the swap or write lock of a column expires unless renewed.
+    # Locks are renewed while held, so this bounds how long a crashed holder
+    # blocks the column.
+    swap_lock_ttl: int = 30
+
+    # Seconds a column write waits for a swap to complete before failing (409), and
+    # a swap reload for the writes in progress before failing (503).
+    swap_lock_wait: int = 10
+
+    # Seconds after which the lock taken by the worker building indexes at startup
+    # expires if never released (e.g. the worker crashed).
+    index_lock_ttl: int = 600
+
+    # Rebuild the indexes whose options differ from their specification at
+    # startup. The new index is built under another name before the outdated one is
+    # dropped. Otherwise outdated indexes are only reported.
+    index_rebuilds: bool = False
+
+    # Maximum number of generated columns cached per worker process. 0 disables.
+    column_cache_size: int = 0
+
+    # Maximum total size in bytes (approximated by their length as JSON) of the
+    # generated columns cached per worker process. 0 for no limit.
+    column_cache_bytes: int = 268435456
+
+    # Compress responses of at least this many bytes with the best content coding
+    # accepted by the client: zstd or br (if the zstandard or brotli packages are
+    # installed) or gzip. 0 disables.
+    compress_min_size: int = 0
+
+    # Maximum number of compressed column responses cached per worker process. 0
+    # disables.
+    compress_cache_size: int = 0
+
+    # Read columns and overrides with the asyncio (motor) MongoDB driver rather than
+    # with blocking pymongo calls run in the threadpool. Writes are always made with
+    # pymongo in the threadpool.
+    async_driver: bool = False
+
+    # Resolve element weights with a MongoDB aggregation so that only the winning
+    # document for each element is read (rather than resolving in Python).
+    server_side_weights: bool = False
+
+    # Skip revalidation of stored documents whose schema version matches the current
+    # column model. Sets with stale documents or overrides are still validated.
+    trusted_reads: bool = False
+
+    # Include stored document content hashes under meta.netdb in generated columns.
+    show_content_hash: bool = False
+
+    # Maximum number of sets (column) or overrides returned per page by paginated
+    # column and override GET requests.
+    page_max_limit: int = 1000
+
+    # Maximum number of devices (set_ids) bundled by a batch device request.
+    batch_max_set_ids: int = 500
+
+    # Cursor batch size (documents) for column reads. 0: driver default.
+    mongo_batch_size: int = 0
+
+    # Maximum number of pooled MongoDB connections per worker process
+    mongo_max_pool_size: int = 100
+
+    # Minimum number of pooled MongoDB connections kept open per worker process
+    mongo_min_pool_size: int = 0
+
+    # Close pooled connections idle for longer than this. None: never.
+    mongo_max_idle_time_ms: Optional[int] = None
+
+    # Time to wait for a free pooled connection before failing. None: forever.
+    mongo_wait_queue_timeout_ms: Optional[int] = None
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
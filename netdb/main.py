@@ -1,21 +1,39 @@
-from typing import Union, Optional
+from collections.abc import AsyncIterator
+from typing import Union, Optional, List
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Response, status
+from fastapi import Depends, FastAPI, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
 
 import util.initialize as init
 import util.api_resources as resources
 from config.settings import NetdbSettings
 from models.types import RootContainer, OverrideDocument, COLUMN_TYPES
-from odm.column_odm import ColumnODM
-from odm.override_handler import OverrideHandler
+from odm.column_odm import ColumnODM, AsyncColumnODM
+from odm.dispatch import column_odm, override_handler, bundle_odm, raw_odm, run_odm
 from util.exception import NetDBException
+from util.mongo_client import MongoClientRegistry
+from util.pagination import page_limit
+from util.compression import cached_response, compress_response, not_modified
 
 from util.api_resources import (
     NetDBReturn,
+    DeviceBatchRequest,
+    iter_netdb_return,
+    aiter_netdb_return,
+    aiter_line_chunks,
+    DuplexStreamingResponse,
+    netdb_response,
+    negotiate_media_type,
     generate_filter,
+    parse_fields,
+    column_validators,
+    etag_matches,
     PrettyJSONResponse,
+    NetDBJSONResponse,
     ERR_READONLY,
     ERR_OVERRIDE_DISABLED,
 )
@@ -25,13 +43,16 @@ from util.api_resources import (
 async def lifespan(app: FastAPI):
     """
     Called at API startup time. Initialize NetDB (e.g. load global settings, make sure indexes are
-    installed unless started in read only mode).
+    installed unless started in read only mode). Pooled MongoDB clients are closed at
+    shutdown.
 
     """
     init.initialize()
 
     yield
 
+    MongoClientRegistry.close_all()
+
 
 # Application entry point
 app = FastAPI(
@@ -120,6 +141,207 @@ async def netdb__exception_handler(request: Request, exc: NetDBException):
     return PrettyJSONResponse(content=response, status_code=exc.code)
 
 
+def response_keys(
+    filt: dict,
+    fields: Optional[List[str]],
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> dict:
+    """
+    Return everything but the column revision a column GET response depends on, i.e.
+    the filter, projection and page (see column_validators()).
+
+    """
+    keys = dict(filt)
+
+    if fields:
+        keys['fields'] = fields
+
+    if cursor is not None or limit is not None:
+        keys.update(cursor=cursor, limit=page_limit(limit))
+
+    return keys
+
+
+async def fetch_page(
+    odm: Union[ColumnODM, AsyncColumnODM],
+    response: Response,
+    filt: dict,
+    show_hidden: bool,
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> dict:
+    """
+    Return a page of sets of a column (see ColumnODM.fetch_page()) and set the
+    cursor of the next page, if any, in the X-Next-Cursor header.
+
+    """
+    out, next_cursor = await run_odm(odm.fetch_page, filt, show_hidden, cursor, limit)
+
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+
+    return out
+
+
+async def fetch_column_conditional(
+    request: Request,
+    response: Response,
+    column: str,
+    filt: dict,
+    show_hidden: bool = False,
+    pretty: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Union[dict, Response]:
+    """
+    Fetch a pruned column for a GET request honouring If-None-Match. The column
+    revision is read first; if the request's ETag is still current a 304 response is
+    returned without reading any column documents. The same applies to a cached
+    compressed copy of the response (see util.compression). Otherwise the ETag and
+    Last-Modified headers are set on response and the column is returned.
+
+    If a cursor or limit is given a single page of sets is returned (see
+    ColumnODM.fetch_page()) and the cursor of the next page, if any, is set in the
+    X-Next-Cursor header. Pages are not served from the compressed response cache.
+
+    request:
+        The HTTP request context
+
+    response:
+        HTTP response context passed in by FastAPI
+
+    column:
+        Name of column to query (e.g. `bgp')
+
+    filt:
+        Column query filter as returned by generate_filter()
+
+    show_hidden: ``False``
+        Return 'hidden' (i.e. weight < 1) elements
+
+    pretty: ``False``
+        Whether indented JSON is to be returned
+
+    cursor: ``None``
+        Page cursor returned with the previous page
+
+    limit: ``None``
+        Maximum number of sets per page
+
+    fields: ``None``
+        Element data fields to project the column on (see ColumnODM.set_fields())
+
+    """
+    odm = column_odm(column_type=column).set_fields(fields)
+    paged = cursor is not None or limit is not None
+
+    revision = await run_odm(odm.revision)
+    headers = column_validators(
+        revision,
+        response_keys(filt, odm.fields, cursor, limit),
+        show_hidden,
+        negotiate_media_type(request.headers.get('accept')),
+        pretty,
+    )
+
+    if unmodified := not_modified(request, headers):
+        return unmodified
+
+    if paged:
+        response.headers.update(headers)
+
+        return await fetch_page(odm, response, filt, show_hidden, cursor, limit)
+
+    if cached := cached_response(request, headers, pretty):
+        return cached
+
+    response.headers.update(headers)
+
+    return await run_odm(
+        odm.fetch_column, filt, show_hidden, revision=revision.revision
+    )
+
+
+def streamable(request: Request, pretty: bool = False) -> bool:
+    """
+    Return whether the column GET response for a request is compact JSON, the only
+    representation column streams are sent in (see stream_column_conditional()).
+
+    request:
+        The HTTP request context
+
+    pretty: ``False``
+        Whether indented JSON was requested
+
+    """
+    return (
+        not pretty
+        and negotiate_media_type(request.headers.get('accept')) == 'application/json'
+    )
+
+
+async def stream_column_conditional(
+    request: Request,
+    column: str,
+    filt: dict,
+    show_hidden: bool = False,
+    fields: Optional[List[str]] = None,
+) -> Response:
+    """
+    Stream a pruned column set by set for a GET request honouring If-None-Match (see
+    fetch_column_conditional()). Sets are sent as compact JSON as soon as they have
+    been generated, so memory use is bounded by the largest set rather than by the
+    column. As the response status is sent before the first set is generated, a set
+    failing validation aborts the response leaving its JSON body incomplete. Only to
+    be used for requests negotiating compact JSON (see streamable()), so that the
+    validators are those of the equivalent non streaming response.
+
+    request:
+        The HTTP request context
+
+    column:
+        Name of column to query (e.g. `bgp')
+
+    filt:
+        Column query filter as returned by generate_filter()
+
+    show_hidden: ``False``
+        Return 'hidden' (i.e. weight < 1) elements
+
+    fields: ``None``
+        Element data fields to project the column on (see ColumnODM.set_fields())
+
+    """
+    odm = column_odm(column_type=column).set_fields(fields)
+
+    revision = await run_odm(odm.revision)
+    headers = column_validators(
+        revision,
+        response_keys(filt, odm.fields, None, None),
+        show_hidden,
+        negotiate_media_type(request.headers.get('accept')),
+        False,
+    )
+
+    if etag_matches(request.headers.get('if-none-match'), headers['ETag']):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    comment = f'Column data for {column} column.'
+    sets = odm.iter_sets(filt, show_hidden)
+
+    return StreamingResponse(
+        (
+            aiter_netdb_return(sets, comment)
+            if isinstance(sets, AsyncIterator)
+            else iter_netdb_return(sets, comment)
+        ),
+        headers=headers,
+        media_type='application/json',
+    )
+
+
 @app.get('/')
 def read_root() -> dict:
     """
@@ -144,6 +366,39 @@ def display_settings() -> dict:
     return NetdbSettings.get_settings().model_dump()
 
 
+@app.get(
+    '/metrics/pool',
+    response_class=PrettyJSONResponse,
+)
+def display_pool_metrics() -> NetDBReturn:
+    """
+    Show MongoDB connection pool checkout / wait metrics for the worker process
+    serving the request.
+
+    """
+    return NetDBReturn(
+        out=MongoClientRegistry.get_metrics(),
+        comment='MongoDB connection pool metrics.',
+    )
+
+
+@app.get(
+    '/indexes',
+    response_class=PrettyJSONResponse,
+)
+def display_indexes() -> NetDBReturn:
+    """
+    Show the index specification of each column and the indexes used by MongoDB for
+    each column query shape (i.e. set of filtered keys). Shapes read by collection
+    scans are listed under `collscan'.
+
+    """
+    return NetDBReturn(
+        out=init.index_report(),
+        comment='NetDB column indexes.',
+    )
+
+
 @app.get(
     '/column',
     tags=['list_columns'],
@@ -161,7 +416,7 @@ def list_columns() -> NetDBReturn:
 
 
 @app.post('/validate', tags=['validate'])
-def validate_column(
+async def validate_column(
     data: RootContainer,
 ) -> NetDBReturn:
     """
@@ -175,7 +430,7 @@ def validate_column(
         Column container with the column data to be validated.
 
     """
-    ColumnODM(data).validate()
+    await run_odm(column_odm(data).validate)
 
     return NetDBReturn(
         comment='Validation successful.',
@@ -183,9 +438,10 @@ def validate_column(
 
 
 @app.post('/column', tags=['column'])
-def reload_column(
+async def reload_column(
     data: RootContainer,
     response: Response,
+    delta: bool = False,
 ) -> Union[NetDBReturn, dict]:
     """
     Replace entire column or parts of column filtered by datasource with new data.
@@ -200,12 +456,29 @@ def reload_column(
     response:
         HTTP response context passed in by FastAPI
 
+    delta: ``False``
+        Only write documents which were added, changed or removed compared to the
+        stored ones. Returns the added, changed, removed and unchanged document counts
+        instead of the reloaded column data.
+
     """
     if NetdbSettings.get_settings().read_only:
         response.status_code = status.HTTP_403_NOT_ALLOWED
         return ERR_READONLY
 
-    if out := ColumnODM(data).reload().pruned_column:
+    if delta:
+        odm = column_odm(data)
+        counts = await run_odm(odm.reload_delta)
+
+        if odm.documents:
+            return NetDBReturn(out=counts, comment='Column delta reload successful.')
+
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return NetDBReturn(result=False, out=counts, comment='Nothing reloaded.')
+
+    odm = await run_odm(column_odm(data).reload)
+
+    if out := await run_in_threadpool(lambda: odm.pruned_column):
         # Successful return
         return NetDBReturn(out=out, comment='Column reload successful.')
 
@@ -214,21 +487,44 @@ def reload_column(
     return NetDBReturn(result=False, comment='Nothing reloaded.')
 
 
-@app.get(
-    '/column/{column}',
-    tags=['column'],
-    response_class=PrettyJSONResponse,
-)
-def get_column(
-    column: str,
+def column_filter(
     datasource: Optional[str] = None,
     set_id: Optional[str] = None,
     device: Optional[str] = None,
     category: Optional[str] = None,
     family: Optional[str] = None,
     element_id: Optional[str] = None,
+) -> dict:
+    """
+    Return the column query filter (see generate_filter()) given by the filter keys
+    of a column GET request, documented in get_column().
+
+    """
+    # Shortcut for set_id. Only using uppercase device names for now.
+    if device:
+        set_id = str(device).upper()
+
+    return generate_filter(datasource, set_id, category, family, element_id)
+
+
+@app.get(
+    '/column/{column}',
+    tags=['column'],
+    response_class=NetDBJSONResponse,
+    response_model=NetDBReturn,
+)
+async def get_column(
+    column: str,
+    request: Request,
+    response: Response,
+    filt: dict = Depends(column_filter),
     show_hidden: bool = False,
-) -> NetDBReturn:
+    pretty: bool = False,
+    stream: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None),
+) -> Union[NetDBReturn, Response]:
     """
     Get a column. Optionally filter the results using the following keys:
 
@@ -256,30 +552,76 @@ def get_column(
     show_hidden: ``False``
         Return 'hidden' (i.e. weight < 1) elements
 
+    pretty: ``False``
+        Return indented JSON
+
+    stream: ``False``
+        Stream compact JSON set by set (see stream_column_conditional()). Not
+        compressed. Ignored if pretty or another media type than JSON is requested.
+
+    limit: ``None``
+        Return a page of up to limit sets (capped at the `page_max_limit' setting) in
+        set_id order. The cursor of the next page, if any, is returned in the
+        X-Next-Cursor response header. Overrides stream.
+
+    cursor: ``None``
+        Return the page following the one returned with this X-Next-Cursor
+
+    fields: ``None``
+        Only return these element data fields, given as dotted paths relative to the
+        element (e.g. `type,address' for interfaces or `cvars.router_id' for the flat
+        device column). Projected columns are not validated.
+
+    Other arguments:
+
+    request:
+        The HTTP request context. A 304 is returned if its If-None-Match header
+        matches the current ETag. MessagePack or CBOR is returned if preferred by its
+        Accept header.
+
+    response:
+        HTTP response context passed in by FastAPI
+
+    filt:
+        Column query filter given by the filter keys above (see column_filter())
+
     """
-    # Shortcut for set_id. Only using uppercase device names for now.
-    if device:
-        set_id = str(device).upper()
+    paged = cursor is not None or limit is not None
+    fields = parse_fields(fields)
 
-    filt = generate_filter(datasource, set_id, category, family, element_id)
+    if stream and not paged and streamable(request, pretty):
+        return await stream_column_conditional(
+            request, column, filt, show_hidden, fields
+        )
 
-    out = (
-        ColumnODM(column_type=column)
-        .fetch(filt, show_hidden)
-        .generate_column()
-        .pruned_column
+    out = await fetch_column_conditional(
+        request, response, column, filt, show_hidden, pretty, cursor, limit, fields
+    )
+    if isinstance(out, Response):
+        return out
+
+    return compress_response(
+        request,
+        netdb_response(
+            out,
+            f'Column data for {column} column.',
+            pretty,
+            response.headers,
+            negotiate_media_type(request.headers.get('accept')),
+        ),
+        pretty,
+        cache=not paged,
     )
-
-    return NetDBReturn(out=out, comment=f'Column data for {column} column.')
 
 
 @app.put('/column', tags=['column'])
-def replace_elements(
+async def replace_elements(
     data: RootContainer,
     response: Response,
 ) -> Union[NetDBReturn, dict]:
     """
-    Replace elements (or set in the case of 'flat' columns).
+    Replace elements (or set in the case of 'flat' columns). Elements which are not
+    stored yet are added. Returns the matched, modified and upserted document counts.
 
     data:
         Column container with the column data to be reloaded.
@@ -292,23 +634,30 @@ def replace_elements(
         response.status_code = status.HTTP_403_NOT_ALLOWED
         return ERR_READONLY
 
-    if count := ColumnODM(data).replace():
+    counts = await run_odm(column_odm(data).replace)
+
+    if count := counts['matched'] + counts['upserted']:
         # Successful return
         word = 'elements'
         if count == 1:
             word = 'element'
 
         return NetDBReturn(
-            comment=f'{data.column_type} column: {count} {word} successfully replaced.'
+            out=counts,
+            comment=f'{data.column_type} column: {count} {word} successfully replaced.',
         )
 
     # Empty result. Nothing was replaced.
     response.status_code = status.HTTP_404_NOT_FOUND
-    return NetDBReturn(result=False, comment='{data.column} column: nothing replaced.')
+    return NetDBReturn(
+        result=False,
+        out=counts,
+        comment=f'{data.column_type} column: nothing replaced.',
+    )
 
 
 @app.delete('/column/{column}', tags=['column'])
-def delete_elements(
+async def delete_elements(
     column: str,
     datasource: str,
     response: Response,
@@ -350,7 +699,7 @@ def delete_elements(
 
     filt = generate_filter(datasource, set_id, category, family, element_id)
 
-    count = ColumnODM(column_type=column).delete(filt)
+    count = await run_odm(column_odm(column_type=column).delete, filt)
 
     word = 'elements'
     if count == 1:
@@ -362,13 +711,17 @@ def delete_elements(
 @app.get(
     '/column/{column}/{set_id}',
     tags=['device'],
-    response_class=PrettyJSONResponse,
+    response_class=NetDBJSONResponse,
+    response_model=NetDBReturn,
 )
-def get_column_set(
+async def get_column_set(
     column: str,
     set_id: str,
+    request: Request,
     response: Response,
-) -> NetDBReturn:
+    pretty: bool = False,
+    fields: Optional[List[str]] = Query(None),
+) -> Union[NetDBReturn, Response]:
     """
     Get a single set from a column identified by set_id.
 
@@ -378,6 +731,17 @@ def get_column_set(
     set_id:
         Set ID of set to query (this aligns with device name)
 
+    pretty: ``False``
+        Return indented JSON
+
+    fields: ``None``
+        Only return these element data fields (see get_column())
+
+    request:
+        The HTTP request context. A 304 is returned if its If-None-Match header
+        matches the current ETag. MessagePack or CBOR is returned if preferred by its
+        Accept header.
+
     response:
         HTTP response context passed in by FastAPI
 
@@ -387,27 +751,164 @@ def get_column_set(
     # capitalize anything that comes in.
     filt = {'set_id': set_id.upper()}
 
-    out = ColumnODM(column_type=column).fetch(filt).generate_column().pruned_column
+    out = await fetch_column_conditional(
+        request, response, column, filt, pretty=pretty, fields=parse_fields(fields)
+    )
+    if isinstance(out, Response):
+        return out
+
     if not out:
+        # Nothing to revalidate against
+        for header in ['ETag', 'Last-Modified']:
+            if header in response.headers:
+                del response.headers[header]
+
         response.status_code = status.HTTP_404_NOT_FOUND
 
         return NetDBReturn(result=False, comment=f'No column data found for {set_id}')
 
-    return NetDBReturn(out=out, comment=f'Column data for {column} column.')
+    return compress_response(
+        request,
+        netdb_response(
+            out,
+            f'Column data for {column} column.',
+            pretty,
+            response.headers,
+            negotiate_media_type(request.headers.get('accept')),
+        ),
+        pretty,
+    )
+
+
+@app.get(
+    '/device/{set_id}/bundle',
+    tags=['device'],
+    response_class=NetDBJSONResponse,
+    response_model=NetDBReturn,
+)
+async def get_device_bundle(
+    set_id: str,
+    request: Request,
+    response: Response,
+    column: Optional[List[str]] = Query(None),
+    pretty: bool = False,
+) -> Union[NetDBReturn, Response]:
+    """
+    Get the sets of a single device from all (or selected) columns in one request.
+    Columns are read concurrently and their overrides with a single query. Returns
+    the sets keyed by column; columns without data for the device are left out.
+
+    set_id:
+        Set ID of set to query (this aligns with device name)
+
+    request:
+        The HTTP request context. MessagePack or CBOR is returned if preferred by
+        its Accept header.
+
+    response:
+        HTTP response context passed in by FastAPI
+
+    column: ``None``
+        Columns to include (e.g. `?column=device&column=interface'). All columns if
+        not given.
+
+    pretty: ``False``
+        Return indented JSON
+
+    """
+    # set_id is the same as device name and device names are capitalized.
+    out = await run_odm(bundle_odm([set_id.upper()], column).fetch)
+
+    if not out:
+        response.status_code = status.HTTP_404_NOT_FOUND
+
+        return NetDBReturn(result=False, comment=f'No column data found for {set_id}')
+
+    return compress_response(
+        request,
+        netdb_response(
+            out[set_id.upper()],
+            f'Column data bundle for {set_id}.',
+            pretty,
+            media_type=negotiate_media_type(request.headers.get('accept')),
+        ),
+        pretty,
+    )
+
+
+@app.post(
+    '/device/batch',
+    tags=['device'],
+    response_class=NetDBJSONResponse,
+    response_model=NetDBReturn,
+)
+async def get_device_batch(
+    batch: DeviceBatchRequest,
+    request: Request,
+    response: Response,
+    pretty: bool = False,
+) -> Union[NetDBReturn, Response]:
+    """
+    Get the sets of several devices from all (or selected) columns in one request.
+    Each column is read with a single query for all devices and generated once;
+    overrides for all devices and columns are read with a single query. Returns
+    the sets keyed by set_id and then column. Devices without data are left out.
+
+    batch:
+        Devices (`set_ids', at most `batch_max_set_ids' (setting)), columns
+        (`column', all if not given) and whether to include hidden elements
+        (`show_hidden').
+
+    response:
+        HTTP response context passed in by FastAPI
+
+    pretty: ``False``
+        Return indented JSON
+
+    Other arguments:
+
+    request:
+        The HTTP request context. MessagePack or CBOR is returned if preferred by
+        its Accept header.
+
+    """
+    # set_id is the same as device name and device names are capitalized.
+    set_ids = [set_id.upper() for set_id in batch.set_ids]
+
+    out = await run_odm(
+        bundle_odm(set_ids, batch.column, batch.show_hidden).fetch,
+    )
+
+    if not out:
+        response.status_code = status.HTTP_404_NOT_FOUND
+
+        return NetDBReturn(result=False, comment='No column data found.')
+
+    return netdb_response(
+        out,
+        f'Column data bundles for {len(out)} devices.',
+        pretty,
+        media_type=negotiate_media_type(request.headers.get('accept')),
+    )
 
 
 @app.get(
     '/override',
     tags=['override'],
     response_class=PrettyJSONResponse,
+    response_model=NetDBReturn,
 )
-def get_overrides(
+async def get_overrides(
+    request: Request,
+    response: Response,
     column: Optional[str] = None,
     set_id: Optional[str] = None,
     category: Optional[str] = None,
     family: Optional[str] = None,
     element_id: Optional[str] = None,
-) -> NetDBReturn:
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+) -> Union[NetDBReturn, Response]:
     """
     Get overrides. Optionally filter the results using the following keys:
 
@@ -426,12 +927,44 @@ def get_overrides(
     element_id: ``None``
         Filter query by `element_id' key
 
+    limit: ``None``
+        Return a page of up to limit overrides (capped at the `page_max_limit'
+        setting) in override index order. The cursor of the next page, if any, is
+        returned in the X-Next-Cursor response header.
+
+    cursor: ``None``
+        Return the page following the one returned with this X-Next-Cursor
+
+    Other arguments:
+
+    request:
+        The HTTP request context. MessagePack or CBOR is returned if preferred by
+        its Accept header.
+
+    response:
+        HTTP response context passed in by FastAPI
+
     """
     filt = generate_filter(
         None, set_id, category, family, element_id, column_type=column
     )
 
-    out = OverrideHandler().fetch(filt).pruned_overrides
+    if cursor is not None or limit is not None:
+        handler = await run_odm(override_handler().fetch_page, filt, cursor, limit)
+
+        if handler.next_cursor:
+            response.headers['X-Next-Cursor'] = handler.next_cursor
+    else:
+        handler = await run_odm(override_handler().fetch, filt)
+
+    out = handler.pruned_overrides
+
+    if (
+        media_type := negotiate_media_type(request.headers.get('accept'))
+    ) != 'application/json':
+        return netdb_response(
+            out, 'Column overrides', headers=response.headers, media_type=media_type
+        )
 
     return NetDBReturn(out=out, comment='Column overrides')
 
@@ -441,7 +974,7 @@ def get_overrides(
     tags=['override'],
     response_class=PrettyJSONResponse,
 )
-def put_override(
+async def put_override(
     override: OverrideDocument,
     response: Response,
 ) -> Union[NetDBReturn, dict]:
@@ -461,13 +994,13 @@ def put_override(
         response.status_code = status.HTTP_403_NOT_ALLOWED
         return ERR_OVERRIDE_DISABLED
 
-    result = OverrideHandler().upsert(override)
+    result = await run_odm(override_handler().upsert, override)
 
     return NetDBReturn(out=result, comment='New override installed.')
 
 
 @app.delete('/override', tags=['override'])
-def delete_overrides(
+async def delete_overrides(
     response: Response,
     column: Optional[str] = None,
     set_id: Optional[str] = None,
@@ -507,10 +1040,120 @@ def delete_overrides(
         None, set_id, category, family, element_id, column_type=column
     )
 
-    count = OverrideHandler().delete(filt)
+    count = await run_odm(override_handler().delete, filt)
 
     word = 'overrides'
     if count == 1:
         word = 'override'
 
     return NetDBReturn(comment=f'{count} {word} deleted.')
+
+
+@app.get('/export/{table}', tags=['export'])
+async def export_documents(
+    table: str,
+    datasource: Optional[str] = None,
+    set_id: Optional[str] = None,
+    category: Optional[str] = None,
+    family: Optional[str] = None,
+    element_id: Optional[str] = None,
+    column: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Export the raw stored documents of a column or of the override table as NDJSON
+    (one document per line), e.g. for backups, migrations or seeding replicas. All
+    documents are exported, including those losing on weight, and are streamed as
+    they are read. Optionally filter the documents using the following keys:
+
+    table:
+        Name of column (e.g. `bgp') or of the override table
+
+    datasource: ``None``
+        Filter query by `datasource' key
+
+    set_id: ``None``
+        Filter query by `set_id' (this aligns with device name)
+
+    category: ``None``
+        Filter query by `category' key
+
+    family: ``None``
+        Filter query by `family' key
+
+    element_id: ``None``
+        Filter query by `element_id' key
+
+    column: ``None``
+        Filter overrides by column
+
+    """
+    filt = generate_filter(
+        datasource, set_id, category, family, element_id, column_type=column
+    )
+
+    return StreamingResponse(
+        raw_odm(table).export(filt), media_type='application/x-ndjson'
+    )
+
+
+@app.post('/import/{table}', tags=['export'], response_model=NetDBReturn)
+async def import_documents(
+    table: str,
+    request: Request,
+    response: Response,
+    chunk_size: int = Query(1000, ge=1, le=100000),
+) -> Union[DuplexStreamingResponse, dict]:
+    """
+    Import raw documents into a column or into the override table from an NDJSON
+    request body (e.g. as returned by the export endpoint). Documents are inserted
+    in unordered chunks as the body is received. Documents clashing with stored ones
+    are not imported. Lines which are not valid documents are skipped, as are column
+    documents failing validation against the column model or not belonging to a
+    registered device. Content hashes and schema versions are recomputed.
+
+    Progress is streamed back as NDJSON: the cumulative inserted, failed and invalid
+    document counts after every chunk, followed by a NetDBReturn with the totals.
+
+    table:
+        Name of column (e.g. `bgp') or of the override table
+
+    chunk_size: ``1000``
+        Number of documents inserted at a time
+
+    Other arguments:
+
+    request:
+        The HTTP request context, holding the NDJSON body
+
+    response:
+        HTTP response context passed in by FastAPI
+
+    """
+    if NetdbSettings.get_settings().read_only:
+        response.status_code = status.HTTP_403_FORBIDDEN
+        return ERR_READONLY
+
+    odm = raw_odm(table)
+
+    async def progress():
+        totals = {'inserted': 0, 'failed': 0, 'invalid': 0}
+
+        try:
+            async for lines in aiter_line_chunks(request.stream(), chunk_size):
+                counts = await run_odm(odm.import_documents, lines)
+
+                for key in totals:
+                    totals[key] += counts[key]
+
+                yield to_json(totals) + b'\n'
+        finally:
+            await run_odm(odm.bump_revisions)
+
+        yield to_json(
+            NetDBReturn(
+                out=totals,
+                comment=f'{table}: {totals["inserted"]} documents imported.',
+            )
+        ) + b'\n'
+
+    return DuplexStreamingResponse(progress(), media_type='application/x-ndjson')
@@ -29,6 +29,11 @@ class BaseContainer(BaseColumnModel):
     __flat__: bool = False
     __categories__: List[str] = []
 
+    # Bump whenever validation of the column changes without changing its JSON
+    # schema (e.g. a new validator), so that stored documents are revalidated by
+    # trusted reads. See models.types.schema_version().
+    __schema_revision__: int = 1
+
     weight: int
     datasource: str
 
@@ -1,8 +1,13 @@
-from typing import Annotated, Union, Literal, Optional
+import json
+import hashlib
+from datetime import datetime
+from functools import cache
+from typing import Annotated, Any, Union, Literal, Optional
+from beartype.typing import List
 from pydantic import BaseModel
 from fastapi import Body
 
-from .base_types import FamilyType
+from .base_types import BaseContainer, FamilyType
 from .columns.device import DeviceContainer
 from .columns.firewall import FirewallContainer
 from .columns.policy import PolicyContainer
@@ -10,7 +15,7 @@ from .columns.interface import InterfaceContainer
 from .columns.bgp import BGPContainer
 from .columns.protocol import ProtocolContainer
 
-COLUMN_FACTORY = {
+COLUMN_FACTORY: dict[str, type[BaseContainer]] = {
     'device': DeviceContainer,
     'firewall': FirewallContainer,
     'policy': PolicyContainer,
@@ -21,6 +26,10 @@ COLUMN_FACTORY = {
 
 COLUMN_TYPES = list(COLUMN_FACTORY.keys())
 
+# Column documents with weight < 1 (e.g. device state) are hidden from reads unless
+# explicitly requested.
+VISIBLE_FILTER = {'weight': {'$gte': 1}}
+
 COLUMN_CLASSES = list(COLUMN_FACTORY.values())
 
 ColumnType = Annotated[str, Literal[*COLUMN_TYPES]]
@@ -42,6 +51,28 @@ RootContainer = Annotated[
 ]
 
 
+@cache
+def schema_version(column_type: str) -> str:
+    """
+    Return a short fingerprint of the JSON schema and schema revision of a column
+    type's Pydantic model. Stored on NetdbDocuments so that documents written under an
+    older version of a column model can be told apart from current ones.
+
+    Validation logic which does not show up in the JSON schema (e.g. validators) is
+    only covered by the manually bumped `__schema_revision__' of the container.
+
+    column_type:
+        The column type (e.g. `bgp')
+
+    """
+    model: Any = COLUMN_FACTORY[column_type]
+    schema = json.dumps(
+        [model.model_json_schema(), model.__schema_revision__], sort_keys=True
+    )
+
+    return hashlib.sha256(schema.encode()).hexdigest()[:16]
+
+
 class BaseDocument(BaseModel):
     """
     Abstract type used to derive NetdbDocument and OverrideDocument
@@ -70,6 +101,89 @@ class NetdbDocument(BaseDocument):
     datasource: str
     flat: Optional[bool] = False
 
+    # schema_version() of the column model that validated the document data. None
+    # for documents written before schema versions were recorded.
+    schema_version: Optional[str] = None
+
+    # content_hash() of the document. Set when the document is generated from column
+    # data. None for documents written before content hashes were recorded.
+    content_hash: Optional[str] = None
+
+
+def content_hash(document: NetdbDocument) -> str:
+    """
+    Return a stable hash of the content of a NetdbDocument (i.e. its data, datasource
+    and weight). Two documents for the same column element with equal content hashes
+    generate the same column data.
+
+    document:
+        The NetdbDocument to be hashed
+
+    """
+    content = json.dumps(
+        [document.data, document.datasource, document.weight],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str,
+    )
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def visible_query(query: Optional[dict], show_hidden: bool) -> dict:
+    """
+    Return a column query restricted to visible (weight >= 1) documents unless
+    show_hidden. Hidden documents are thus filtered out by MongoDB (using the partial
+    VISIBLE_INDEX) rather than read and dropped by column generation.
+
+    query:
+        Column query (e.g. as returned by generate_filter())
+
+    show_hidden:
+        Whether hidden documents are to be read as well
+
+    """
+    query = dict(query or {})
+
+    if show_hidden:
+        return query
+
+    if 'weight' in query:
+        return {'$and': [query, VISIBLE_FILTER]}
+
+    return {**query, **VISIBLE_FILTER}
+
+
+def project_data(data: dict, fields: List[str]) -> dict:
+    """
+    Return the parts of document (element) data found at the given dotted paths, as
+    a MongoDB projection on `data.<path>' would. Paths must not overlap.
+
+    data:
+        The document data
+
+    fields:
+        Dotted paths into the data (e.g. `['cvars.router_id']')
+
+    """
+    out: dict = {}
+
+    for field in fields:
+        path = field.split('.')
+
+        value: Any = data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = out
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+
+    return out
+
 
 class OverrideDocument(BaseDocument):
     """
@@ -81,3 +195,16 @@ class OverrideDocument(BaseDocument):
     """
 
     column_type: ColumnType
+
+
+class RevisionDocument(BaseModel):
+    """
+    Structure of column revision document. A column's revision is bumped every time
+    that the column or one of its overrides is written and is used to invalidate
+    cached column data.
+
+    """
+
+    column_type: ColumnType
+    revision: int = 0
+    updated: Optional[datetime] = None
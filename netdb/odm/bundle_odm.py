@@ -0,0 +1,232 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from beartype.typing import List
+from beartype import beartype
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import NetdbSettings
+from util.mongo_api import MongoAPI, AsyncMongoAPI
+from util.exception import NetDBException
+from models.types import OverrideDocument, COLUMN_TYPES, visible_query
+
+from .column_odm import ColumnODM, AsyncColumnODM
+
+
+@beartype
+class BaseBundleODM:
+    """
+    Driver independent part of the bundle ODM, which generates the sets of one or more
+    devices (set_ids) from several columns at once. BundleODM and AsyncBundleODM add
+    the (blocking and asyncio respectively) MongoDB operations.
+
+    Column documents for all devices are read concurrently with one query per column,
+    overrides for all devices and columns with a single query. If transactions are
+    enabled (i.e. MongoDB is a replica set) all reads are instead made from one
+    snapshot so that the bundle is consistent. Each column is generated once for all
+    devices.
+
+    """
+
+    # MongoDB driver and column ODM used by this ODM. Set by subclasses.
+    __mongo_api__: Callable[[str, str], Any]
+    __column_odm__: Callable[..., Any]
+
+    def __init__(
+        self,
+        set_ids: List[str],
+        column_types: Optional[List[str]] = None,
+        show_hidden: bool = False,
+    ):
+        """
+        Initialize a new bundle ODM.
+
+        set_ids:
+            The sets (i.e. devices) to bundle, at most `batch_max_set_ids' (setting)
+
+        column_types: ``None``
+            The columns to bundle. All columns if not given.
+
+        show_hidden: ``False``
+            Include 'hidden' (i.e. weight < 1) elements
+
+        """
+        max_set_ids = NetdbSettings.get_settings().batch_max_set_ids
+
+        # Keep request ordering and drop duplicates
+        self.set_ids = list(dict.fromkeys(set_ids))
+
+        if len(self.set_ids) > max_set_ids:
+            raise NetDBException(
+                code=422,
+                message=f'Too many set_ids (at most {max_set_ids} per request).',
+            )
+
+        for column_type in column_types or []:
+            if column_type not in COLUMN_TYPES:
+                raise NetDBException(
+                    code=404,
+                    message=f'Column {column_type} not available',
+                )
+
+        self.show_hidden = show_hidden
+
+        # Keep COLUMN_TYPES ordering and drop duplicates
+        self.column_types = [
+            column_type
+            for column_type in COLUMN_TYPES
+            if not column_types or column_type in column_types
+        ]
+
+    @property
+    def _query(self) -> dict:
+        """
+        Return the column query for the bundled sets.
+
+        """
+        return {'set_id': {'$in': self.set_ids}}
+
+    @property
+    def _override_query(self) -> dict:
+        """
+        Return the override table query for all bundled sets and columns.
+
+        """
+        return {**self._query, 'column_type': {'$in': self.column_types}}
+
+    def _generate_bundle(
+        self, documents: dict, overrides: List[OverrideDocument]
+    ) -> dict:
+        """
+        Generate each column once for all bundled sets and regroup the result by set.
+        Returns the bundled sets keyed by set_id and then column type. Sets and columns
+        without data are left out.
+
+        documents:
+            Column documents keyed by column type
+
+        overrides:
+            Overrides for the bundled sets in all bundled columns
+
+        """
+        out: dict = {set_id: {} for set_id in self.set_ids}
+
+        for column_type in self.column_types:
+            column = self.__column_odm__(column_type=column_type)
+            column.documents = documents[column_type]
+            column.__provide_all__ = self.show_hidden
+            column.set_overrides(
+                [
+                    override
+                    for override in overrides
+                    if override.column_type == column_type
+                ]
+            )
+
+            for set_id, data in column.generate_column().pruned_column.items():
+                if set_id in out and data:
+                    out[set_id][column_type] = data
+
+        return {set_id: sets for set_id, sets in out.items() if sets}
+
+
+@beartype
+class BundleODM(BaseBundleODM):
+    """
+    Bundle ODM backed by the blocking pymongo MongoDB driver. Columns are read
+    concurrently by a thread pool.
+
+    """
+
+    __mongo_api__ = MongoAPI
+    __column_odm__ = ColumnODM
+
+    def fetch(self) -> dict:
+        """
+        Return the bundled sets keyed by set_id and then column type.
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        overrides = self.__mongo_api__(settings.db_name, settings.override_table)
+
+        if settings.transactions:
+            documents, override_documents = overrides.read_snapshot(
+                self._query,
+                self.column_types,
+                settings.server_side_weights,
+                self.show_hidden,
+            )
+
+            return self._generate_bundle(documents, override_documents)
+
+        def read(column_type: str) -> list:
+            mongo = self.__mongo_api__(settings.db_name, column_type)
+
+            if settings.server_side_weights:
+                return mongo.read_column_resolved(self._query, self.show_hidden)
+
+            return mongo.read_column(visible_query(self._query, self.show_hidden))
+
+        with ThreadPoolExecutor(max_workers=len(self.column_types) + 1) as executor:
+            override_future = executor.submit(
+                overrides.read_overrides, self._override_query
+            )
+            documents = dict(
+                zip(self.column_types, executor.map(read, self.column_types))
+            )
+
+            return self._generate_bundle(documents, override_future.result())
+
+
+@beartype
+class AsyncBundleODM(BaseBundleODM):
+    """
+    Bundle ODM backed by the asyncio (motor) MongoDB driver. Columns are read
+    concurrently by asyncio tasks.
+
+    """
+
+    __mongo_api__ = AsyncMongoAPI
+    __column_odm__ = AsyncColumnODM
+
+    async def fetch(self) -> dict:
+        """
+        Async version of BundleODM.fetch()
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        overrides = self.__mongo_api__(settings.db_name, settings.override_table)
+
+        if settings.transactions:
+            documents, override_documents = await overrides.read_snapshot(
+                self._query,
+                self.column_types,
+                settings.server_side_weights,
+                self.show_hidden,
+            )
+
+            return await run_in_threadpool(
+                self._generate_bundle, documents, override_documents
+            )
+
+        async def read(column_type: str) -> list:
+            mongo = self.__mongo_api__(settings.db_name, column_type)
+
+            if settings.server_side_weights:
+                return await mongo.read_column_resolved(self._query, self.show_hidden)
+
+            return await mongo.read_column(visible_query(self._query, self.show_hidden))
+
+        override_documents, *columns = await asyncio.gather(
+            overrides.read_overrides(self._override_query),
+            *(read(column_type) for column_type in self.column_types),
+        )
+
+        # Sets are generated and validated in the threadpool.
+        return await run_in_threadpool(
+            self._generate_bundle,
+            dict(zip(self.column_types, columns)),
+            override_documents,
+        )
@@ -0,0 +1,168 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+from beartype.typing import List
+from pydantic_core import to_json
+
+from config.settings import NetdbSettings
+
+CacheKey = tuple[str, tuple[tuple[str, Any], ...], bool, bool, tuple[str, ...]]
+
+
+class ColumnCache:
+    """
+    Process wide LRU cache of generated (pruned) columns, bounded by entry count and
+    by the approximate size of the cached columns (i.e. their length as JSON).
+
+    Entries are keyed by (column_type, normalized filter, show_hidden, overrides enabled,
+    projected fields) and tagged with the column revision that was current when they
+    were generated. Column revisions are stored in MongoDB and bumped by every column
+    or override write, so an entry generated by any worker is only served while its
+    revision is still current.
+
+    Cached columns are shared between requests and must not be modified by callers.
+
+    """
+
+    __entries__: 'OrderedDict[CacheKey, tuple[int, dict, int]]' = OrderedDict()
+
+    # Total approximate size of the cached columns in bytes
+    __bytes__: int = 0
+
+    __lock__ = threading.Lock()
+
+    @staticmethod
+    def key(
+        column_type: str,
+        filt: Optional[dict],
+        show_hidden: bool,
+        enable_overrides: bool,
+        fields: Optional[List[str]] = None,
+    ) -> CacheKey:
+        """
+        Return the cache key for a column query.
+
+        column_type:
+            The column type (e.g. `bgp')
+
+        filt:
+            MongoDB filter used to fetch the column. Empty keys are ignored.
+
+        show_hidden:
+            Whether elements with weight < 1 are included
+
+        enable_overrides:
+            Whether overrides are applied
+
+        fields: ``None``
+            Element data fields the column was projected on, if any
+
+        """
+        normalized = tuple(sorted((k, v) for k, v in (filt or {}).items() if v))
+
+        return (
+            column_type,
+            normalized,
+            show_hidden,
+            enable_overrides,
+            tuple(fields or ()),
+        )
+
+    @classmethod
+    def get(cls, key: CacheKey, revision: int) -> Optional[dict]:
+        """
+        Return the cached column for key if it was generated at revision, else None.
+
+        key:
+            Cache key as returned by ColumnCache.key()
+
+        revision:
+            The current revision of the column
+
+        """
+        with cls.__lock__:
+            entry = cls.__entries__.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] != revision:
+                cls._drop(key)
+                return None
+
+            cls.__entries__.move_to_end(key)
+
+            return entry[1]
+
+    @classmethod
+    def put(cls, key: CacheKey, revision: int, column: dict) -> None:
+        """
+        Store a generated column, evicting the least recently used entries beyond the
+        `column_cache_size' and `column_cache_bytes' settings. A column larger than
+        `column_cache_bytes' by itself is not cached.
+
+        key:
+            Cache key as returned by ColumnCache.key()
+
+        revision:
+            The revision of the column read before the column was generated
+
+        column:
+            The generated (pruned) column
+
+        """
+        settings = NetdbSettings.get_settings()
+        size = settings.column_cache_size
+        max_bytes = settings.column_cache_bytes
+
+        nbytes = len(to_json(column))
+
+        with cls.__lock__:
+            if key in cls.__entries__:
+                cls._drop(key)
+
+            cls.__entries__[key] = (revision, column, nbytes)
+            cls.__bytes__ += nbytes
+
+            while cls.__entries__ and (
+                len(cls.__entries__) > size or (max_bytes and cls.__bytes__ > max_bytes)
+            ):
+                cls._drop(next(iter(cls.__entries__)))
+
+    @classmethod
+    def invalidate(cls, column_type: Optional[str] = None) -> None:
+        """
+        Drop cached entries for a column, or all entries if no column is given.
+
+        column_type: ``None``
+            The column type (e.g. `bgp')
+
+        """
+        with cls.__lock__:
+            for key in list(cls.__entries__):
+                if column_type is None or key[0] == column_type:
+                    cls._drop(key)
+
+    @classmethod
+    def size(cls) -> int:
+        """
+        Return the number of cached entries.
+
+        """
+        return len(cls.__entries__)
+
+    @classmethod
+    def nbytes(cls) -> int:
+        """
+        Return the total approximate size of the cached columns in bytes.
+
+        """
+        return cls.__bytes__
+
+    @classmethod
+    def _drop(cls, key: CacheKey) -> None:
+        """
+        Drop the entry for key. Must be called with the lock held.
+
+        """
+        cls.__bytes__ -= cls.__entries__.pop(key)[2]
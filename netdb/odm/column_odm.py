@@ -1,29 +1,73 @@
-from typing import Union, Optional, Self
-from beartype.typing import List
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, Callable, Union, Optional, Self
+from beartype.typing import AsyncIterator, Iterable, Iterator, List
 from beartype import beartype
-from fastapi.encoders import jsonable_encoder
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
 from config.settings import NetdbSettings
 from models.types import (
     RootContainer,
     NetdbDocument,
     OverrideDocument,
+    RevisionDocument,
     ColumnType,
     COLUMN_TYPES,
     COLUMN_FACTORY,
+    schema_version,
+    content_hash,
+    project_data,
+    visible_query,
 )
-from util.mongo_api import MongoAPI
+from util.mongo_api import MongoAPI, AsyncMongoAPI
 from util.exception import NetDBException
+from util.pagination import decode_cursor, encode_cursor, page_limit, set_id_range
+from .column_cache import ColumnCache, CacheKey
+from .device_registry import DeviceRegistry
+
+# Stored document fields needed to diff documents. See _diff_documents().
+DIFF_FIELDS = [
+    'set_id',
+    'category',
+    'family',
+    'element_id',
+    'datasource',
+    'content_hash',
+    'schema_version',
+]
+
+# Stored document fields needed to generate columns from documents projected on
+# element data fields. See BaseColumnODM.set_fields().
+ELEMENT_FIELDS = [
+    'set_id',
+    'category',
+    'family',
+    'element_id',
+    'datasource',
+    'weight',
+    'flat',
+    'schema_version',
+    'content_hash',
+]
 
 
 @beartype
-class ColumnODM:
+class BaseColumnODM:
+    """
+    Driver independent part of the column ODM: column type checks, conversion between
+    column containers and NetDB documents and column generation. ColumnODM and
+    AsyncColumnODM add the (blocking and asyncio respectively) MongoDB operations.
+
+    """
 
     # If set then elements with weight < 1 are presented as well
     __provide_all__ = False
 
-    # NetDB documents placed here pending save or column generation.
-    documents: Optional[List[NetdbDocument]] = None
+    # NetDB documents placed here pending save or column generation. See documents.
+    _documents: Optional[List[NetdbDocument]] = None
+
+    # Set while the documents of the container have not been generated. See documents.
+    __pending_container__ = False
 
     # Override documents placed here by fetch() when overrides enabled.
     override_documents: Optional[List[OverrideDocument]] = None
@@ -31,9 +75,16 @@ class ColumnODM:
     # Number of overrides applied to a generated column
     overrides_applied: int = 0
 
+    # Element data fields (dotted paths) generated columns are projected on. See
+    # set_fields().
+    fields: Optional[List[str]] = None
+
     # The colume type on which ColumnODM is operating.
     column_type: Optional[ColumnType] = None
 
+    # MongoDB driver used by this ODM. Set by subclasses.
+    __mongo_api__: Callable[[str, str], Any]
+
     def __init__(
         self,
         container: Optional[RootContainer] = None,
@@ -57,7 +108,9 @@ class ColumnODM:
         if container:
             self.container = container
             self.column_type = container.column_type
-            self._generate_netdb_documents()
+
+            # Documents are generated from the container when needed.
+            self.__pending_container__ = True
 
         elif column_type:
             self.column_type = column_type
@@ -77,27 +130,114 @@ class ColumnODM:
                 message=f'Column {self.column_type} confict with override table. Please rename.',
             )
 
+        if self.column_type == settings.revision_table:
+            raise NetDBException(
+                code=422,
+                message=f'Column {self.column_type} confict with revision table. Please rename.',
+            )
+
         # Initialize the MongoDB driver
-        self.mongo = MongoAPI(settings.db_name, self.column_type)
+        self.mongo = self.__mongo_api__(settings.db_name, self.column_type)
 
     @property
     def pruned_column(self) -> dict:
         """
         Return a "pruned column", which is simply the column data itself absent the encap-
         sulating container, in dict formart and with empty keys removed.
+
+        Sets placed into the container unvalidated by a trusted read are plain dicts
+        already in this format and are returned as is.
+        """
+        return {
+            set_id: (
+                set_data.model_dump(mode='json', by_alias=True, exclude_none=True)
+                if isinstance(set_data, BaseModel)
+                else set_data
+            )
+            for set_id, set_data in self.container.column.items()
+        }
+
+    def generated_column(self) -> dict:
+        """
+        Return the pruned column generated from the documents, i.e.
+        generate_column().pruned_column. Used by the async ODMs to run the (CPU bound)
+        column generation in the threadpool rather than on the event loop.
+
+        """
+        return self.generate_column().pruned_column
+
+    @property
+    def documents(self) -> Optional[List[NetdbDocument]]:
+        """
+        Return the NetDB documents pending save or column generation. The documents
+        of the container are generated on first access.
+
+        """
+        if self.__pending_container__:
+            self.documents = list(self._iter_netdb_documents())
+
+        return self._documents
+
+    @documents.setter
+    def documents(self, documents: Optional[List[NetdbDocument]]) -> None:
+        """
+        Set the NetDB documents pending save or column generation.
+
+        """
+        self.__pending_container__ = False
+        self._documents = documents
+
+    def _reload_documents(self) -> Optional[Iterable[NetdbDocument]]:
         """
-        return jsonable_encoder(self.container.column, exclude_none=True)
+        Return the documents to be written by reload(). Without transactions or swap
+        reloads, the stored documents are deleted before the new ones are inserted, so
+        the documents of the container are then all generated (and validated) first
+        rather than as they are written: a container failing part way must not leave
+        the column half deleted.
 
-    def _generate_netdb_documents(self) -> None:
+        """
+        settings = NetdbSettings.get_settings()
+
+        if settings.transactions or settings.swap_reloads:
+            return self._pending_documents()
+
+        return self.documents
+
+    def _pending_documents(self) -> Optional[Iterable[NetdbDocument]]:
+        """
+        Return the documents pending save. The documents of the container are
+        generated lazily as they are consumed (e.g. written to MongoDB) unless they
+        were already placed into self.documents.
+
+        """
+        if self.__pending_container__:
+            return self._iter_netdb_documents()
+
+        return self.documents
+
+    @staticmethod
+    def _hashed(document: NetdbDocument) -> NetdbDocument:
+        """
+        Set the content hash of a generated document.
+
+        """
+        document.content_hash = content_hash(document)
+
+        return document
+
+    def _iter_netdb_documents(self) -> Iterator[NetdbDocument]:
         """
         Convert Pydantic serialized column dict formated data into NetdbDocument format
-        which can then be loaded into MongoDB.
+        which can then be loaded into MongoDB. Documents are generated one at a time
+        (e.g. as they are written by MongoAPI.insert_chunked()).
         """
-        out = []
 
         datasource = self.container.datasource
         weight = self.container.weight
 
+        # Column data was validated on the way in, so record the model version.
+        version = schema_version(self.column_type)
+
         for set_id, set_data in self.pruned_column.items():
             if self.container.flat:
                 #
@@ -112,8 +252,9 @@ class ColumnODM:
                     weight=weight,
                     flat=True,
                     data=set_data,
+                    schema_version=version,
                 )
-                out.append(entry)
+                yield self._hashed(entry)
 
                 continue
 
@@ -145,8 +286,9 @@ class ColumnODM:
                                     datasource=datasource,
                                     weight=weight,
                                     data=family_element_data,
+                                    schema_version=version,
                                 )
-                                out.append(entry)
+                                yield self._hashed(entry)
                         else:
                             entry = NetdbDocument(
                                 set_id=set_id,
@@ -156,8 +298,9 @@ class ColumnODM:
                                 datasource=datasource,
                                 weight=weight,
                                 data=element_data,
+                                schema_version=version,
                             )
-                            out.append(entry)
+                            yield self._hashed(entry)
                 else:
                     #
                     # In cases of columns with no categories (e.g. 'interface' column)
@@ -171,42 +314,46 @@ class ColumnODM:
                         weight=weight,
                         flat=False,
                         data=set_element_data,
+                        schema_version=version,
                     )
-                    out.append(entry)
-
-        self.documents = out
+                    yield self._hashed(entry)
 
-    def generate_column(self) -> Self:
+    def generate_column(
+        self, documents: Optional[Iterable[NetdbDocument]] = None
+    ) -> Self:
         """
         Convert NetDB documents into column formated dict data.
+
+        If the `trusted_reads' setting is enabled then sets made up only of documents
+        stamped with the current column schema version (and without overrides) are
+        not revalidated against the column model.
+
+        documents: ``None``
+            Documents (e.g. a streaming MongoDB read) to be used instead of
+            self.documents. Iterated over once.
+
         """
         out: dict = {}
 
-        if self.documents is None or self.column_type is None:
+        # Sets which must be validated in trusted read mode.
+        untrusted: set = set()
+        version = schema_version(self.column_type) if self.column_type else None
+        show_content_hash = NetdbSettings.get_settings().show_content_hash
+
+        if documents is None:
+            documents = self.documents
+
+        if documents is None or self.column_type is None:
             raise NetDBException(
                 code=503,
                 message='ColumnODM.generate_column called before setting column_type or loading documents from datasource.',
             )
 
-        override_map = None
-        if self.override_documents:
-            #
-            # If overrides are to be included. Then we read overrides for this column and
-            # generate a tuple keyed dict for them that can be used for fast lookups.
-            #
-            override_map = {
-                (
-                    document.set_id,
-                    document.category,
-                    document.family,
-                    document.element_id,
-                ): document.data
-                for document in self.override_documents
-            }
-
+        override_map = self._override_map()
+        if override_map:
             self.overrides_applied = 0
 
-        for document in self.documents:
+        for document in documents:
 
             element = document.model_dump()
 
@@ -220,7 +367,9 @@ class ColumnODM:
                 continue
 
             unwind = out
-            element_data = element.pop('data')
+
+            # Documents projected on fields they do not hold are read without data.
+            element_data = element.pop('data', {})
 
             if element.pop('flat', False):
                 #
@@ -252,6 +401,9 @@ class ColumnODM:
                 'weight': element['weight'],
             }
 
+            if show_content_hash and document.content_hash:
+                element_data['meta']['netdb']['content_hash'] = document.content_hash
+
             if unwind.get(element_id):
                 #
                 # If the element (or set in case of flat columns) is already in the dict
@@ -271,30 +423,113 @@ class ColumnODM:
                 ):
                     continue
 
-            if override_map:
-                #
-                # If overrides includes enabled and overrides exist then merge the override
-                # data into the config data.
-                #
-                override_tuple = (
-                    document.set_id,
-                    document.category,
-                    document.family,
-                    document.element_id,
-                )
+            if override_map and self._apply_override(
+                document, element_data, override_map
+            ):
+                untrusted.add(document.set_id)
 
-                # Update with override data if any found.
-                if override_data := override_map.get(override_tuple):
-                    element_data.update(override_data)
-                    element_data['meta']['netdb']['override'] = True
-                    self.overrides_applied += 1
+            if document.schema_version != version:
+                untrusted.add(document.set_id)
 
             unwind[element_id] = element_data
 
-        try:
-            self.container = COLUMN_FACTORY[self.column_type](
-                datasource="netdb", column_type=self.column_type, weight=0, column=out
+        self._set_container(COLUMN_FACTORY[self.column_type], out, untrusted)
+
+        return self
+
+    def _override_map(self) -> Optional[dict]:
+        """
+        Return the data of self.override_documents keyed by the element they override,
+        for fast lookups. None if overrides are not to be included.
+
+        """
+        if not self.override_documents:
+            return None
+
+        return {
+            (
+                document.set_id,
+                document.category,
+                document.family,
+                document.element_id,
+            ): document.data
+            for document in self.override_documents
+        }
+
+    def _apply_override(
+        self, document: NetdbDocument, element_data: dict, override_map: dict
+    ) -> bool:
+        """
+        Merge the override data (if any) of the element stored in document into its
+        element data. Returns whether an override was applied.
+
+        """
+        override_data = override_map.get(
+            (
+                document.set_id,
+                document.category,
+                document.family,
+                document.element_id,
             )
+        )
+
+        if not override_data:
+            return False
+
+        if self.fields:
+            override_data = project_data(override_data, self.fields)
+
+        element_data.update(override_data)
+        element_data['meta']['netdb']['override'] = True
+        self.overrides_applied += 1
+
+        return True
+
+    def _set_container(self, container: Any, out: dict, untrusted: set) -> None:
+        """
+        Build self.container of the container class from generated column data,
+        validating the sets in untrusted (or all sets unless the `trusted_reads'
+        setting is enabled).
+
+        """
+        try:
+            if self.fields:
+                #
+                # Projected columns are partial and would not pass validation. They
+                # are assembled from stored (i.e. already validated) data only.
+                #
+                self.container = container.model_construct(
+                    datasource="netdb",
+                    column_type=self.column_type,
+                    weight=0,
+                    column=out,
+                )
+            elif NetdbSettings.get_settings().trusted_reads:
+                #
+                # Only validate those sets which contain stale (or unversioned) documents
+                # or overridden elements. The remaining sets are stored as is, having
+                # already been validated by the current column model on write.
+                #
+                validated = container(
+                    datasource="netdb",
+                    column_type=self.column_type,
+                    weight=0,
+                    column={k: v for k, v in out.items() if k in untrusted},
+                ).column
+
+                self.container = container.model_construct(
+                    datasource="netdb",
+                    column_type=self.column_type,
+                    weight=0,
+                    column={k: validated.get(k, v) for k, v in out.items()},
+                )
+            else:
+                self.container = container(
+                    datasource="netdb",
+                    column_type=self.column_type,
+                    weight=0,
+                    column=out,
+                )
         except ValidationError as e:
             raise NetDBException(
                 code=422,
@@ -302,25 +537,72 @@ class ColumnODM:
                 out=e.errors(),
             ) from e
 
-        return self
+    @staticmethod
+    def _element_key(document: NetdbDocument) -> tuple:
+        """
+        Return the key identifying the column element (or set in the case of flat
+        columns) stored in a document.
 
-    def _is_registered(self) -> bool:
         """
-        This method enforces one particular constraint, namely that set_ids in all
-        columns except for the device column should align with a set (i.e. device)
-        within in the device column. That is to say set_ids are expected to be device
-        names and the device should already be 'registered' in the device column.
+        return (
+            document.set_id,
+            document.category,
+            document.family,
+            document.element_id,
+        )
+
+    def _diff_documents(self, stored: List[NetdbDocument]) -> dict:
+        """
+        Compare self.documents with the stored documents they are to replace. Returns
+        the documents to be added, changed (replaced) and removed along with the
+        number of unchanged documents. Documents are compared by content hash and
+        schema version. Stored documents without a content hash are always replaced.
+
+        stored:
+            Documents currently stored for the reloaded part of the column
 
         """
-        devices = [
-            device.set_id
-            for device in MongoAPI(
-                NetdbSettings.get_settings().db_name, 'device'
-            ).read_column()
-        ]
+        current = {self._element_key(document): document for document in stored}
+
+        diff: dict = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0}
+
+        for document in self.documents or []:
+            old = current.pop(self._element_key(document), None)
+
+            if old is None:
+                diff['added'].append(document)
+            elif (
+                not old.content_hash
+                or old.content_hash != document.content_hash
+                or old.schema_version != document.schema_version
+            ):
+                diff['changed'].append(document)
+            else:
+                diff['unchanged'] += 1
+
+        diff['removed'] = list(current.values())
 
+        return diff
+
+    @staticmethod
+    def _diff_counts(diff: dict) -> dict:
+        """
+        Return the document counts of a diff returned by _diff_documents().
+
+        """
+        return {k: v if isinstance(v, int) else len(v) for k, v in diff.items()}
+
+    def _check_registered(self, registered: frozenset) -> bool:
+        """
+        Raise a NetDBException unless every set_id in the container is found within
+        the registered device names.
+
+        registered:
+            Registered device names (i.e. device column set_ids)
+
+        """
         for set_id in self.container.column.keys():
-            if set_id not in devices:
+            if set_id not in registered:
                 raise NetDBException(
                     code=422,
                     message=f'{set_id}: device not registered.',
@@ -328,6 +610,378 @@ class ColumnODM:
 
         return True
 
+    def _override_query(self, filt: dict) -> dict:
+        """
+        Return the override table query matching a column filter.
+
+        filt:
+            Column filter as passed to fetch()
+
+        """
+        override_filt = {
+            k: v
+            for k, v in filt.items()
+            if k in ['set_id', 'category', 'family', 'element_id'] and v
+        }
+
+        return {'column_type': self.column_type, **override_filt}
+
+    def _cache_key(
+        self, filt: Union[dict, None], show_hidden: bool, enable_overrides: bool
+    ) -> CacheKey:
+        """
+        Return the ColumnCache key for a fetch of this column.
+
+        """
+        return ColumnCache.key(
+            str(self.column_type), filt, show_hidden, enable_overrides, self.fields
+        )
+
+    def _generate_set(
+        self, set_id: str, documents: List[NetdbDocument], overrides: dict
+    ) -> Optional[dict]:
+        """
+        Generate and validate a single set from its documents only. Returns the pruned
+        set or None if it has no (visible) elements.
+
+        set_id:
+            The set (i.e. device)
+
+        documents:
+            All column documents of the set
+
+        overrides:
+            Override documents keyed by set_id
+
+        """
+        self.override_documents = overrides.get(set_id)
+
+        return self.generate_column(documents).pruned_column.get(set_id)
+
+    @staticmethod
+    def _overrides_by_set(documents: List[OverrideDocument]) -> dict:
+        """
+        Return override documents keyed by set_id.
+
+        """
+        out: dict = {}
+
+        for document in documents:
+            out.setdefault(document.set_id, []).append(document)
+
+        return out
+
+    @staticmethod
+    def _page_start(cursor: Optional[str]) -> Optional[str]:
+        """
+        Return the set_id of the last set on the previous page, if any.
+
+        """
+        return decode_cursor(cursor, 1)[0] if cursor else None
+
+    @staticmethod
+    def _next_cursor(set_ids: List[str], size: int) -> Optional[str]:
+        """
+        Return the cursor of the page following the first size of set_ids, or None
+        for the last page.
+
+        """
+        return encode_cursor([set_ids[size - 1]]) if len(set_ids) > size else None
+
+    def set_fields(self, fields: Optional[List[str]]) -> Self:
+        """
+        Project generated columns on element data fields. Only these fields are read
+        from MongoDB (and taken from overrides), e.g. `['cvars.router_id']' for the
+        device column or `['type', 'address']' for the interface column. Paths are
+        relative to the element, i.e. to the set in the case of flat columns. Projected
+        columns are partial and thus not validated against the column model.
+
+        fields:
+            Dotted paths into element data. No projection if empty.
+
+        """
+        fields = sorted(set(fields or []))
+
+        for field in fields:
+            if not field or field.startswith('$') or '' in field.split('.'):
+                raise NetDBException(code=422, message=f'Invalid field: {field}')
+
+        # MongoDB rejects overlapping projection paths. The shorter path covers both.
+        self.fields = [
+            field
+            for field in fields
+            if not any(field.startswith(f'{other}.') for other in fields)
+        ] or None
+
+        return self
+
+    def _document_fields(self) -> Optional[List[str]]:
+        """
+        Return the document fields to be read for set_fields(), if any.
+
+        """
+        if not self.fields:
+            return None
+
+        return ELEMENT_FIELDS + [f'data.{field}' for field in self.fields]
+
+    def _iter_documents(
+        self, filt: dict, show_hidden: bool, by_set: bool = False
+    ) -> Any:
+        """
+        Return an iterator (an async iterator with the async driver) over the column
+        documents matching filt. If the `server_side_weights' setting is enabled then
+        only the winning document for each element is read.
+
+        by_set: ``False``
+            Read documents sorted by set_id
+
+        """
+        fields = self._document_fields()
+
+        if NetdbSettings.get_settings().server_side_weights:
+            # Resolved documents are always sorted by set_id
+            return self.mongo.iter_column_resolved(filt, show_hidden, fields)
+
+        return self.mongo.iter_column(
+            visible_query(filt, show_hidden),
+            fields,
+            sort=['set_id'] if by_set else None,
+        )
+
+    def _read_overrides(self, filt: dict) -> Any:
+        """
+        Read the overrides matching a column filter. Returns a coroutine with the
+        async driver.
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        return self.__mongo_api__(
+            settings.db_name, settings.override_table
+        ).read_overrides(query=self._override_query(filt))
+
+    def set_overrides(self, documents: List[OverrideDocument]) -> Self:
+        """
+        Set load inputted override documents into self.override so they can be used in column
+        generation. Used by OverrideHandler to validate new overrides.
+
+        documents:
+            List of override documents
+
+        """
+        self.override_documents = documents
+
+        return self
+
+
+@beartype
+class ColumnODM(BaseColumnODM):
+    """
+    Column ODM backed by the blocking pymongo MongoDB driver.
+
+    """
+
+    __mongo_api__ = MongoAPI
+
+    def _is_registered(self) -> bool:
+        """
+        This method enforces one particular constraint, namely that set_ids in all
+        columns except for the device column should align with a set (i.e. device)
+        within in the device column. That is to say set_ids are expected to be device
+        names and the device should already be 'registered' in the device column.
+
+        Registered device names are kept in the DeviceRegistry as long as the device
+        column revision is unchanged.
+
+        """
+        return self._check_registered(
+            self.registered_devices(self.container.column.keys())
+        )
+
+    def registered_devices(self, set_ids: Iterable[str]) -> frozenset:
+        """
+        Return the registered device names (i.e. the device column set_ids) as kept
+        by the DeviceRegistry for the current device column revision. Those of set_ids
+        which are missing are looked up (rather than reloading all names), in case the
+        device was added directly.
+
+        set_ids:
+            The set_ids about to be checked
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        revision = (
+            self.__mongo_api__(settings.db_name, settings.revision_table)
+            .read_revision('device')
+            .revision
+        )
+
+        devices = self.__mongo_api__(settings.db_name, 'device')
+        registered = DeviceRegistry.get(revision)
+
+        if registered is None:
+            registered = frozenset(devices.read_set_ids())
+            DeviceRegistry.put(revision, registered)
+        elif missing := set(set_ids) - registered:
+            if found := devices.read_set_ids({'set_id': {'$in': sorted(missing)}}):
+                registered = registered.union(found)
+                DeviceRegistry.put(revision, registered)
+
+        return registered
+
+    def revision(self) -> RevisionDocument:
+        """
+        Return the current revision of the column.
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        return self.__mongo_api__(
+            settings.db_name, settings.revision_table
+        ).read_revision(str(self.column_type))
+
+    def bump_revision(self) -> None:
+        """
+        Bump the column revision after a write, invalidating cached column data (and
+        the DeviceRegistry for the device column) in all workers.
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        self.__mongo_api__(settings.db_name, settings.revision_table).bump_revision(
+            str(self.column_type)
+        )
+        ColumnCache.invalidate(self.column_type)
+
+        if self.column_type == 'device':
+            DeviceRegistry.invalidate()
+
+    def fetch_column(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+        revision: Optional[int] = None,
+    ) -> dict:
+        """
+        Return the pruned column matching filt, i.e. the result of fetch(),
+        generate_column() and pruned_column. Served from the ColumnCache, if enabled,
+        as long as the column revision is unchanged. Other arguments as for fetch().
+
+        revision: ``None``
+            Column revision already read by the caller (before any documents were
+            read). Read here if not given.
+
+        """
+        if not NetdbSettings.get_settings().column_cache_size:
+            return self.stream_column(filt, show_hidden, enable_overrides)
+
+        key = self._cache_key(filt, show_hidden, enable_overrides)
+
+        # The revision must be read before the documents. See ColumnCache.
+        if revision is None:
+            revision = self.revision().revision
+
+        if (out := ColumnCache.get(key, revision)) is None:
+            out = self.stream_column(filt, show_hidden, enable_overrides)
+            ColumnCache.put(key, revision, out)
+
+        return out
+
+    def stream_column(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+    ) -> dict:
+        """
+        Return the pruned column matching filt. Unlike fetch() the column documents
+        are not materialized as a list but merged into the column as they are read
+        from the MongoDB cursor. Arguments as for fetch().
+
+        """
+        filt = filt or {}
+
+        self.__provide_all__ = show_hidden
+
+        if enable_overrides:
+            self.override_documents = self._read_overrides(filt)
+
+        return self.generate_column(
+            self._iter_documents(filt, show_hidden)
+        ).pruned_column
+
+    def iter_sets(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+    ) -> Iterator[tuple[str, dict]]:
+        """
+        Iterate over the pruned sets of the column matching filt as (set_id, set)
+        pairs. Documents are read sorted by set_id and each set is generated and
+        validated on its own as soon as its documents have been read, so that only
+        one set is held in memory at a time. Arguments as for fetch().
+
+        """
+        filt = filt or {}
+
+        self.__provide_all__ = show_hidden
+
+        overrides = {}
+        if enable_overrides:
+            overrides = self._overrides_by_set(self._read_overrides(filt))
+
+        for set_id, documents in groupby(
+            self._iter_documents(filt, show_hidden, by_set=True),
+            key=attrgetter('set_id'),
+        ):
+            if data := self._generate_set(set_id, list(documents), overrides):
+                yield set_id, data
+
+    def fetch_page(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[dict, Optional[str]]:
+        """
+        Return a page of the pruned column matching filt holding up to limit sets,
+        and the cursor of the next page (None for the last page). Sets are paged in
+        set_id order: the set_ids on the page are read first (an index range scan
+        continuing after the cursor), then all documents of these sets, so that each
+        set is weight resolved and overridden as a whole.
+
+        filt: ``None``
+            Filter the query using a MongoDB compatable dict based filter
+
+        show_hidden: ``False``
+            Return 'hidden' (i.e. weight < 1) elements
+
+        cursor: ``None``
+            Cursor returned with the previous page. First page if not given.
+
+        limit: ``None``
+            Maximum number of sets on the page. Capped at the `page_max_limit' setting.
+
+        """
+        filt = filt or {}
+        after = self._page_start(cursor)
+        size = page_limit(limit)
+
+        set_ids = self.mongo.read_set_ids_sorted(
+            visible_query(set_id_range(filt, after), show_hidden), size + 1
+        )
+        if not set_ids:
+            return {}, None
+
+        page = set_id_range(filt, after, set_ids[:size][-1])
+
+        return dict(self.iter_sets(page, show_hidden)), self._next_cursor(set_ids, size)
+
     def fetch(
         self,
         filt: Union[dict, None] = None,
@@ -335,7 +989,9 @@ class ColumnODM:
         enable_overrides: bool = True,
     ) -> Self:
         """
-        Pull column ducuments from MongoDB and store them in self.documents.
+        Pull column ducuments from MongoDB and store them in self.documents. If the
+        `server_side_weights' setting is enabled then weights are resolved by MongoDB
+        and only the winning document for each element is pulled.
 
         filt: ``None``
             Filter the query using a MongoDB compatable dict based filter
@@ -349,30 +1005,20 @@ class ColumnODM:
         """
         filt = filt or {}
 
-        self.documents = self.mongo.read_column(filt)
+        self.documents = list(self._iter_documents(filt, show_hidden))
 
         self.__provide_all__ = show_hidden
 
         if enable_overrides:
-
-            settings = NetdbSettings.get_settings()
-
-            override_filt = {
-                k: v
-                for k, v in filt.items()
-                if k in ['set_id', 'category', 'family', 'element_id'] and v
-            }
-            self.override_documents = MongoAPI(
-                settings.db_name, settings.override_table
-            ).read_overrides(query={'column_type': self.column_type, **override_filt})
+            self.override_documents = self._read_overrides(filt)
 
         return self
 
     def reload(self, filt: Optional[dict] = None) -> Self:
         """
         Replace entire column or parts of column filtered by datasource with new data.
-        Documents should already be loaded into into self.documents by
-        self._generate_netdb_documents().
+        Documents are generated from the container as they are written, provided that
+        the reload is atomic (see _reload_documents()).
 
         This method is used by various SoT backends to manage 'their' portions of the
         configuration data column (as identified by 'datasource').
@@ -384,19 +1030,56 @@ class ColumnODM:
         if self.column_type != 'device':
             self._is_registered()
 
-        if self.documents is None:
+        documents = self._reload_documents()
+
+        if documents is None:
             raise NetDBException(
                 code=503, message='ColumnODM.reload called on empty document set'
             )
 
-        self.mongo.reload(self.documents, filt)
+        try:
+            self.mongo.reload(documents, filt)
+        finally:
+            self.bump_revision()
 
         return self
 
+    def reload_delta(self, filt: Optional[dict] = None) -> dict:
+        """
+        Delta version of reload(). Stored documents are compared with the new ones
+        (see _diff_documents()) and only the required inserts, replaces and deletes
+        are written in a single bulk write. The column revision is only bumped if
+        something changed. Returns the number of added, changed, removed and
+        unchanged documents.
+
+        filt: ``None``
+            Additional filter limiting the reloaded part of the column
+
+        """
+        filt = filt or {}
+        filt.update({'datasource': self.container.datasource})
+
+        if self.column_type != 'device':
+            self._is_registered()
+
+        if self.documents is None:
+            raise NetDBException(
+                code=503, message='ColumnODM.reload called on empty document set'
+            )
+
+        diff = self._diff_documents(self.mongo.read_column(filt, fields=DIFF_FIELDS))
+
+        if diff['added'] or diff['changed'] or diff['removed']:
+            try:
+                self.mongo.write_delta(diff['added'], diff['changed'], diff['removed'])
+            finally:
+                self.bump_revision()
+
+        return self._diff_counts(diff)
+
     def delete(self, filt: dict) -> int:
         """
-        Delete documents from MongoDB filtered by filter. Documents should already be
-        loaded into self.documents by self._generate_netdb_documents().
+        Delete documents from MongoDB filtered by filter.
 
         """
         if not filt:
@@ -406,12 +1089,15 @@ class ColumnODM:
                 message='Invalid filter.',
             )
 
-        return self.mongo.delete_many(filt)
+        try:
+            return self.mongo.delete_many(filt)
+        finally:
+            self.bump_revision()
 
-    def replace(self) -> int:
+    def replace(self) -> dict:
         """
-        Upsert existing documents with new ones. Documents should already be loaded
-        into self.documents by self._generate_netdb_documents().
+        Upsert existing documents with the documents of the container using a single
+        bulk write. Returns the matched, modified and upserted document counts.
 
         """
         if self.column_type != 'device':
@@ -422,25 +1108,27 @@ class ColumnODM:
                 code=500, message='ColumnODM.replace called on empty document set'
             )
 
-        count = 0
-        for document in self.documents:
-            if self.mongo.replace_one(document):
-                count += 1
-
-        return count
+        try:
+            return self.mongo.replace_many(self.documents)
+        finally:
+            self.bump_revision()
 
-    def set_overrides(self, documents: List[OverrideDocument]) -> Self:
+    def backfill_content_hash(self, batch_size: int = 1000) -> int:
         """
-        Set load inputted override documents into self.override so they can be used in column
-        generation. Used by OverrideHandler to validate new overrides.
+        Set the content hash of column documents stored without one (i.e. written
+        before content hashes were recorded). Returns the number of documents updated.
 
-        documents:
-            List of override documents
+        batch_size: ``1000``
+            Number of documents updated per bulk write
 
         """
-        self.override_documents = documents
+        count = self.mongo.backfill_content_hash(batch_size)
 
-        return self
+        if count:
+            # Generated columns may include content hashes. See show_content_hash.
+            self.bump_revision()
+
+        return count
 
     def validate(self) -> bool:
         """
@@ -453,3 +1141,205 @@ class ColumnODM:
             self._is_registered()
 
         return True
+
+
+@beartype
+class AsyncColumnODM(BaseColumnODM):
+    """
+    Column ODM backed by the asyncio (motor) MongoDB driver. Methods which touch
+    MongoDB are coroutines. Reads are made with the async driver. Writes are made
+    by the blocking ColumnODM run in the threadpool (see _blocking()), as are
+    document and column generation.
+
+    """
+
+    __mongo_api__ = AsyncMongoAPI
+
+    def _blocking(self) -> ColumnODM:
+        """
+        Return a ColumnODM holding the container (or the documents) of this ODM and
+        backed by the blocking driver of self.mongo, to be run in the threadpool.
+
+        """
+        odm = ColumnODM(
+            container=getattr(self, 'container', None), column_type=self.column_type
+        )
+        odm.mongo = self.mongo.blocking
+
+        if not self.__pending_container__:
+            odm.documents = self._documents
+
+        return odm
+
+    async def revision(self) -> RevisionDocument:
+        """
+        Async version of ColumnODM.revision()
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        return await self.__mongo_api__(
+            settings.db_name, settings.revision_table
+        ).read_revision(str(self.column_type))
+
+    async def bump_revision(self) -> None:
+        """
+        Async version of ColumnODM.bump_revision()
+
+        """
+        await run_in_threadpool(self._blocking().bump_revision)
+
+    async def fetch_column(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+        revision: Optional[int] = None,
+    ) -> dict:
+        """
+        Async version of ColumnODM.fetch_column()
+
+        """
+        if not NetdbSettings.get_settings().column_cache_size:
+            odm = await self.fetch(filt, show_hidden, enable_overrides)
+            return await run_in_threadpool(odm.generated_column)
+
+        key = self._cache_key(filt, show_hidden, enable_overrides)
+
+        # The revision must be read before the documents. See ColumnCache.
+        if revision is None:
+            revision = (await self.revision()).revision
+
+        if (out := ColumnCache.get(key, revision)) is None:
+            odm = await self.fetch(filt, show_hidden, enable_overrides)
+            out = await run_in_threadpool(odm.generated_column)
+            ColumnCache.put(key, revision, out)
+
+        return out
+
+    async def iter_sets(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Async version of ColumnODM.iter_sets()
+
+        """
+        filt = filt or {}
+
+        self.__provide_all__ = show_hidden
+
+        overrides = {}
+        if enable_overrides:
+            overrides = self._overrides_by_set(await self._read_overrides(filt))
+
+        documents: List[NetdbDocument] = []
+
+        async for document in self._iter_documents(filt, show_hidden, by_set=True):
+            if documents and document.set_id != documents[0].set_id:
+                set_id = documents[0].set_id
+                if data := await run_in_threadpool(
+                    self._generate_set, set_id, documents, overrides
+                ):
+                    yield set_id, data
+
+                documents = []
+
+            documents.append(document)
+
+        if documents:
+            set_id = documents[0].set_id
+            if data := await run_in_threadpool(
+                self._generate_set, set_id, documents, overrides
+            ):
+                yield set_id, data
+
+    async def fetch_page(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[dict, Optional[str]]:
+        """
+        Async version of ColumnODM.fetch_page()
+
+        """
+        filt = filt or {}
+        after = self._page_start(cursor)
+        size = page_limit(limit)
+
+        set_ids = await self.mongo.read_set_ids_sorted(
+            visible_query(set_id_range(filt, after), show_hidden), size + 1
+        )
+        if not set_ids:
+            return {}, None
+
+        page = set_id_range(filt, after, set_ids[:size][-1])
+
+        return {
+            set_id: data async for set_id, data in self.iter_sets(page, show_hidden)
+        }, self._next_cursor(set_ids, size)
+
+    async def fetch(
+        self,
+        filt: Union[dict, None] = None,
+        show_hidden: bool = False,
+        enable_overrides: bool = True,
+    ) -> Self:
+        """
+        Async version of ColumnODM.fetch()
+
+        """
+        filt = filt or {}
+
+        self.documents = [
+            document async for document in self._iter_documents(filt, show_hidden)
+        ]
+
+        self.__provide_all__ = show_hidden
+
+        if enable_overrides:
+            self.override_documents = await self._read_overrides(filt)
+
+        return self
+
+    async def reload(self, filt: Optional[dict] = None) -> Self:
+        """
+        Async version of ColumnODM.reload(). Documents are generated as they are
+        written, in the threadpool.
+
+        """
+        await run_in_threadpool(self._blocking().reload, filt)
+
+        return self
+
+    async def reload_delta(self, filt: Optional[dict] = None) -> dict:
+        """
+        Async version of ColumnODM.reload_delta()
+
+        """
+        return await run_in_threadpool(self._blocking().reload_delta, filt)
+
+    async def delete(self, filt: dict) -> int:
+        """
+        Async version of ColumnODM.delete()
+
+        """
+        return await run_in_threadpool(self._blocking().delete, filt)
+
+    async def replace(self) -> dict:
+        """
+        Async version of ColumnODM.replace()
+
+        """
+        return await run_in_threadpool(self._blocking().replace)
+
+    async def validate(self) -> bool:
+        """
+        Async version of ColumnODM.validate()
+
+        """
+        return await run_in_threadpool(self._blocking().validate)
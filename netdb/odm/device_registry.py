@@ -0,0 +1,62 @@
+import threading
+from typing import Optional
+
+
+class DeviceRegistry:
+    """
+    Process wide cache of the set of registered device names (i.e. the set_ids in the
+    device column) used to check that column sets belong to registered devices.
+
+    The registry is tagged with the device column revision that was current when it
+    was loaded. Device column revisions are stored in MongoDB and bumped by every
+    device column write, so a registry loaded by any worker is only used while its
+    revision is still current.
+
+    """
+
+    __devices__: Optional[frozenset] = None
+
+    __revision__: Optional[int] = None
+
+    __lock__ = threading.Lock()
+
+    @classmethod
+    def get(cls, revision: int) -> Optional[frozenset]:
+        """
+        Return the registered device names if loaded at revision, else None.
+
+        revision:
+            The current revision of the device column
+
+        """
+        with cls.__lock__:
+            if cls.__revision__ != revision:
+                return None
+
+            return cls.__devices__
+
+    @classmethod
+    def put(cls, revision: int, devices: frozenset) -> None:
+        """
+        Store the registered device names.
+
+        revision:
+            The revision of the device column read before the device names were read
+
+        devices:
+            The registered device names
+
+        """
+        with cls.__lock__:
+            cls.__devices__ = devices
+            cls.__revision__ = revision
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Drop the registered device names.
+
+        """
+        with cls.__lock__:
+            cls.__devices__ = None
+            cls.__revision__ = None
@@ -0,0 +1,81 @@
+import inspect
+from typing import Any, Callable, List, Optional, Union
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import NetdbSettings
+from models.types import RootContainer, ColumnType
+
+from .column_odm import ColumnODM, AsyncColumnODM
+from .override_handler import OverrideHandler, AsyncOverrideHandler
+from .bundle_odm import BundleODM, AsyncBundleODM
+from .raw_odm import RawODM, AsyncRawODM
+
+
+def column_odm(
+    container: Optional[RootContainer] = None,
+    column_type: Optional[ColumnType] = None,
+) -> Union[ColumnODM, AsyncColumnODM]:
+    """
+    Return a ColumnODM backed by the MongoDB driver selected by the `async_driver'
+    setting. Arguments are the same as for ColumnODM.
+
+    """
+    if NetdbSettings.get_settings().async_driver:
+        return AsyncColumnODM(container=container, column_type=column_type)
+
+    return ColumnODM(container=container, column_type=column_type)
+
+
+def override_handler() -> Union[OverrideHandler, AsyncOverrideHandler]:
+    """
+    Return an OverrideHandler backed by the MongoDB driver selected by the
+    `async_driver' setting.
+
+    """
+    if NetdbSettings.get_settings().async_driver:
+        return AsyncOverrideHandler()
+
+    return OverrideHandler()
+
+
+def bundle_odm(
+    set_ids: List[str],
+    column_types: Optional[List[str]] = None,
+    show_hidden: bool = False,
+) -> Union[BundleODM, AsyncBundleODM]:
+    """
+    Return a BundleODM backed by the MongoDB driver selected by the `async_driver'
+    setting. Arguments are the same as for BundleODM.
+
+    """
+    if NetdbSettings.get_settings().async_driver:
+        return AsyncBundleODM(set_ids, column_types, show_hidden)
+
+    return BundleODM(set_ids, column_types, show_hidden)
+
+
+def raw_odm(table: str) -> Union[RawODM, AsyncRawODM]:
+    """
+    Return a RawODM backed by the MongoDB driver selected by the `async_driver'
+    setting. Arguments are the same as for RawODM.
+
+    """
+    if NetdbSettings.get_settings().async_driver:
+        return AsyncRawODM(table)
+
+    return RawODM(table)
+
+
+async def run_odm(method: Callable, *args, **kwargs) -> Any:
+    """
+    Call an ODM method from an async endpoint. Coroutine (async driver) methods are
+    awaited directly while blocking (pymongo driver) methods are run in the threadpool.
+
+    method:
+        Bound ColumnODM / OverrideHandler method to call
+
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+
+    return await run_in_threadpool(method, *args, **kwargs)
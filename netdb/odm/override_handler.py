@@ -1,28 +1,47 @@
-from typing import Optional, Self
+from typing import Any, Callable, Optional, Self
 from beartype.typing import List
 from beartype import beartype
 from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 
 from config.settings import NetdbSettings
-from util.mongo_api import MongoAPI
+from util.mongo_api import MongoAPI, AsyncMongoAPI
 from util.exception import NetDBException
-from models.types import OverrideDocument
+from util.initialize import OVERRIDE_INDEX
+from util.pagination import after_key, decode_cursor, encode_cursor, page_limit
+from models.types import OverrideDocument, COLUMN_TYPES
 
-from .column_odm import ColumnODM
+from .column_odm import BaseColumnODM, ColumnODM
+
+# Override index keys in index order. Override pages continue from these.
+PAGE_KEYS = [field for field, _ in OVERRIDE_INDEX]
 
 
 @beartype
-class OverrideHandler:
+class BaseOverrideHandler:
+    """
+    Driver independent part of the override handler. OverrideHandler and
+    AsyncOverrideHandler add the (blocking and asyncio respectively) MongoDB
+    operations.
+
+    """
 
     overrides: Optional[List[OverrideDocument]] = None
 
+    # Cursor of the page following the fetched page, if any. See fetch_page().
+    next_cursor: Optional[str] = None
+
+    # MongoDB driver and column ODM used by this handler. Set by subclasses.
+    __mongo_api__: Callable[[str, str], Any]
+    __column_odm__: Callable[..., Any]
+
     def __init__(self, override: Optional[OverrideDocument] = None):
         """
         Initialize a new OverrideHandler instance and its database connection.
 
         """
         settings = NetdbSettings.get_settings()
-        self.mongo = MongoAPI(settings.db_name, settings.override_table)
+        self.mongo = self.__mongo_api__(settings.db_name, settings.override_table)
 
     @property
     def pruned_overrides(self):
@@ -33,43 +52,69 @@ class OverrideHandler:
         """
         return jsonable_encoder(self.overrides, exclude_none=True)
 
-    def fetch(self, filt: Optional[dict] = None) -> Self:
+    @staticmethod
+    def _page_query(filt: dict, cursor: Optional[str]) -> dict:
         """
-        Pull override documents from datasource and place them into self.overrides.
+        Return the query for an override page continuing after cursor.
 
-        filt: ``None``
-            Filter the query using a MongoDB compatable dict based filter
+        """
+        if not cursor:
+            return filt
 
+        return {**filt, **after_key(PAGE_KEYS, decode_cursor(cursor, len(PAGE_KEYS)))}
+
+    def _set_page(self, overrides: List[OverrideDocument], size: int) -> None:
         """
+        Store the first size of overrides read for a page and the next page's cursor.
 
-        filt = filt or {}
+        """
+        self.overrides = overrides[:size]
+        self.next_cursor = None
 
-        self.overrides = self.mongo.read_overrides(filt)
+        if len(overrides) > size:
+            last = overrides[size - 1]
+            self.next_cursor = encode_cursor(
+                [getattr(last, field) for field in PAGE_KEYS]
+            )
 
-        return self
+    @staticmethod
+    def _affected_columns(filt: dict) -> List[str]:
+        """
+        Return the columns whose generated data may change when overrides matching
+        filt are written.
 
-    def upsert(self, override: OverrideDocument) -> dict:
         """
-        Upsert existing override (if exists) with new ones. If none already
-        exist then a new one is created. Before insertion, override is validated to
-        ensure that (1) underlying configuration exists and (2) that the overriden
-        configuration is valid.
+        if column_type := filt.get('column_type'):
+            return [column_type]
 
-        override:
-           An override document to be added.
+        return COLUMN_TYPES
+
+    @staticmethod
+    def _override_filter(override: OverrideDocument) -> dict:
+        """
+        Return the column filter matching the element targeted by an override.
 
         """
-        filt = {
+        return {
             'set_id': override.set_id,
             'category': override.category,
             'family': override.family,
             'element_id': override.element_id,
         }
 
-        column = ColumnODM(column_type=override.column_type).fetch(
-            filt, enable_overrides=False
-        )
+    @staticmethod
+    def _check_override(column: BaseColumnODM, override: OverrideDocument) -> None:
+        """
+        Apply an override to fetched column data and make sure that the result is
+        valid. Raises a NetDBException if not.
+
+        column:
+            ColumnODM holding the column documents targeted by the override
 
+        override:
+           The override document to be checked
+
+        """
         if not column.documents:
             raise NetDBException(
                 code=404, message="No matching column data found. Nothing to override."
@@ -93,8 +138,88 @@ class OverrideHandler:
                 out=override,
             )
 
+
+@beartype
+class OverrideHandler(BaseOverrideHandler):
+    """
+    Override handler backed by the blocking pymongo MongoDB driver.
+
+    """
+
+    __mongo_api__ = MongoAPI
+    __column_odm__ = ColumnODM
+
+    def fetch(self, filt: Optional[dict] = None) -> Self:
+        """
+        Pull override documents from datasource and place them into self.overrides.
+
+        filt: ``None``
+            Filter the query using a MongoDB compatable dict based filter
+
+        """
+
+        filt = filt or {}
+
+        self.overrides = self.mongo.read_overrides(filt)
+
+        return self
+
+    def fetch_page(
+        self,
+        filt: Optional[dict] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Self:
+        """
+        Pull a page of up to limit override documents in override index order into
+        self.overrides and the cursor of the next page (None for the last page) into
+        self.next_cursor. Each page is an index range scan continuing after cursor.
+
+        filt: ``None``
+            Filter the query using a MongoDB compatable dict based filter
+
+        cursor: ``None``
+            Cursor returned with the previous page. First page if not given.
+
+        limit: ``None``
+            Maximum number of overrides on the page. Capped at the `page_max_limit'
+            setting.
+
+        """
+        size = page_limit(limit)
+
+        self._set_page(
+            self.mongo.read_overrides(
+                self._page_query(filt or {}, cursor), sort=PAGE_KEYS, limit=size + 1
+            ),
+            size,
+        )
+
+        return self
+
+    def upsert(self, override: OverrideDocument) -> dict:
+        """
+        Upsert existing override (if exists) with new ones. If none already
+        exist then a new one is created. Before insertion, override is validated to
+        ensure that (1) underlying configuration exists and (2) that the overriden
+        configuration is valid. Fails while the column is being swap reloaded, as the
+        override would be validated against the column being replaced.
+
+        override:
+           An override document to be added.
+
+        """
+        column = self.__column_odm__(column_type=override.column_type)
+        column.mongo.check_reload()
+        column.fetch(self._override_filter(override), enable_overrides=False)
+
+        self._check_override(column, override)
+
         # Validation passed. Store the override.
-        self.mongo.replace_one(override)
+        try:
+            self.mongo.replace_one(override)
+        finally:
+            column.bump_revision()
 
         # Return the overridden column data to caller.
         return column.pruned_column
@@ -102,7 +227,82 @@ class OverrideHandler:
     def delete(self, filt: dict) -> int:
         """
         Delete documents from MongoDB filtered by filter. Documents should already be
-        loaded into self.documents by self._generate_mongo_documents().
+        loaded into self.documents by self._generate_mongo_documents(). Fails while an
+        affected column is being swap reloaded.
+
+        """
+        for column_type in self._affected_columns(filt):
+            self.__column_odm__(column_type=column_type).mongo.check_reload()
+
+        try:
+            return self.mongo.delete_many(filt)
+        finally:
+            for column_type in self._affected_columns(filt):
+                self.__column_odm__(column_type=column_type).bump_revision()
+
+
+@beartype
+class AsyncOverrideHandler(BaseOverrideHandler):
+    """
+    Override handler backed by the asyncio (motor) MongoDB driver. Overrides are
+    read with the async driver. Writes are made by the blocking OverrideHandler run
+    in the threadpool (see _blocking()).
+
+    """
+
+    __mongo_api__ = AsyncMongoAPI
+
+    def _blocking(self) -> OverrideHandler:
+        """
+        Return an OverrideHandler backed by the blocking driver of self.mongo, to be
+        run in the threadpool.
+
+        """
+        handler = OverrideHandler()
+        handler.mongo = self.mongo.blocking
+
+        return handler
+
+    async def fetch(self, filt: Optional[dict] = None) -> Self:
+        """
+        Async version of OverrideHandler.fetch()
+
+        """
+        self.overrides = await self.mongo.read_overrides(filt or {})
+
+        return self
+
+    async def fetch_page(
+        self,
+        filt: Optional[dict] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Self:
+        """
+        Async version of OverrideHandler.fetch_page()
+
+        """
+        size = page_limit(limit)
+
+        self._set_page(
+            await self.mongo.read_overrides(
+                self._page_query(filt or {}, cursor), sort=PAGE_KEYS, limit=size + 1
+            ),
+            size,
+        )
+
+        return self
+
+    async def upsert(self, override: OverrideDocument) -> dict:
+        """
+        Async version of OverrideHandler.upsert()
+
+        """
+        return await run_in_threadpool(self._blocking().upsert, override)
+
+    async def delete(self, filt: dict) -> int:
+        """
+        Async version of OverrideHandler.delete()
 
         """
-        return self.mongo.delete_many(filt)
+        return await run_in_threadpool(self._blocking().delete, filt)
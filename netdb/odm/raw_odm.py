@@ -0,0 +1,299 @@
+from typing import Any, Callable, Union
+from beartype.typing import AsyncIterator, Iterator, List
+from beartype import beartype
+from pydantic import ValidationError
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import NetdbSettings
+from util.mongo_api import MongoAPI, AsyncMongoAPI
+from util.exception import NetDBException
+from models.types import (
+    NetdbDocument,
+    OverrideDocument,
+    COLUMN_TYPES,
+    COLUMN_FACTORY,
+    schema_version,
+)
+
+from .column_odm import ColumnODM
+
+
+@beartype
+class BaseRawODM:
+    """
+    Driver independent part of the raw document ODM, which exports and imports the
+    stored documents of a column (NetdbDocument) or of the override table
+    (OverrideDocument) as NDJSON. Documents are exported as is, i.e. without column
+    generation or weight resolution. Imported column documents are validated against
+    the column model and must belong to registered devices, and their content hash
+    and schema version are recomputed. RawODM and AsyncRawODM add the (blocking and
+    asyncio respectively) MongoDB operations.
+
+    """
+
+    # MongoDB driver and column ODM used by this ODM. Set by subclasses.
+    __mongo_api__: Callable[[str, str], Any]
+    __column_odm__: Callable[..., Any]
+
+    # Number of exported documents per NDJSON chunk
+    __export_chunk__ = 1000
+
+    def __init__(self, table: str):
+        """
+        Initialize a new raw document ODM.
+
+        table:
+            A column type (e.g. `bgp') or the override table
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        self.model: Union[type[NetdbDocument], type[OverrideDocument]]
+
+        if table == settings.override_table:
+            self.model = OverrideDocument
+        elif table in COLUMN_TYPES:
+            self.model = NetdbDocument
+        else:
+            raise NetDBException(code=404, message=f'Table {table} not available')
+
+        self.table = table
+        self.mongo = self.__mongo_api__(settings.db_name, table)
+
+        # Columns written by imports, whose revisions are to be bumped.
+        self.affected_columns: set = set()
+
+    def _chunks(self, documents: Iterator[dict]) -> Iterator[bytes]:
+        """
+        Encode raw documents as NDJSON chunks of up to __export_chunk__ lines.
+
+        """
+        lines = []
+
+        for document in documents:
+            lines.append(to_json(document))
+
+            if len(lines) >= self.__export_chunk__:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+    def _validated(
+        self, document: Union[NetdbDocument, OverrideDocument], column: Any
+    ) -> Union[NetdbDocument, OverrideDocument]:
+        """
+        Return an imported document ready to be stored. Raises a NetDBException if it
+        is not valid.
+
+        Override documents must target an existing column. The data of column
+        documents is validated against the column model as by
+        ColumnODM.generate_column(). Client supplied content hashes and schema
+        versions are discarded: the document is stamped with the current schema
+        version and its content hash is computed when it is stored.
+
+        document:
+            The parsed document
+
+        column:
+            Column ODM (showing hidden elements) validating column documents. None
+            for override documents.
+
+        """
+        if isinstance(document, OverrideDocument):
+            if document.column_type not in COLUMN_TYPES:
+                raise NetDBException(
+                    code=422, message=f'Column {document.column_type} not available'
+                )
+
+            return document
+
+        document = document.model_copy(
+            update={'schema_version': None, 'content_hash': None}
+        )
+
+        if bool(document.flat) != COLUMN_FACTORY[self.table].__flat__:
+            raise NetDBException(code=422, message='Invalid flat document flag.')
+
+        column.generate_column([document])
+
+        document.schema_version = schema_version(self.table)
+
+        return document
+
+    def _parse(self, lines: List[bytes]) -> tuple[list, int]:
+        """
+        Parse NDJSON lines into documents (see _validated()). Returns the documents
+        and the number of (non empty) lines which are not valid documents.
+
+        """
+        documents = []
+        invalid = 0
+
+        # Column ODM validating column documents, hidden ones included
+        column = None
+        if self.model is NetdbDocument:
+            column = self.__column_odm__(column_type=self.table)
+            column.__provide_all__ = True
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            try:
+                document = self._validated(self.model.model_validate_json(line), column)
+            except (ValidationError, NetDBException):
+                invalid += 1
+                continue
+
+            documents.append(document)
+
+        return documents, invalid
+
+    def _registered(self, documents: list, registered: frozenset) -> list:
+        """
+        Return the documents which belong to registered devices and record the
+        columns they are imported into. Only documents of the device column itself
+        and override documents need no registered device.
+
+        documents:
+            Documents returned by _parse()
+
+        registered:
+            Registered device names (see ColumnODM.registered_devices())
+
+        """
+        out = []
+
+        for document in documents:
+            if isinstance(document, OverrideDocument):
+                self.affected_columns.add(document.column_type)
+            elif self.table == 'device' or document.set_id in registered:
+                self.affected_columns.add(self.table)
+            else:
+                continue
+
+            out.append(document)
+
+        return out
+
+    def _needs_registry(self, documents: list) -> bool:
+        """
+        Return true if documents are to be checked against the registered devices.
+
+        """
+        return (
+            bool(documents) and self.model is NetdbDocument and self.table != 'device'
+        )
+
+
+@beartype
+class RawODM(BaseRawODM):
+    """
+    Raw document ODM backed by the blocking pymongo MongoDB driver.
+
+    """
+
+    __mongo_api__ = MongoAPI
+    __column_odm__ = ColumnODM
+
+    def export(self, filt: Union[dict, None] = None) -> Iterator[bytes]:
+        """
+        Iterate over NDJSON chunks of the stored documents matching filt. Documents
+        are encoded as they are read from the MongoDB cursor.
+
+        filt: ``None``
+            Filter the query using a MongoDB compatable dict based filter
+
+        """
+        yield from self._chunks(self.mongo.iter_raw(filt or {}))
+
+    def import_documents(self, lines: List[bytes]) -> dict:
+        """
+        Insert the documents in a chunk of NDJSON lines with a single unordered
+        insert. Returns the inserted, failed (e.g. already stored) and invalid
+        document counts. Documents failing validation or not belonging to a
+        registered device count as invalid. Call bump_revisions() once all chunks are
+        imported.
+
+        lines:
+            NDJSON lines, each holding one document
+
+        """
+        parsed, invalid = self._parse(lines)
+
+        registered: frozenset = frozenset()
+        if self._needs_registry(parsed):
+            registered = self.__column_odm__(column_type=self.table).registered_devices(
+                {document.set_id for document in parsed}
+            )
+
+        documents = self._registered(parsed, registered)
+        invalid += len(parsed) - len(documents)
+
+        return {**self.mongo.insert_unordered(documents), 'invalid': invalid}
+
+    def bump_revisions(self) -> None:
+        """
+        Bump the revisions of all columns written by imports.
+
+        """
+        for column_type in sorted(self.affected_columns):
+            self.__column_odm__(column_type=column_type).bump_revision()
+
+
+@beartype
+class AsyncRawODM(BaseRawODM):
+    """
+    Raw document ODM backed by the asyncio (motor) MongoDB driver. Documents are
+    exported with the async driver. Imports are made by the blocking RawODM run in
+    the threadpool (see _blocking()).
+
+    """
+
+    __mongo_api__ = AsyncMongoAPI
+
+    def _blocking(self) -> RawODM:
+        """
+        Return a RawODM backed by the blocking driver of self.mongo, to be run in the
+        threadpool. The columns written by its imports are recorded here.
+
+        """
+        odm = RawODM(self.table)
+        odm.mongo = self.mongo.blocking
+        odm.affected_columns = self.affected_columns
+
+        return odm
+
+    async def export(self, filt: Union[dict, None] = None) -> AsyncIterator[bytes]:
+        """
+        Async version of RawODM.export()
+
+        """
+        lines = []
+
+        async for document in self.mongo.iter_raw(filt or {}):
+            lines.append(to_json(document))
+
+            if len(lines) >= self.__export_chunk__:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+    async def import_documents(self, lines: List[bytes]) -> dict:
+        """
+        Async version of RawODM.import_documents()
+
+        """
+        return await run_in_threadpool(self._blocking().import_documents, lines)
+
+    async def bump_revisions(self) -> None:
+        """
+        Async version of RawODM.bump_revisions()
+
+        """
+        await run_in_threadpool(self._blocking().bump_revisions)
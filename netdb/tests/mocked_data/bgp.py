@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_bgp_data(source):
@@ -164,6 +164,7 @@ def mock_standard_bgp_documents(source=None):
                 'log_neighbor_changes': True,
                 'router_id': '192.0.2.12',
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -177,6 +178,7 @@ def mock_standard_bgp_documents(source=None):
                 'ipv4': {'redistribute': ['static']},
                 'ipv6': {'redistribute': ['static']},
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -196,6 +198,7 @@ def mock_standard_bgp_documents(source=None):
                 },
                 'remote_asn': 65001,
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -215,6 +218,7 @@ def mock_standard_bgp_documents(source=None):
                 },
                 'remote_asn': 65001,
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -232,6 +236,7 @@ def mock_standard_bgp_documents(source=None):
                     'ipv6': {'route_map': {'import': '6-RR-IN', 'export': '6-RR-OUT'}},
                 },
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -242,6 +247,7 @@ def mock_standard_bgp_documents(source=None):
             family=None,
             element_id='fd00:88::10',
             data={'type': 'ebgp', 'peer_group': '6_RR'},
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -252,6 +258,7 @@ def mock_standard_bgp_documents(source=None):
             family=None,
             element_id='fd00:88::11',
             data={'type': 'ebgp', 'peer_group': '6_RR'},
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -262,6 +269,7 @@ def mock_standard_bgp_documents(source=None):
             family=None,
             element_id='10.0.66.88',
             data={'type': 'ebgp', 'peer_group': '4_AS65000'},
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -272,6 +280,7 @@ def mock_standard_bgp_documents(source=None):
             family=None,
             element_id='fd00::66:88',
             data={'type': 'ebgp', 'peer_group': '6_AS65000'},
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -304,6 +313,7 @@ def mock_standard_bgp_documents(source=None):
                     }
                 },
             },
+            schema_version=schema_version('bgp'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -336,9 +346,13 @@ def mock_standard_bgp_documents(source=None):
                     }
                 },
             },
+            schema_version=schema_version('bgp'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
     if source:
         return [document for document in documents if document.datasource == source]
 
@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_device_data():
@@ -42,7 +42,7 @@ def mock_standard_device_documents():
     """
     Standard device data in MongoDB document list format
     """
-    return [
+    documents = [
         NetdbDocument(
             set_id='ROUTER1',
             datasource='netbox',
@@ -77,9 +77,15 @@ def mock_standard_device_documents():
                     'primary_contact': 'contact@help.us',
                 },
             },
+            schema_version=schema_version('device'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
+    return documents
+
 
 def mock_standard_device_column():
     """
@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_firewall_data():
@@ -188,7 +188,7 @@ def mock_standard_firewall_documents():
     """
     Standard firewall data in MongoDB document format
     """
-    return [
+    documents = [
         NetdbDocument(
             set_id='ROUTER1',
             datasource='repo',
@@ -198,6 +198,7 @@ def mock_standard_firewall_documents():
             family='ipv4',
             element_id='CORE-OUT',
             data={'default_action': 'accept'},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -226,6 +227,7 @@ def mock_standard_firewall_documents():
                     {'action': 'accept', 'protocol': 'icmp'},
                 ],
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -246,6 +248,7 @@ def mock_standard_firewall_documents():
                     },
                 ],
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -256,6 +259,7 @@ def mock_standard_firewall_documents():
             family='ipv6',
             element_id='CORE-OUT6',
             data={'default_action': 'accept'},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -284,6 +288,7 @@ def mock_standard_firewall_documents():
                     {'action': 'accept', 'protocol': 'icmpv6'},
                 ],
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -304,6 +309,7 @@ def mock_standard_firewall_documents():
                     },
                 ],
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -314,6 +320,7 @@ def mock_standard_firewall_documents():
             family='ipv4',
             element_id='dmz',
             data={'type': 'network', 'networks': ['192.0.2.10/32', '192.0.2.11/32']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -324,6 +331,7 @@ def mock_standard_firewall_documents():
             family='ipv4',
             element_id='netops',
             data={'type': 'network', 'networks': ['192.0.2.12/32']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -337,6 +345,7 @@ def mock_standard_firewall_documents():
                 'type': 'network',
                 'networks': ['192.0.2.13/32', '192.0.2.14/32', '192.0.2.15/32'],
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -347,6 +356,7 @@ def mock_standard_firewall_documents():
             family='ipv4',
             element_id='trusted',
             data={'type': 'network', 'networks': ['192.0.2.16/28']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -357,6 +367,7 @@ def mock_standard_firewall_documents():
             family='ipv6',
             element_id='netops6',
             data={'type': 'network', 'networks': ['fd00:88::/64']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -367,6 +378,7 @@ def mock_standard_firewall_documents():
             family='ipv6',
             element_id='trusted6',
             data={'type': 'network', 'networks': ['fd00:cb00::/32', 'fd00:4700::/32']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -377,6 +389,7 @@ def mock_standard_firewall_documents():
             family=None,
             element_id='state_policy',
             data={'established': 'accept', 'related': 'accept'},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -387,6 +400,7 @@ def mock_standard_firewall_documents():
             family=None,
             element_id='mss_clamp',
             data={'ipv4': 1280, 'ipv6': 1280, 'interfaces': ['tun0', 'bond0.950']},
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -407,6 +421,7 @@ def mock_standard_firewall_documents():
                 'interfaces': ['bond0.900', 'bond0.150'],
                 'default_action': 'drop',
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -427,6 +442,7 @@ def mock_standard_firewall_documents():
                 'interfaces': ['bond0.100', 'tun0'],
                 'default_action': 'drop',
             },
+            schema_version=schema_version('firewall'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -450,9 +466,15 @@ def mock_standard_firewall_documents():
                 'ip-src-route': 'enable',
                 'receive-redirects': 'enable',
             },
+            schema_version=schema_version('firewall'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
+    return documents
+
 
 def mock_standard_firewall_column(check_override=False):
     """
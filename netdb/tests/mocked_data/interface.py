@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_interface_data():
@@ -198,7 +198,7 @@ def mock_standard_interface_documents():
     """
     Standard interface data in MongoDB document list format
     """
-    return [
+    documents = [
         NetdbDocument(
             set_id='ROUTER1',
             datasource='netbox',
@@ -228,6 +228,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -267,6 +268,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -316,6 +318,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -367,6 +370,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -392,6 +396,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -417,6 +422,7 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -470,9 +476,15 @@ def mock_standard_interface_documents():
                     }
                 },
             },
+            schema_version=schema_version('interface'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
+    return documents
+
 
 def mock_standard_interface_column(check_override=False):
     """
@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_policy_data():
@@ -137,7 +137,7 @@ def mock_standard_policy_documents():
     """
     Standard policy data in MongoDB document format
     """
-    return [
+    documents = [
         NetdbDocument(
             set_id='ROUTER1',
             datasource='repo',
@@ -147,6 +147,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='4-BIG-PREFIXES',
             data={'rules': [{'le': 7, 'ge': 1, 'prefix': '0.0.0.0/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -157,6 +158,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='4-DEFAULT-ROUTE',
             data={'rules': [{'prefix': '0.0.0.0/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -183,6 +185,7 @@ def mock_standard_policy_documents():
                     {'le': 32, 'prefix': '224.0.0.0/3'},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -193,6 +196,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='4-SMALL-PREFIXES',
             data={'rules': [{'le': 32, 'ge': 25, 'prefix': '0.0.0.0/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -203,6 +207,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='4-65000-PREFIXES',
             data={'rules': [{'le': 24, 'prefix': '10.0.0.0/8'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -213,6 +218,7 @@ def mock_standard_policy_documents():
             family='ipv6',
             element_id='6-BIG-PREFIXES',
             data={'rules': [{'le': 15, 'ge': 1, 'prefix': '::/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -223,6 +229,7 @@ def mock_standard_policy_documents():
             family='ipv6',
             element_id='6-DEFAULT-ROUTE',
             data={'rules': [{'prefix': '::/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -247,6 +254,7 @@ def mock_standard_policy_documents():
                     {'le': 128, 'prefix': 'ff00::/8'},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -257,6 +265,7 @@ def mock_standard_policy_documents():
             family='ipv6',
             element_id='6-SMALL-PREFIXES',
             data={'rules': [{'le': 128, 'ge': 49, 'prefix': '::/0'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -267,6 +276,7 @@ def mock_standard_policy_documents():
             family='ipv6',
             element_id='6-65000-PREFIXES',
             data={'rules': [{'le': 64, 'prefix': 'fd00:abcd::/48'}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -277,6 +287,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='ALLOW-ALL',
             data={'rules': [{'action': 'permit', 'number': 99}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -287,6 +298,7 @@ def mock_standard_policy_documents():
             family='ipv4',
             element_id='REJECT-ALL',
             data={'rules': [{'action': 'deny', 'number': 99}]},
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -313,6 +325,7 @@ def mock_standard_policy_documents():
                     {'action': 'deny', 'number': 99},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -332,6 +345,7 @@ def mock_standard_policy_documents():
                     {'action': 'deny', 'number': 99},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -358,6 +372,7 @@ def mock_standard_policy_documents():
                     {'action': 'deny', 'number': 99},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -377,9 +392,15 @@ def mock_standard_policy_documents():
                     {'action': 'deny', 'number': 99},
                 ]
             },
+            schema_version=schema_version('policy'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
+    return documents
+
 
 def mock_standard_policy_column(check_override=False):
     """
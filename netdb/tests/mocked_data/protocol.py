@@ -1,4 +1,4 @@
-from models.types import NetdbDocument
+from models.types import NetdbDocument, schema_version, content_hash
 
 
 def mock_standard_protocol_data():
@@ -65,7 +65,7 @@ def mock_standard_protocol_documents():
     """
     Standard IGP data in MongoDB document list format
     """
-    return [
+    documents = [
         NetdbDocument(
             set_id='ROUTER1',
             datasource='netbox',
@@ -89,6 +89,7 @@ def mock_standard_protocol_documents():
                     {'name': 'lo', 'passive': True},
                 ],
             },
+            schema_version=schema_version('protocol'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -102,6 +103,7 @@ def mock_standard_protocol_documents():
                 'meta': {'netdb': {'datasource': 'netbox', 'weight': 150}},
                 'interfaces': ['bond0', 'eth6', 'eth7'],
             },
+            schema_version=schema_version('protocol'),
         ),
         NetdbDocument(
             set_id='ROUTER1',
@@ -143,9 +145,15 @@ def mock_standard_protocol_documents():
                     },
                 ],
             },
+            schema_version=schema_version('protocol'),
         ),
     ]
 
+    for document in documents:
+        document.content_hash = content_hash(document)
+
+    return documents
+
 
 def mock_standard_protocol_column(check_override=False):
     """
@@ -1,7 +1,9 @@
-from typing import Union
+from typing import AsyncIterator, Iterable, Iterator, Union
+from datetime import datetime
 from mocked_data import device, interface, bgp, protocol, firewall, policy, override  # type: ignore
 
 from config.settings import NetdbSettings
+from models.types import NetdbDocument, RevisionDocument, project_data
 
 NetdbSettings.initialize()
 
@@ -15,15 +17,158 @@ COLLECTION_FACTORY = {
     NetdbSettings.get_settings().override_table: override.mock_override_documents,
 }
 
+# Mocked column revision counters
+REVISIONS: dict = {}
 
-class MongoAPI:
+
+# Simulated MongoDB query operators. None (missing) values sort before all others.
+OPERATORS = {
+    '$in': lambda value, operand: value in operand,
+    '$eq': lambda value, operand: value == operand,
+    '$ne': lambda value, operand: value != operand,
+    '$gt': lambda value, operand: value is not None and value > operand,
+    '$gte': lambda value, operand: value is not None and value >= operand,
+    '$lte': lambda value, operand: value is None or value <= operand,
+}
+
+
+def _condition(value, condition) -> bool:
+    """
+    Simulate a MongoDB query operator expression on a document value. Supports the
+    operators in OPERATORS.
+    """
+    for operator, operand in condition.items():
+        if operator not in OPERATORS:
+            raise NotImplementedError(operator)
+
+        if not OPERATORS[operator](value, operand):
+            return False
+
+    return True
+
+
+def _matches(document, query: dict) -> bool:
+    """
+    Simulate a MongoDB filter on a mocked document. Supports equality, `$or' and the
+    operators supported by _condition().
+    """
+    for key, value in query.items():
+        if key == '$or':
+            if not any(_matches(document, branch) for branch in value):
+                return False
+        elif isinstance(value, dict):
+            if not _condition(getattr(document, key), value):
+                return False
+        elif getattr(document, key) != value:
+            return False
+
+    return True
+
+
+def _sorted(documents: list, sort: Union[list, None]) -> list:
+    """
+    Simulate a sorted MongoDB read. None (missing) values sort first.
+    """
+    if not sort:
+        return documents
+
+    return sorted(
+        documents,
+        key=lambda document: [getattr(document, key) or '' for key in sort],
+    )
+
+
+def _project(document, fields: list):
+    """
+    Simulate a projected MongoDB read of a mocked document. Supports `data.<path>'
+    fields. As with MongoDB, data is omitted if none of its projected paths exist.
+    """
+    out = document.model_dump(
+        include={field for field in fields if not field.startswith('data.')}
+    )
+
+    data_fields = [field[5:] for field in fields if field.startswith('data.')]
+    if data_fields and (data := project_data(document.data, data_fields)):
+        out['data'] = data
+
+    return NetdbDocument.model_construct(**out)
+
+
+class MongoAdminAPI:
+    """
+    Mock MongoAdminAPI
+    """
 
     def __init__(self, database: str, collection: str):
         self.collection = collection
         self.filter: dict = {}
         self.documents: list = []
+        self.removed: list = []
+
+    def read_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Mock MongoAPI read_revision
+        """
+        return REVISIONS.get(column_type, RevisionDocument(column_type=column_type))
+
+    def bump_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Mock MongoAPI bump_revision
+        """
+        REVISIONS[column_type] = RevisionDocument(
+            column_type=column_type,
+            revision=self.read_revision(column_type).revision + 1,
+            updated=datetime.utcnow().replace(microsecond=0),
+        )
+
+        return REVISIONS[column_type]
+
+    def create_index(
+        self,
+        index: list,
+        unique: bool = True,
+        partial: Union[dict, None] = None,
+        name: Union[str, None] = None,
+    ) -> bool:
+        """
+        Mock the creation of indexes.
+        """
+        return True
 
-    def read_column(self, query: Union[dict, None] = None) -> list:
+    def index_information(self) -> dict:
+        """
+        Mock MongoAPI index_information for a collection without indexes.
+        """
+        return {}
+
+    def drop_index(self, name: str) -> bool:
+        """
+        Mock the dropping of indexes.
+        """
+        return True
+
+    def explain(
+        self, query: Union[dict, None] = None, sort: Union[list, None] = None
+    ) -> dict:
+        """
+        Mock MongoAPI explain. Queries filtering by set_id scan the default index,
+        all others the collection.
+        """
+        if 'set_id' in (query or {}):
+            stage = {'stage': 'IXSCAN', 'indexName': 'set_id_1'}
+        else:
+            stage = {'stage': 'COLLSCAN'}
+
+        return {
+            'queryPlanner': {'winningPlan': {'stage': 'FETCH', 'inputStage': stage}}
+        }
+
+
+class MongoAPI(MongoAdminAPI):
+
+    def read_column(
+        self, query: Union[dict, None] = None, fields: Union[list, None] = None
+    ) -> list:
         """
         Mock MongoAPI read_column (NetdbDocument) returns for valid column types.
         """
@@ -31,31 +176,145 @@ class MongoAPI:
 
         if query:
             # Simulate a mongo filtered return by, well, filtering the return.
-            return [
-                document
-                for document in documents
-                if all(getattr(document, k) == v for k, v in query.items())
+            documents = [
+                document for document in documents if _matches(document, query)
             ]
 
+        if fields:
+            # Simulate a projected read
+            return [_project(document, fields) for document in documents]
+
+        return documents
+
+    def iter_column(
+        self,
+        query: Union[dict, None] = None,
+        fields: Union[list, None] = None,
+        sort: Union[list, None] = None,
+    ) -> Iterator:
+        """
+        Mock MongoAPI iter_column
+        """
+        yield from _sorted(self.read_column(query, fields), sort)
+
+    def read_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Union[list, None] = None,
+    ) -> list:
+        """
+        Mock MongoAPI read_column_resolved. Simulates the weight resolution aggregation
+        by keeping the highest weight document for each element, and of equal weights
+        the one with the last datasource.
+        """
+        resolved: dict = {}
+
+        for document in self.read_column(query):
+            if document.weight < 1 and not show_hidden:
+                continue
+
+            key = (
+                document.set_id,
+                document.category,
+                document.family,
+                document.element_id,
+            )
+            if key not in resolved or (
+                resolved[key].weight,
+                resolved[key].datasource,
+            ) < (document.weight, document.datasource):
+                resolved[key] = document
+
+        # The aggregation returns documents sorted by element key
+        documents = sorted(resolved.values(), key=lambda document: document.set_id)
+
+        if fields:
+            return [_project(document, fields) for document in documents]
+
         return documents
 
-    def read_overrides(self, query: Union[dict, None] = None) -> list:
+    def iter_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Union[list, None] = None,
+    ) -> Iterator:
+        """
+        Mock MongoAPI iter_column_resolved
+        """
+        yield from self.read_column_resolved(query, show_hidden, fields)
+
+    def iter_raw(self, query: Union[dict, None] = None) -> Iterator:
+        """
+        Mock MongoAPI iter_raw
+        """
+        for document in self.read_column(query):
+            yield document.model_dump()
+
+    def read_set_ids(self, query: Union[dict, None] = None) -> list:
+        """
+        Mock MongoAPI read_set_ids
+        """
+        return sorted({document.set_id for document in self.read_column(query)})
+
+    def read_set_ids_sorted(self, query: dict, limit: int) -> list:
+        """
+        Mock MongoAPI read_set_ids_sorted
+        """
+        return self.read_set_ids(query)[:limit]
+
+    def read_snapshot(
+        self,
+        query: dict,
+        column_types: list,
+        resolved: bool = False,
+        show_hidden: bool = False,
+    ) -> tuple:
+        """
+        Mock MongoAPI read_snapshot
+        """
+        return (
+            {
+                column_type: (
+                    MongoAPI('', column_type).read_column_resolved(query, show_hidden)
+                    if resolved
+                    else MongoAPI('', column_type).read_column(query)
+                )
+                for column_type in column_types
+            },
+            self.read_overrides({**query, 'column_type': {'$in': column_types}}),
+        )
+
+    def read_overrides(
+        self,
+        query: Union[dict, None] = None,
+        sort: Union[list, None] = None,
+        limit: int = 0,
+    ) -> list:
         """
         Mock MongoAPI read_overrides (OverrideDocument) return. Currently just
         a wrapper around read_column as mocked data already in the correct
         document format.
         """
-        return self.read_column(query)
+        documents = _sorted(self.read_column(query), sort)
+
+        return documents[:limit] if limit else documents
 
-    def reload(self, documents: list, filt: dict) -> bool:
+    def reload(self, documents: Iterable, filt: dict) -> bool:
         """
         Mock MongoAPI reload
         """
         self.filter = filt
-        self.documents = documents
+        self.documents = list(documents)
 
         return True
 
+    def check_reload(self) -> None:
+        """
+        Mock MongoAPI check_reload
+        """
+
     def replace_one(self, document: dict) -> bool:
         """
         Mock MongoAPI replace
@@ -64,6 +323,31 @@ class MongoAPI:
 
         return True
 
+    def write_delta(self, added: list, changed: list, removed: list) -> bool:
+        """
+        Mock MongoAPI write_delta
+        """
+        self.documents = added + changed
+        self.removed = removed
+
+        return bool(added or changed or removed)
+
+    def replace_many(self, documents: list) -> dict:
+        """
+        Mock MongoAPI replace_many. Every document is treated as a modified match.
+        """
+        self.documents += documents
+
+        return {'matched': len(documents), 'modified': len(documents), 'upserted': 0}
+
+    def insert_unordered(self, documents: list) -> dict:
+        """
+        Mock MongoAPI insert_unordered. Every document is treated as inserted.
+        """
+        self.documents += documents
+
+        return {'inserted': len(documents), 'failed': 0}
+
     def delete_many(self, filt: dict) -> int:
         """
         Mock MongoAPI delete
@@ -82,8 +366,113 @@ class MongoAPI:
             ]
         )
 
-    def create_index(self, index: list) -> bool:
+    def backfill_content_hash(self, batch_size: int = 1000) -> int:
         """
-        Mock the creation of indexes.
+        Mock MongoAPI backfill_content_hash. Mocked documents already carry hashes.
         """
-        return True
+        return 0
+
+
+class AsyncMongoAPI:
+    """
+    Mock AsyncMongoAPI. Coroutine wrappers around the reads of the MongoAPI mock,
+    which is also the blocking driver.
+    """
+
+    def __init__(self, database: str, collection: str):
+        self.blocking = MongoAPI(database, collection)
+
+    def __getattr__(self, name):
+        # Expose the blocking mock's recorded filter / documents
+        return getattr(self.blocking, name)
+
+    async def read_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Mock AsyncMongoAPI read_revision.
+        """
+        return self.blocking.read_revision(column_type)
+
+    async def read_column(
+        self, query: Union[dict, None] = None, fields: Union[list, None] = None
+    ) -> list:
+        """
+        Mock AsyncMongoAPI read_column.
+        """
+        return self.blocking.read_column(query, fields)
+
+    async def iter_column(
+        self,
+        query: Union[dict, None] = None,
+        fields: Union[list, None] = None,
+        sort: Union[list, None] = None,
+    ) -> AsyncIterator:
+        """
+        Mock AsyncMongoAPI iter_column.
+        """
+        for document in self.blocking.iter_column(query, fields, sort):
+            yield document
+
+    async def iter_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Union[list, None] = None,
+    ) -> AsyncIterator:
+        """
+        Mock AsyncMongoAPI iter_column_resolved.
+        """
+        for document in self.blocking.iter_column_resolved(query, show_hidden, fields):
+            yield document
+
+    async def read_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Union[list, None] = None,
+    ) -> list:
+        """
+        Mock AsyncMongoAPI read_column_resolved.
+        """
+        return self.blocking.read_column_resolved(query, show_hidden, fields)
+
+    async def iter_raw(self, query: Union[dict, None] = None) -> AsyncIterator:
+        """
+        Mock AsyncMongoAPI iter_raw.
+        """
+        for document in self.blocking.iter_raw(query):
+            yield document
+
+    async def read_set_ids(self, query: Union[dict, None] = None) -> list:
+        """
+        Mock AsyncMongoAPI read_set_ids.
+        """
+        return self.blocking.read_set_ids(query)
+
+    async def read_snapshot(
+        self,
+        query: dict,
+        column_types: list,
+        resolved: bool = False,
+        show_hidden: bool = False,
+    ) -> tuple:
+        """
+        Mock AsyncMongoAPI read_snapshot.
+        """
+        return self.blocking.read_snapshot(query, column_types, resolved, show_hidden)
+
+    async def read_set_ids_sorted(self, query: dict, limit: int) -> list:
+        """
+        Mock AsyncMongoAPI read_set_ids_sorted.
+        """
+        return self.blocking.read_set_ids_sorted(query, limit)
+
+    async def read_overrides(
+        self,
+        query: Union[dict, None] = None,
+        sort: Union[list, None] = None,
+        limit: int = 0,
+    ) -> list:
+        """
+        Mock AsyncMongoAPI read_overrides.
+        """
+        return self.blocking.read_overrides(query, sort, limit)
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from util import api_resources
@@ -91,3 +93,58 @@ def test_generate_filter_kwargs_only(kwargs):
     Test generate_filter() helper function with only kwargs
     """
     assert api_resources.generate_filter(**kwargs) == kwargs
+
+
+@pytest.mark.parametrize(
+    'accept,media_type',
+    [
+        (None, 'application/json'),
+        ('*/*', 'application/json'),
+        ('application/json', 'application/json'),
+        ('text/html', 'application/json'),
+        ('application/msgpack', 'application/msgpack'),
+        ('application/x-msgpack', 'application/x-msgpack'),
+        ('application/cbor', 'application/cbor'),
+        ('application/json;q=0.5, application/msgpack', 'application/msgpack'),
+        ('application/json, application/msgpack;q=0.9', 'application/json'),
+        ('application/*', 'application/json'),
+        ('application/cbor;q=0.8, application/msgpack;q=0.9', 'application/msgpack'),
+        ('application/json;q=0, application/cbor', 'application/cbor'),
+        ('application/json;q=0', 'application/json'),
+    ],
+)
+def test_negotiate_media_type(accept, media_type):
+    """
+    Test Accept header negotiation.
+
+    Expected result:
+       The offered media type with the highest quality, JSON if none is acceptable.
+
+    """
+    assert api_resources.negotiate_media_type(accept) == media_type
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 10])
+@pytest.mark.parametrize('split', [1, 4, 7, 100])
+def test_aiter_line_chunks(size, split):
+    """
+    Test that a byte stream is split into chunks of size lines regardless of how the
+    stream is split up.
+    """
+    lines = [b'{"a": %d}' % i for i in range(7)]
+    body = b'\n'.join(lines) + b'\n'
+
+    async def stream():
+        for start in range(0, len(body), split):
+            yield body[start : start + split]
+
+    async def chunks():
+        return [
+            chunk async for chunk in api_resources.aiter_line_chunks(stream(), size)
+        ]
+
+    result = asyncio.run(chunks())
+
+    assert [line for chunk in result for line in chunk] == lines
+    assert all(len(chunk) == size for chunk in result[:-1])
+    assert 0 < len(result[-1]) <= size
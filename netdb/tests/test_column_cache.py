@@ -0,0 +1,124 @@
+import pytest
+
+from config.settings import NetdbSettings
+from odm.column_cache import ColumnCache
+
+NetdbSettings.initialize()
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    """
+    Start each test with an empty three entry cache.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'column_cache_size', 3)
+    ColumnCache.invalidate()
+
+    yield ColumnCache
+
+    ColumnCache.invalidate()
+
+
+def test_cache_key_normalization():
+    """
+    Test that filter key order and empty filter keys do not change the cache key.
+    """
+    assert ColumnCache.key(
+        'bgp', {'set_id': 'ROUTER1', 'category': 'neighbors'}, False, True
+    ) == ColumnCache.key(
+        'bgp',
+        {'category': 'neighbors', 'family': None, 'set_id': 'ROUTER1'},
+        False,
+        True,
+    )
+    assert ColumnCache.key('bgp', {}, False, True) != ColumnCache.key(
+        'bgp', {}, True, True
+    )
+    assert ColumnCache.key('bgp', {}, False, True) != ColumnCache.key(
+        'bgp', {}, False, False
+    )
+
+
+def test_cache_revision():
+    """
+    Test that entries are only served at the revision they were stored under.
+    """
+    key = ColumnCache.key('bgp', None, False, True)
+    ColumnCache.put(key, 1, {'ROUTER1': {}})
+
+    assert ColumnCache.get(key, 1) == {'ROUTER1': {}}
+    assert ColumnCache.get(key, 2) is None
+
+    # Stale entries are dropped on lookup.
+    assert ColumnCache.get(key, 1) is None
+
+
+def test_cache_lru_eviction():
+    """
+    Test that the least recently used entries are evicted beyond the cache size.
+    """
+    keys = [
+        ColumnCache.key('bgp', {'set_id': f'ROUTER{i}'}, False, True) for i in range(4)
+    ]
+
+    for key in keys[:3]:
+        ColumnCache.put(key, 1, {})
+
+    # Touch the oldest entry so that the second one becomes least recently used.
+    assert ColumnCache.get(keys[0], 1) == {}
+
+    ColumnCache.put(keys[3], 1, {})
+
+    assert ColumnCache.size() == 3
+    assert ColumnCache.get(keys[1], 1) is None
+    assert ColumnCache.get(keys[0], 1) == {}
+
+
+def test_cache_invalidate():
+    """
+    Test that invalidation drops only the given column.
+    """
+    ColumnCache.put(ColumnCache.key('bgp', None, False, True), 1, {})
+    ColumnCache.put(ColumnCache.key('device', None, False, True), 1, {})
+
+    ColumnCache.invalidate('bgp')
+
+    assert ColumnCache.get(ColumnCache.key('bgp', None, False, True), 1) is None
+    assert ColumnCache.get(ColumnCache.key('device', None, False, True), 1) == {}
+
+
+def test_cache_byte_eviction(monkeypatch):
+    """
+    Test that the least recently used entries are evicted once the cached columns
+    exceed the byte limit, and that columns above the limit are not cached.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'column_cache_size', 100)
+    monkeypatch.setattr(NetdbSettings.__settings__, 'column_cache_bytes', 250)
+
+    keys = [
+        ColumnCache.key('bgp', {'set_id': f'ROUTER{i}'}, False, True) for i in range(4)
+    ]
+
+    # 100 bytes as JSON
+    column = {'ROUTER1': {'description': 'x' * 70}}
+
+    for key in keys[:2]:
+        ColumnCache.put(key, 1, column)
+
+    assert ColumnCache.nbytes() == 200
+
+    ColumnCache.put(keys[2], 1, column)
+
+    assert ColumnCache.size() == 2
+    assert ColumnCache.nbytes() == 200
+    assert ColumnCache.get(keys[0], 1) is None
+    assert ColumnCache.get(keys[1], 1) == column
+
+    ColumnCache.put(keys[3], 1, {'ROUTER1': {'description': 'x' * 300}})
+
+    assert ColumnCache.get(keys[3], 1) is None
+    assert ColumnCache.nbytes() <= 250
+
+    ColumnCache.invalidate()
+
+    assert ColumnCache.nbytes() == 0
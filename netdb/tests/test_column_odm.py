@@ -1,8 +1,10 @@
+import asyncio
+import threading
 from unittest.mock import patch
 
 import pytest
 
-from mocked_data import device, interface, protocol, bgp, firewall, policy  # type: ignore
+from mocked_data import device, interface, protocol, bgp, firewall, policy, override  # type: ignore
 from fastapi.encoders import jsonable_encoder
 
 from models.columns.device import DeviceContainer
@@ -11,7 +13,9 @@ from models.columns.protocol import ProtocolContainer
 from models.columns.bgp import BGPContainer
 from models.columns.firewall import FirewallContainer
 from models.columns.policy import PolicyContainer
+from models.types import COLUMN_TYPES
 
+from config.settings import NetdbSettings
 from util.exception import NetDBException
 
 from mocked_utils import mock_mongo_api  # type: ignore
@@ -22,7 +26,9 @@ with patch.dict(
         'util.mongo_api': mock_mongo_api,
     },
 ):
-    from odm import column_odm
+    from odm import column_odm, override_handler, raw_odm
+    from odm.column_cache import ColumnCache
+    from odm.device_registry import DeviceRegistry
 
 
 @pytest.mark.parametrize(
@@ -243,6 +249,137 @@ def test_column_odm_fetch_generate_column(column_type, column):
     assert out == column
 
 
+@pytest.mark.parametrize(
+    'column_type,column',
+    [
+        ('device', device.mock_standard_device_column()),
+        ('interface', interface.mock_standard_interface_column(check_override=True)),
+        ('protocol', protocol.mock_standard_protocol_column(check_override=True)),
+        ('bgp', bgp.mock_standard_bgp_column(check_override=True)),
+        ('firewall', firewall.mock_standard_firewall_column(check_override=True)),
+        ('policy', policy.mock_standard_policy_column(check_override=True)),
+    ],
+)
+def test_column_odm_trusted_reads(monkeypatch, column_type, column):
+    """
+    Test that trusted read mode generates the same columns as full validation.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'trusted_reads', True)
+
+    out = (
+        column_odm.ColumnODM(column_type=column_type)
+        .fetch(enable_overrides=True)
+        .generate_column()
+        .pruned_column
+    )
+
+    assert out == column
+
+
+def test_schema_version_revision(monkeypatch):
+    """
+    Test that bumping the schema revision of a column model changes its schema
+    version, so that trusted reads revalidate documents under changed validation.
+    """
+    version = column_odm.schema_version('interface')
+
+    monkeypatch.setattr(InterfaceContainer, '__schema_revision__', 2)
+    column_odm.schema_version.cache_clear()
+
+    try:
+        assert column_odm.schema_version('interface') != version
+    finally:
+        monkeypatch.undo()
+        column_odm.schema_version.cache_clear()
+
+    assert column_odm.schema_version('interface') == version
+
+
+@pytest.mark.parametrize(
+    'version,valid',
+    [
+        (column_odm.schema_version('interface'), True),
+        ('0000000000000000', False),
+        (None, False),
+    ],
+)
+def test_column_odm_trusted_reads_revalidate(monkeypatch, version, valid):
+    """
+    Test that trusted read mode skips validation of documents stamped with the
+    current schema version but still validates stale / unversioned documents.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'trusted_reads', True)
+
+    document = interface.mock_standard_interface_documents()[0]
+    document.data['type'] = 'red_herring'
+    document.schema_version = version
+
+    odm = column_odm.ColumnODM(column_type='interface')
+    odm.documents = [document]
+
+    if valid:
+        out = odm.generate_column().pruned_column
+        assert out['ROUTER1']['bond0']['type'] == 'red_herring'
+    else:
+        with pytest.raises(NetDBException) as e:
+            odm.generate_column()
+
+        assert e.value.code == 422
+
+
+@pytest.mark.parametrize(
+    'column_type,column',
+    [
+        ('device', device.mock_standard_device_column()),
+        ('interface', interface.mock_standard_interface_column(check_override=True)),
+        ('bgp', bgp.mock_standard_bgp_column(check_override=True)),
+        ('firewall', firewall.mock_standard_firewall_column(check_override=True)),
+    ],
+)
+def test_async_column_odm_fetch_generate_column(column_type, column):
+    """
+    Test AsyncColumnODM fetch and generate with overrides enabled.
+    """
+    odm = column_odm.AsyncColumnODM(column_type=column_type)
+
+    assert isinstance(odm.mongo, mock_mongo_api.AsyncMongoAPI)
+
+    out = asyncio.run(odm.fetch()).generate_column().pruned_column
+
+    assert out == column
+
+
+@pytest.mark.parametrize('method', ['fetch_column', 'iter_sets'])
+def test_async_column_odm_generate_in_threadpool(monkeypatch, method):
+    """
+    Test that AsyncColumnODM generates (and validates) column data in the
+    threadpool rather than on the event loop.
+    """
+    threads = []
+    generate_column = column_odm.BaseColumnODM.generate_column
+
+    def recording_generate_column(self, documents=None):
+        threads.append(threading.get_ident())
+        return generate_column(self, documents)
+
+    monkeypatch.setattr(
+        column_odm.BaseColumnODM, 'generate_column', recording_generate_column
+    )
+
+    async def run():
+        odm = column_odm.AsyncColumnODM(column_type='interface')
+
+        if method == 'fetch_column':
+            return await odm.fetch_column()
+
+        return {set_id: data async for set_id, data in odm.iter_sets()}
+
+    out = asyncio.run(run())
+
+    assert out == interface.mock_standard_interface_column(check_override=True)
+    assert threads and threading.get_ident() not in threads
+
+
 @pytest.mark.parametrize(
     'column_type,column',
     [
@@ -359,6 +496,335 @@ def test_column_odm_reload(container, datasource, documents):
     assert odm.mongo.documents == documents  # pylint: disable=E1101
 
 
+def test_column_odm_reload_lazy(monkeypatch):
+    """
+    Test that atomic (e.g. swap) reloads generate container documents as they are
+    written rather than placing them into ColumnODM.documents.
+    """
+    # pylint: disable=W0212
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_reloads', True)
+
+    odm = column_odm.ColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    documents = odm._pending_documents()
+
+    assert not isinstance(documents, list)
+
+    odm.reload()
+
+    assert odm._documents is None
+    assert odm.documents == interface.mock_standard_interface_documents()
+    assert odm._pending_documents() is odm.documents
+
+
+def test_column_odm_reload_materialized():
+    """
+    Test that non atomic reloads generate all container documents before writing.
+    """
+    # pylint: disable=W0212
+    odm = column_odm.ColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    odm.reload()
+
+    assert odm._documents == interface.mock_standard_interface_documents()
+    assert odm.mongo.documents == odm._documents  # pylint: disable=E1101
+
+
+def test_column_odm_show_content_hash(monkeypatch):
+    """
+    Test that stored content hashes are shown under meta.netdb when enabled.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'show_content_hash', True)
+
+    documents = {
+        document.element_id: document.content_hash
+        for document in interface.mock_standard_interface_documents()
+    }
+
+    column = (
+        column_odm.ColumnODM(column_type='interface')
+        .fetch(enable_overrides=False)
+        .generate_column()
+        .pruned_column
+    )
+
+    assert documents
+    for element_id, content_hash in documents.items():
+        meta = column['ROUTER1'][element_id]['meta']['netdb']
+        assert meta['content_hash'] == content_hash
+
+
+def test_column_odm_device_registry(monkeypatch):
+    """
+    Test that registered device names are read once per device column revision.
+    """
+    DeviceRegistry.invalidate()
+
+    reads = []
+    read_set_ids = mock_mongo_api.MongoAPI.read_set_ids
+
+    def counting_read_set_ids(self, query=None):
+        reads.append((self.collection, query))
+        return read_set_ids(self, query)
+
+    monkeypatch.setattr(mock_mongo_api.MongoAPI, 'read_set_ids', counting_read_set_ids)
+
+    def validate(data):
+        return column_odm.ColumnODM(
+            container=InterfaceContainer(datasource='netbox', weight=150, column=data)
+        ).validate()
+
+    assert validate(interface.mock_standard_interface_data())
+    assert validate(interface.mock_standard_interface_data())
+    assert reads == [('device', None)]
+
+    # Only unknown sets are looked up before failing.
+    data = interface.mock_nonexistent_device_interface_data()
+    with pytest.raises(NetDBException) as e:
+        validate(data)
+
+    assert e.value.code == 422
+    assert reads[1:] == [('device', {'set_id': {'$in': sorted(data)}})]
+
+    # Sets added directly (without a device column revision bump) are found.
+    revision = column_odm.ColumnODM(column_type='device').revision().revision
+    DeviceRegistry.put(revision, DeviceRegistry.get(revision) - {'ROUTER1'})
+
+    assert validate(interface.mock_standard_interface_data())
+    assert reads[2:] == [('device', {'set_id': {'$in': ['ROUTER1']}})]
+    assert DeviceRegistry.get(revision) == frozenset(['ROUTER1'])
+
+    # Device column writes in another worker invalidate the registry.
+    column_odm.ColumnODM(column_type='device').bump_revision()
+    DeviceRegistry.put(revision, frozenset(['ROUTER1']))
+
+    assert validate(interface.mock_standard_interface_data())
+    assert reads[3:] == [('device', None)]
+
+
+def test_column_odm_reload_delta(monkeypatch):
+    """
+    Test that ColumnODM delta reload only writes added, changed and removed documents
+    and only bumps the column revision if something changed.
+    """
+
+    def reload_delta(data):
+        odm = column_odm.ColumnODM(
+            container=InterfaceContainer(datasource='netbox', weight=150, column=data)
+        )
+        return odm, odm.reload_delta()
+
+    revision = column_odm.ColumnODM(column_type='interface').revision().revision
+
+    odm, counts = reload_delta(interface.mock_standard_interface_data())
+
+    assert counts == {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 7}
+    assert column_odm.ColumnODM(column_type='interface').revision().revision == revision
+
+    # Stored documents without a content hash are always replaced.
+    monkeypatch.setattr(
+        mock_mongo_api,
+        'COLLECTION_FACTORY',
+        {
+            **mock_mongo_api.COLLECTION_FACTORY,
+            'interface': lambda: [
+                document.model_copy(update={'content_hash': None})
+                for document in interface.mock_standard_interface_documents()
+            ],
+        },
+    )
+
+    _, counts = reload_delta(interface.mock_standard_interface_data())
+
+    assert counts == {'added': 0, 'changed': 7, 'removed': 0, 'unchanged': 0}
+
+    monkeypatch.undo()
+
+    data = interface.mock_standard_interface_data()
+    data['ROUTER1']['bond0']['description'] = 'Changed'
+    data['ROUTER1']['eth9'] = data['ROUTER1'].pop('bond0.900')
+
+    odm, counts = reload_delta(data)
+
+    assert counts == {'added': 1, 'changed': 1, 'removed': 1, 'unchanged': 5}
+    written = odm.mongo.documents  # pylint: disable=E1101
+    removed = odm.mongo.removed  # pylint: disable=E1101
+
+    assert [d.element_id for d in written] == ['eth9', 'bond0']
+    assert [d.element_id for d in removed] == ['bond0.900']
+    assert column_odm.ColumnODM(column_type='interface').revision().revision > revision
+
+
+def test_async_column_odm_reload_delta():
+    """
+    Test AsyncColumnODM delta reload.
+    """
+    data = interface.mock_standard_interface_data()
+    del data['ROUTER1']['bond0']
+
+    odm = column_odm.AsyncColumnODM(
+        container=InterfaceContainer(datasource='netbox', weight=150, column=data)
+    )
+
+    assert asyncio.run(odm.reload_delta()) == {
+        'added': 0,
+        'changed': 0,
+        'removed': 1,
+        'unchanged': 6,
+    }
+
+
+@pytest.mark.parametrize(
+    'write',
+    [
+        lambda: column_odm.ColumnODM(
+            container=BGPContainer(
+                datasource='repo',
+                weight=50,
+                column=bgp.mock_standard_bgp_data(source='repo'),
+            )
+        ).reload(),
+        lambda: column_odm.ColumnODM(
+            container=BGPContainer(
+                datasource='repo',
+                weight=50,
+                column=bgp.mock_standard_bgp_data(source='repo'),
+            )
+        ).replace(),
+        lambda: column_odm.ColumnODM(column_type='bgp').delete({'datasource': 'repo'}),
+        lambda: override_handler.OverrideHandler().upsert(
+            override.mock_override_documents()[0]
+        ),
+        lambda: override_handler.OverrideHandler().delete({'column_type': 'bgp'}),
+        lambda: override_handler.OverrideHandler().delete({'set_id': 'ROUTER1'}),
+    ],
+)
+def test_column_odm_fetch_column_cache(monkeypatch, write):
+    """
+    Test that fetch_column serves cached columns until a column or override write
+    bumps the column revision.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'column_cache_size', 8)
+    ColumnCache.invalidate()
+
+    fetches = []
+    stream_column = column_odm.ColumnODM.stream_column
+
+    def counting_stream_column(self, *args, **kwargs):
+        fetches.append(self.column_type)
+        return stream_column(self, *args, **kwargs)
+
+    monkeypatch.setattr(column_odm.ColumnODM, 'stream_column', counting_stream_column)
+
+    def read():
+        return column_odm.ColumnODM(column_type='bgp').fetch_column()
+
+    column = bgp.mock_standard_bgp_column(check_override=True)
+
+    assert read() == column
+    assert read() == column
+    assert len(fetches) == 1
+
+    revision = column_odm.ColumnODM(column_type='bgp').revision().revision
+    write()
+
+    assert column_odm.ColumnODM(column_type='bgp').revision().revision > revision
+
+    # A stale entry generated by another worker must not be served either.
+    key = ColumnCache.key('bgp', {}, False, True)
+    ColumnCache.put(key, revision, {'STALE': {}})
+
+    before = len(fetches)
+
+    assert read() == column
+    assert len(fetches) == before + 1
+
+    ColumnCache.invalidate()
+
+
+def test_async_column_odm_reload():
+    """
+    Test AsyncColumnODM reload.
+    """
+    odm = column_odm.AsyncColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    asyncio.run(odm.reload())
+
+    assert odm.mongo.filter == {'datasource': 'netbox'}  # pylint: disable=E1101
+    assert (
+        odm.mongo.documents  # pylint: disable=E1101
+        == interface.mock_standard_interface_documents()
+    )
+
+
+@pytest.mark.parametrize('method', ['reload', 'replace'])
+def test_async_column_odm_write_in_threadpool(monkeypatch, method):
+    """
+    Test that AsyncColumnODM generates the documents it writes in the threadpool,
+    including when they are generated as they are written.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'transactions', True)
+
+    threads = []
+    # pylint: disable=W0212
+    iter_netdb_documents = column_odm.BaseColumnODM._iter_netdb_documents
+
+    def recording_iter_netdb_documents(self):
+        threads.append(threading.get_ident())
+        yield from iter_netdb_documents(self)
+
+    monkeypatch.setattr(
+        column_odm.BaseColumnODM,
+        '_iter_netdb_documents',
+        recording_iter_netdb_documents,
+    )
+
+    odm = column_odm.AsyncColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    asyncio.run(getattr(odm, method)())
+
+    assert threads and threading.get_ident() not in threads
+
+
+def test_async_column_odm_reload_validation_fail():
+    """
+    Test that AsyncColumnODM reload validation fails on non-existent device.
+    """
+    odm = column_odm.AsyncColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_nonexistent_device_interface_data(),
+        )
+    )
+
+    with pytest.raises(NetDBException) as e:
+        asyncio.run(odm.reload())
+
+    assert e.value.message == 'ROUTER3: device not registered.'
+    assert e.value.code == 422
+
+
 @pytest.mark.parametrize(
     'container,error_code,error_message',
     [
@@ -476,7 +942,7 @@ def test_column_odm_replace(container, documents, count):
     out = odm.replace()
 
     assert odm.mongo.documents == documents  # pylint: disable=E1101
-    assert out == count
+    assert out == {'matched': count, 'modified': count, 'upserted': 0}
 
 
 @pytest.mark.parametrize(
@@ -666,3 +1132,191 @@ def test_column_odm_validate_fail(container, error_code, error_message):
 
     assert message == error_message
     assert code == error_code
+
+
+@pytest.mark.parametrize('column', COLUMN_TYPES)
+def test_pruned_column(column):
+    """
+    Test that pruned_column matches FastAPI's JSON encoding of the column sets.
+
+    Expected result:
+       Identical pruned sets
+
+    """
+    odm = (
+        column_odm.ColumnODM(column_type=column)
+        .fetch(show_hidden=True)
+        .generate_column()
+    )
+
+    assert odm.pruned_column == {
+        set_id: jsonable_encoder(set_data, exclude_none=True)
+        for set_id, set_data in odm.container.column.items()
+    }
+
+
+@pytest.mark.parametrize('server_side_weights', [False, True])
+@pytest.mark.parametrize('driver', ['threaded', 'async'])
+def test_column_odm_iter_sets(monkeypatch, driver, server_side_weights):
+    """
+    Test ColumnODM.iter_sets() with the interface sets of two devices whose
+    documents are stored interleaved.
+
+    Expected result:
+       Both sets in set_id order, each equal to the fetched set and each generated
+       from its own documents only.
+
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    expected = column_odm.ColumnODM(column_type='interface').fetch_column()['ROUTER1']
+
+    read_column = mock_mongo_api.MongoAPI.read_column
+
+    def two_devices(self, query=None, fields=None):
+        documents = read_column(self, query, fields)
+
+        return [
+            copy
+            for document in documents
+            for copy in [
+                document.model_copy(update={'set_id': 'ROUTER2'}),
+                document,
+            ]
+        ]
+
+    monkeypatch.setattr(mock_mongo_api.MongoAPI, 'read_column', two_devices)
+
+    generated = []
+    generate_column = column_odm.BaseColumnODM.generate_column
+
+    def recording_generate_column(self, documents=None):
+        documents = list(documents)
+        generated.append({document.set_id for document in documents})
+        return generate_column(self, documents)
+
+    monkeypatch.setattr(
+        column_odm.BaseColumnODM, 'generate_column', recording_generate_column
+    )
+
+    if driver == 'async':
+
+        async def collect():
+            odm = column_odm.AsyncColumnODM(column_type='interface')
+            return [item async for item in odm.iter_sets()]
+
+        out = asyncio.run(collect())
+    else:
+        out = list(column_odm.ColumnODM(column_type='interface').iter_sets())
+
+    assert out == [('ROUTER1', expected), ('ROUTER2', expected)]
+    assert generated == [{'ROUTER1'}, {'ROUTER2'}]
+
+
+@pytest.mark.parametrize(
+    'fields, result',
+    [
+        (None, None),
+        ([], None),
+        (['type', 'address'], ['address', 'type']),
+        (['lacp.rate', 'lacp', 'type', 'type'], ['lacp', 'type']),
+        (['lacp.rate', 'lacp_x'], ['lacp.rate', 'lacp_x']),
+    ],
+)
+def test_column_odm_set_fields(fields, result):
+    """
+    Test that projection fields are deduplicated and that overlapping fields are
+    merged.
+    """
+    odm = column_odm.ColumnODM(column_type='interface').set_fields(fields)
+
+    assert odm.fields == result
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_column_odm_fields_cache(monkeypatch, cached):
+    """
+    Test that projected and unprojected columns are cached separately and that
+    projected columns are not validated.
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'column_cache_size', 8 if cached else 0
+    )
+    ColumnCache.invalidate()
+
+    full = column_odm.ColumnODM(column_type='interface').fetch_column()
+    odm = column_odm.ColumnODM(column_type='interface').set_fields(['type'])
+    projected = odm.fetch_column()
+
+    assert set(projected['ROUTER1']) == set(full['ROUTER1'])
+    assert all(
+        set(element) == {'type', 'meta'} for element in projected['ROUTER1'].values()
+    )
+    assert column_odm.ColumnODM(column_type='interface').fetch_column() == full
+
+
+@pytest.mark.parametrize('driver', ['sync', 'async'])
+def test_raw_odm_import_validation(monkeypatch, driver):
+    """
+    Test that imported column documents are validated against the column model and
+    must belong to registered devices, and that client supplied content hashes and
+    schema versions are replaced, also in trusted read mode.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'trusted_reads', True)
+
+    version = column_odm.schema_version('interface')
+    template = interface.mock_standard_interface_documents()[0]
+
+    forged = template.model_copy(
+        update={'content_hash': 'forged', 'schema_version': 'forged'}
+    )
+    invalid = template.model_copy(
+        update={'data': {**template.data, 'type': 'red_herring'}},
+    )
+    invalid.schema_version = version
+    unregistered = template.model_copy(update={'set_id': 'ROUTER3'})
+
+    lines = [
+        document.model_dump_json().encode()
+        for document in [forged, invalid, unregistered]
+    ]
+
+    if driver == 'async':
+        odm = raw_odm.AsyncRawODM('interface')
+        counts = asyncio.run(odm.import_documents(lines))
+    else:
+        odm = raw_odm.RawODM('interface')
+        counts = odm.import_documents(lines)
+
+    assert counts == {'inserted': 1, 'failed': 0, 'invalid': 2}
+
+    stored = odm.mongo.documents  # pylint: disable=E1101
+
+    assert [document.data for document in stored] == [template.data]
+    assert stored[0].schema_version == version
+
+    # Computed when stored
+    assert stored[0].content_hash is None
+
+    assert odm.affected_columns == {'interface'}
+
+
+def test_raw_odm_import_override_column():
+    """
+    Test that imported overrides of nonexistent columns are rejected.
+    """
+    document = override.mock_override_documents()[0]
+
+    lines = [
+        document.model_dump_json().encode(),
+        document.model_copy(update={'column_type': 'nonexistent'})
+        .model_dump_json()
+        .encode(),
+    ]
+
+    odm = raw_odm.RawODM('override')
+
+    assert odm.import_documents(lines) == {'inserted': 1, 'failed': 0, 'invalid': 1}
+    assert odm.affected_columns == {document.column_type}
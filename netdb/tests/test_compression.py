@@ -0,0 +1,89 @@
+import gzip
+from collections import OrderedDict
+
+import pytest
+
+from util import compression
+
+
+@pytest.fixture
+def encoders(monkeypatch):
+    """
+    Offer zstd, br and gzip regardless of the installed packages.
+    """
+    monkeypatch.setattr(
+        compression,
+        'ENCODERS',
+        OrderedDict(
+            [
+                ('zstd', lambda body: b'zstd'),
+                ('br', lambda body: b'br'),
+                ('gzip', lambda body: b'gzip'),
+            ]
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    'accept_encoding,encoding',
+    [
+        (None, None),
+        ('', None),
+        ('identity', None),
+        ('deflate', None),
+        ('gzip', 'gzip'),
+        ('gzip, deflate', 'gzip'),
+        ('GZIP', 'gzip'),
+        ('gzip;q=0', None),
+        ('gzip, br', 'br'),
+        ('gzip, br;q=0', 'gzip'),
+        ('gzip, br, zstd', 'zstd'),
+        ('*', 'zstd'),
+        ('*, zstd;q=0', 'br'),
+        ('gzip;q=bogus, br;q=0.5', 'br'),
+    ],
+)
+def test_negotiate_encoding(encoders, accept_encoding, encoding):
+    """
+    Test Accept-Encoding negotiation.
+
+    Expected result:
+       The most preferred acceptable coding, None for identity.
+
+    """
+    assert compression.negotiate_encoding(accept_encoding) == encoding
+
+
+def test_gzip_encoder():
+    """
+    Test that the gzip encoder round trips and is deterministic.
+
+    Expected result:
+       Decompressed body equals input. Equal input gives equal output.
+
+    """
+    body = b'{"result": true}' * 100
+
+    assert gzip.decompress(compression.ENCODERS['gzip'](body)) == body
+    assert compression.ENCODERS['gzip'](body) == compression.ENCODERS['gzip'](body)
+
+
+def test_encoded_etag(encoders):
+    """
+    Test that each content coding gets its own ETag, distinct from the identity
+    ETag under strong comparison, and that weak ETags stay weak.
+    """
+    etag = '"interface-3-0123456789abcdef"'
+
+    etags = [etag] + [
+        compression.encoded_etag(etag, encoding) for encoding in compression.ENCODERS
+    ]
+
+    assert etags[1:] == [
+        '"interface-3-0123456789abcdef-zstd"',
+        '"interface-3-0123456789abcdef-br"',
+        '"interface-3-0123456789abcdef-gzip"',
+    ]
+    assert len(set(etags)) == len(etags)
+
+    assert compression.encoded_etag(f'W/{etag}', 'gzip') == f'W/{etags[-1]}'
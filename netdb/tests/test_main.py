@@ -1,11 +1,17 @@
+import json
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 
+import cbor2
+import msgpack  # type: ignore
 import pytest
 
 from mocked_data import interface  # type: ignore
 from mocked_utils import mock_mongo_api  # type: ignore
 
+from config.settings import NetdbSettings
+from models.types import project_data
+
 
 def _container(column_type, datasource, weight, column):
     """
@@ -26,11 +32,23 @@ with patch.dict(
     },
 ):
     import main
+    from util.compression import CompressedResponseCache
 
 
 client = TestClient(main.app)
 
 
+@pytest.fixture(autouse=True, params=[False, True], ids=['threaded', 'async'])
+def async_driver(request, monkeypatch):
+    """
+    Run every API test against both the threaded (pymongo) and the asyncio (motor)
+    driver paths.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'async_driver', request.param)
+
+    return request.param
+
+
 def test_get_root():
     """
     Test a GET request to API root.
@@ -58,6 +76,49 @@ def test_get_column_root():
     }
 
 
+def test_get_pool_metrics():
+    """
+    Test a GET request to API '/metrics/pool' endpoint.
+
+    Expected result:
+        Connection pool counters for the serving worker process
+
+    """
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    assert response.json()['comment'] == 'MongoDB connection pool metrics.'
+    assert {'checkouts', 'checked_out', 'wait_time_total_ms'} <= set(
+        response.json()['out']
+    )
+
+
+def test_get_indexes():
+    """
+    Test a GET request to API '/indexes' endpoint.
+
+    Expected result:
+        Index specification and query shape plans of each column. The mocked explain
+        only scans an index for queries filtering by set_id.
+
+    """
+    response = client.get("/indexes")
+    assert response.status_code == 200
+    assert response.json()['comment'] == 'NetDB column indexes.'
+
+    device = response.json()['out']['device']
+    assert device['query_shapes'] == {
+        'datasource': [],
+        'set_id': ['set_id_1'],
+        'datasource,set_id': ['set_id_1'],
+    }
+    assert device['collscan'] == ['datasource']
+
+    bgp = response.json()['out']['bgp']
+    assert len(bgp['query_shapes']) == 31
+    assert 'category_1_family_1_element_id_1' in bgp['indexes']
+    assert 'category_1_family_1_element_id_1' not in device['indexes']
+
+
 @pytest.mark.parametrize(
     'column,get_string,code,result',
     [
@@ -614,6 +675,30 @@ def test_post_column():
     }
 
 
+def test_post_column_delta():
+    """
+    Test a POST request to API '/column?delta=true' endpoint.
+
+    Expected result:
+       Counts of added, changed, removed and unchanged documents
+
+    """
+    data = interface.mock_standard_interface_data()
+    data['ROUTER1']['bond0']['description'] = 'Changed'
+
+    response = client.post(
+        "/column?delta=true",
+        json=_container('interface', 'netbox', 150, data),
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        'comment': 'Column delta reload successful.',
+        'error': False,
+        'out': {'added': 0, 'changed': 1, 'removed': 0, 'unchanged': 6},
+        'result': True,
+    }
+
+
 def test_post_column_fail():
     """
     Test a POST request to API '/column' endpoint.
@@ -679,7 +764,7 @@ def test_put_column():
     assert response.json() == {
         'result': True,
         'error': False,
-        'out': None,
+        'out': {'matched': 7, 'modified': 7, 'upserted': 0},
         'comment': 'interface column: 7 elements successfully replaced.',
     }
 
@@ -1230,3 +1315,923 @@ def test_delete_override(get_string, code, result):
 
     assert response.status_code == code
     assert response.json() == result
+
+
+def test_get_column_not_modified(monkeypatch):
+    """
+    Test conditional GET requests to the '/column/interface' and
+    '/column/interface/router1' endpoints.
+
+    Expected result:
+       ETag and Last-Modified headers on 200 responses. A 304 response without
+       any column document reads when If-None-Match matches the current ETag.
+
+    """
+    client.delete("/column/interface?datasource=netbox")
+
+    # Different queries have different representations
+    assert (
+        len(
+            {
+                client.get(url).headers['etag']
+                for url in [
+                    "/column/interface",
+                    "/column/interface?show_hidden=true",
+                    "/column/interface?set_id=ROUTER1",
+                    "/column/interface/router1",
+                ]
+            }
+        )
+        == 3
+    )
+
+    for url in ["/column/interface", "/column/interface/router1"]:
+        response = client.get(url)
+        assert response.status_code == 200
+
+        etag = response.headers['etag']
+        assert etag.startswith('"interface-')
+        assert 'last-modified' in response.headers
+
+        def no_reads(*args, **kwargs):
+            raise AssertionError('Column documents read for a 304 response.')
+
+        with monkeypatch.context() as m:
+            m.setattr(mock_mongo_api.MongoAPI, 'read_column', no_reads)
+            m.setattr(mock_mongo_api.MongoAPI, 'read_column_resolved', no_reads)
+
+            for if_none_match in [etag, f'W/{etag}', f'"other", {etag}', '*']:
+                response = client.get(url, headers={'If-None-Match': if_none_match})
+
+                assert response.status_code == 304
+                assert response.headers['etag'] == etag
+                assert not response.content
+
+        response = client.get(url, headers={'If-None-Match': '"other"'})
+        assert response.status_code == 200
+        assert response.headers['etag'] == etag
+
+
+@pytest.mark.parametrize(
+    'column,method,url,body',
+    [
+        (
+            'interface',
+            'POST',
+            "/column",
+            _container(
+                'interface', 'netbox', 150, interface.mock_standard_interface_data()
+            ),
+        ),
+        (
+            'interface',
+            'PUT',
+            "/column",
+            _container(
+                'interface', 'netbox', 150, interface.mock_standard_interface_data()
+            ),
+        ),
+        (
+            'interface',
+            'POST',
+            "/column?delta=true",
+            _container(
+                'interface',
+                'netbox',
+                150,
+                {
+                    'ROUTER1': {
+                        **interface.mock_standard_interface_data()['ROUTER1'],
+                        'eth9': {'type': 'ethernet'},
+                    }
+                },
+            ),
+        ),
+        ('interface', 'DELETE', "/column/interface?datasource=netbox", None),
+        (
+            'protocol',
+            'PUT',
+            "/override",
+            {
+                'column_type': 'protocol',
+                'set_id': 'ROUTER1',
+                'category': None,
+                'family': None,
+                'element_id': 'lldp',
+                'data': {'interfaces': ['bond0', 'eth6']},
+            },
+        ),
+        ('protocol', 'DELETE', "/override?column_type=protocol", None),
+        ('interface', 'DELETE', "/override?set_id=ROUTER1", None),
+    ],
+)
+def test_get_column_modified(column, method, url, body):
+    """
+    Test that every column and override write changes the ETag of affected columns.
+
+    Expected result:
+       A conditional GET with the ETag seen before the write returns fresh column
+       data and a new ETag.
+
+    """
+    etag = client.get(f"/column/{column}").headers['etag']
+
+    response = client.request(method, url, json=body)
+    assert response.status_code == 200
+
+    response = client.get(f"/column/{column}", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()['out']
+    assert response.headers['etag'] != etag
+
+
+@pytest.mark.parametrize('transactions', [False, True])
+@pytest.mark.parametrize('columns', [[], ['interface', 'bgp']])
+def test_get_device_bundle(monkeypatch, transactions, columns):
+    """
+    Test a GET request to API '/device/router1/bundle' endpoint.
+
+    Expected result:
+       The ROUTER1 set of every (or every selected) column, as returned by the
+       '/column/{column}/router1' endpoint, read with a single override query.
+
+    """
+    expected = {}
+    for column in columns or [
+        'device',
+        'firewall',
+        'policy',
+        'interface',
+        'bgp',
+        'protocol',
+    ]:
+        if (response := client.get(f"/column/{column}/router1")).status_code == 200:
+            expected[column] = response.json()['out']['ROUTER1']
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'transactions', transactions)
+
+    override_reads = []
+    read_overrides = mock_mongo_api.MongoAPI.read_overrides
+
+    def counting_read_overrides(self, query=None, sort=None, limit=0):
+        override_reads.append(query)
+        return read_overrides(self, query, sort, limit)
+
+    monkeypatch.setattr(
+        mock_mongo_api.MongoAPI, 'read_overrides', counting_read_overrides
+    )
+
+    query = ''.join(f'&column={column}' for column in columns)
+    response = client.get(f"/device/router1/bundle?{query}")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'comment': 'Column data bundle for router1.',
+        'error': False,
+        'out': expected,
+        'result': True,
+    }
+    assert len(override_reads) == 1
+
+
+@pytest.mark.parametrize(
+    'url,code,comment',
+    [
+        ("/device/router9/bundle", 404, 'No column data found for router9'),
+        (
+            "/device/router1/bundle?column=nonexistent",
+            404,
+            'Column nonexistent not available',
+        ),
+    ],
+)
+def test_get_device_bundle_fail(url, code, comment):
+    """
+    Test failing GET requests to API '/device/{set_id}/bundle' endpoint.
+
+    Expected result:
+       Not found results
+
+    """
+    response = client.get(url)
+
+    assert response.status_code == code
+    assert response.json()['comment'] == comment
+
+
+@pytest.mark.parametrize('transactions', [False, True])
+@pytest.mark.parametrize('columns', [None, ['interface', 'bgp']])
+def test_get_device_batch(monkeypatch, transactions, columns):
+    """
+    Test a POST request to API '/device/batch' endpoint.
+
+    Expected result:
+       The bundles of all devices with data, as returned by the
+       '/device/{set_id}/bundle' endpoint, read with a single override query.
+
+    """
+    query = ''.join(f'&column={column}' for column in columns or [])
+    expected = client.get(f"/device/router1/bundle?{query}").json()['out']
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'transactions', transactions)
+
+    override_reads = []
+    read_overrides = mock_mongo_api.MongoAPI.read_overrides
+
+    def counting_read_overrides(self, query=None, sort=None, limit=0):
+        override_reads.append(query)
+        return read_overrides(self, query, sort, limit)
+
+    monkeypatch.setattr(
+        mock_mongo_api.MongoAPI, 'read_overrides', counting_read_overrides
+    )
+
+    response = client.post(
+        "/device/batch",
+        json={'set_ids': ['router1', 'router9', 'ROUTER1'], 'column': columns},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'comment': 'Column data bundles for 1 devices.',
+        'error': False,
+        'out': {'ROUTER1': expected},
+        'result': True,
+    }
+    assert override_reads == [
+        {
+            'set_id': {'$in': ['ROUTER1', 'ROUTER9']},
+            'column_type': {'$in': list(expected)},
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    'body,code,comment',
+    [
+        ({'set_ids': ['router9']}, 404, 'No column data found.'),
+        (
+            {'set_ids': ['router1'], 'column': ['nonexistent']},
+            404,
+            'Column nonexistent not available',
+        ),
+    ],
+)
+def test_get_device_batch_fail(body, code, comment):
+    """
+    Test failing POST requests to API '/device/batch' endpoint.
+
+    Expected result:
+       Not found results
+
+    """
+    response = client.post("/device/batch", json=body)
+
+    assert response.status_code == code
+    assert response.json()['comment'] == comment
+
+
+def test_get_device_batch_invalid():
+    """
+    Test a POST request to API '/device/batch' endpoint without set_ids.
+
+    Expected result:
+       Validation error
+
+    """
+    response = client.post("/device/batch", json={'set_ids': []})
+
+    assert response.status_code == 422
+    assert response.json()['result'] is False
+
+
+def test_get_device_batch_too_many(monkeypatch):
+    """
+    Test a POST request to API '/device/batch' endpoint with more set_ids than the
+    `batch_max_set_ids' setting allows.
+
+    Expected result:
+       Validation error. Duplicate set_ids are only counted once.
+
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'batch_max_set_ids', 2)
+
+    response = client.post(
+        "/device/batch", json={'set_ids': ['router1', 'router2', 'router3']}
+    )
+
+    assert response.status_code == 422
+    assert response.json()['comment'] == 'Too many set_ids (at most 2 per request).'
+
+    response = client.post(
+        "/device/batch", json={'set_ids': ['router1', 'ROUTER1', 'router2']}
+    )
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    'url',
+    [
+        "/column/interface",
+        "/column/bgp/router1",
+        "/device/router1/bundle",
+    ],
+)
+def test_get_pretty(url):
+    """
+    Test GET requests with and without the pretty query parameter.
+
+    Expected result:
+       Compact JSON by default and indented JSON if pretty, with the same content
+       and distinct ETags.
+
+    """
+    compact = client.get(url)
+    pretty = client.get(f"{url}?pretty=true")
+
+    assert compact.status_code == pretty.status_code == 200
+    assert compact.json() == pretty.json()
+    assert compact.json()['result'] is True
+    assert '\n' not in compact.text
+    assert '\n  "result": true' in pretty.text
+
+    if etag := compact.headers.get('etag'):
+        assert pretty.headers['etag'] != etag
+
+
+@pytest.fixture
+def compressed(monkeypatch):
+    """
+    Enable response compression for any response body and the compressed response
+    cache.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'compress_min_size', 1)
+    monkeypatch.setattr(NetdbSettings.__settings__, 'compress_cache_size', 8)
+
+    CompressedResponseCache.invalidate()
+    yield
+    CompressedResponseCache.invalidate()
+
+
+@pytest.mark.parametrize(
+    'url', ["/column/interface", "/column/bgp/router1", "/device/router1/bundle"]
+)
+def test_get_compressed(compressed, url):
+    """
+    Test GET requests accepting and not accepting gzip with compression enabled.
+
+    Expected result:
+       A gzip encoded response (with a gzip specific ETag for column reads) if
+       accepted, identity otherwise, both with the same content.
+
+    """
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    encoded = client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+    assert plain.status_code == encoded.status_code == 200
+    assert 'content-encoding' not in plain.headers
+    assert encoded.headers['content-encoding'] == 'gzip'
+    assert plain.headers['vary'] == encoded.headers['vary']
+    assert 'Accept-Encoding' in encoded.headers['vary']
+    assert encoded.json() == plain.json()
+
+    if etag := plain.headers.get('etag'):
+        assert encoded.headers['etag'] == f'{etag[:-1]}-gzip"'
+
+        # Both the identity ETag and that of the negotiated coding revalidate
+        for headers, status_code in [
+            ({'Accept-Encoding': 'gzip', 'If-None-Match': etag}, 304),
+            (
+                {'Accept-Encoding': 'gzip', 'If-None-Match': encoded.headers['etag']},
+                304,
+            ),
+            ({'Accept-Encoding': 'br', 'If-None-Match': encoded.headers['etag']}, 200),
+        ]:
+            assert client.get(url, headers=headers).status_code == status_code
+
+
+def test_get_compressed_threshold(compressed, monkeypatch):
+    """
+    Test a GET request with a response body below the compression threshold.
+
+    Expected result:
+       Identity encoded response
+
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'compress_min_size', 10**9)
+
+    response = client.get("/column/interface", headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert 'content-encoding' not in response.headers
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+def test_get_compressed_cached(compressed, monkeypatch, pretty):
+    """
+    Test that repeated compressed GET requests for an unchanged column are served
+    from the compressed response cache.
+
+    Expected result:
+       Column generated once until the column is written. Same content and ETag,
+       and a 304 for the gzip ETag.
+
+    """
+    url = f"/column/interface?pretty={str(pretty).lower()}"
+    headers = {'Accept-Encoding': 'gzip'}
+
+    fetched = []
+
+    run_odm = main.run_odm
+
+    async def counting_run_odm(method, *args, **kwargs):
+        if method.__name__ == 'fetch_column':
+            fetched.append(method)
+
+        return await run_odm(method, *args, **kwargs)
+
+    monkeypatch.setattr(main, 'run_odm', counting_run_odm)
+
+    first = client.get(url, headers=headers)
+    second = client.get(url, headers=headers)
+
+    assert len(fetched) == 1
+    assert second.json() == first.json()
+    assert second.headers['etag'] == first.headers['etag']
+    assert second.headers['content-encoding'] == 'gzip'
+
+    response = client.get(
+        url, headers={**headers, 'If-None-Match': second.headers['etag']}
+    )
+    assert response.status_code == 304
+
+    # Identity responses are not cached
+    client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert len(fetched) == 2
+
+    # A column write changes the ETag
+    assert client.delete("/column/interface?datasource=netbox").status_code == 200
+    client.get(url, headers=headers)
+    assert len(fetched) == 3
+
+
+@pytest.mark.parametrize(
+    'media_type,decode',
+    [
+        ('application/msgpack', msgpack.unpackb),
+        ('application/x-msgpack', msgpack.unpackb),
+        ('application/cbor', cbor2.loads),
+    ],
+)
+@pytest.mark.parametrize(
+    'method,url,body',
+    [
+        ('GET', "/column/interface", None),
+        ('GET', "/column/bgp/router1", None),
+        ('GET', "/device/router1/bundle", None),
+        ('POST', "/device/batch", {'set_ids': ['router1']}),
+        ('GET', "/override", None),
+    ],
+)
+def test_get_binary(media_type, decode, method, url, body):
+    """
+    Test requests preferring MessagePack or CBOR output.
+
+    Expected result:
+       The requested media type holding the same NetDBReturn as the JSON response.
+
+    """
+    expected = client.request(method, url, json=body).json()
+
+    response = client.request(
+        method,
+        url,
+        json=body,
+        headers={'Accept': f'application/json;q=0.5, {media_type}'},
+    )
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == media_type
+    assert decode(response.content) == expected
+
+    if etag := response.headers.get('etag'):
+        json_etag = client.request(method, url, json=body).headers['etag']
+        assert etag != json_etag
+
+        # A JSON client's ETag does not revalidate the binary representation
+        response = client.request(
+            method,
+            url,
+            json=body,
+            headers={'Accept': media_type, 'If-None-Match': json_etag},
+        )
+        assert response.status_code == 200
+
+
+def test_get_binary_compressed(compressed):
+    """
+    Test compressed MessagePack and JSON responses of the same column revision.
+
+    Expected result:
+       Both media types are compressed and cached separately.
+
+    """
+    for _ in range(2):
+        packed = client.get(
+            "/column/interface",
+            headers={'Accept': 'application/msgpack', 'Accept-Encoding': 'gzip'},
+        )
+        plain = client.get("/column/interface", headers={'Accept-Encoding': 'gzip'})
+
+        assert packed.headers['content-type'] == 'application/msgpack'
+        assert packed.headers['content-encoding'] == 'gzip'
+        assert plain.headers['content-type'] == 'application/json'
+        assert msgpack.unpackb(packed.content) == plain.json()
+
+
+@pytest.mark.parametrize('show_hidden', [False, True])
+@pytest.mark.parametrize(
+    'column', ['device', 'firewall', 'policy', 'interface', 'bgp', 'protocol']
+)
+def test_get_column_stream(column, show_hidden):
+    """
+    Test GET requests to the '/column/{column}' endpoint in streaming mode.
+
+    Expected result:
+       The same content and validators as the non streaming response. A 304 for
+       the current ETag.
+
+    """
+    url = f"/column/{column}?show_hidden={str(show_hidden).lower()}"
+
+    expected = client.get(url)
+    response = client.get(f"{url}&stream=true")
+
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+    assert response.headers['etag'] == expected.headers['etag']
+
+    response = client.get(
+        f"{url}&stream=true", headers={'If-None-Match': response.headers['etag']}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    'query, headers',
+    [
+        ('&pretty=true', {}),
+        ('', {'Accept': 'application/msgpack'}),
+    ],
+)
+def test_get_column_stream_representation(query, headers):
+    """
+    Test streaming GET requests for another representation than compact JSON.
+
+    Expected result:
+       The non streaming response and validators of that representation, which
+       differ from those of the compact JSON stream.
+
+    """
+    url = "/column/device?show_hidden=false"
+
+    expected = client.get(f"{url}{query}", headers=headers)
+    response = client.get(f"{url}{query}&stream=true", headers=headers)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert response.headers['content-type'] == expected.headers['content-type']
+    assert response.headers['etag'] == expected.headers['etag']
+    assert response.headers['etag'] != client.get(f"{url}&stream=true").headers['etag']
+
+
+def test_get_column_stream_fail():
+    """
+    Test a streaming GET request for a nonexistent column.
+
+    Expected result:
+       The same error as for a non streaming request
+
+    """
+    response = client.get("/column/nonexistent?stream=true")
+
+    assert response.status_code == 422
+    assert response.json() == client.get("/column/nonexistent").json()
+
+
+@pytest.mark.parametrize(
+    'table, query',
+    [
+        ('interface', ''),
+        ('bgp', '?datasource=netbox'),
+        ('override', ''),
+        ('override', '?column=interface'),
+    ],
+)
+def test_get_export(table, query):
+    """
+    Test GET requests to the '/export/{table}' endpoint.
+
+    Expected result:
+       All stored documents matching the filter, one per line.
+
+    """
+    filt = dict(pair.split('=') for pair in query[1:].split('&') if pair)
+    if 'column' in filt:
+        filt['column_type'] = filt.pop('column')
+
+    expected = mock_mongo_api.MongoAPI('', table).read_column(filt)
+
+    response = client.get(f"/export/{table}{query}")
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    lines = response.content.splitlines()
+
+    assert expected
+    assert [json.loads(line) for line in lines] == [
+        json.loads(document.model_dump_json()) for document in expected
+    ]
+
+
+@pytest.mark.parametrize('table', ['interface', 'override'])
+def test_post_import(table):
+    """
+    Test POST requests to the '/import/{table}' endpoint with a body as exported by
+    the '/export/{table}' endpoint and one invalid line.
+
+    Expected result:
+       Progress for each chunk followed by the totals, and a revision bump of every
+       imported column.
+
+    """
+    body = client.get(f"/export/{table}").content + b'{"set_id": 1}\n'
+    count = len(body.splitlines())
+
+    revision = client.get("/column/interface").headers['etag']
+
+    response = client.post(f"/import/{table}?chunk_size=2", content=body)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.content.splitlines()]
+    totals = {'inserted': count - 1, 'failed': 0, 'invalid': 1}
+
+    assert len(lines) == (count + 1) // 2 + 1
+    assert lines[-2] == totals
+    assert lines[-1] == {
+        'result': True,
+        'error': False,
+        'out': totals,
+        'comment': f'{table}: {count - 1} documents imported.',
+    }
+    assert client.get("/column/interface").headers['etag'] != revision
+
+
+@pytest.mark.parametrize(
+    'method, url',
+    [('get', '/export/nonexistent'), ('post', '/import/nonexistent')],
+)
+def test_export_import_fail(method, url):
+    """
+    Test export and import requests for a nonexistent table.
+    """
+    response = getattr(client, method)(url)
+
+    assert response.status_code == 404
+    assert response.json() == {
+        'result': False,
+        'error': True,
+        'comment': 'Table nonexistent not available',
+    }
+
+
+def test_post_import_read_only(monkeypatch):
+    """
+    Test that imports are refused in read only mode.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'read_only', True)
+
+    response = client.post("/import/interface", content=b'')
+
+    assert response.status_code == 403
+    assert response.json()['comment'] == main.ERR_READONLY['comment']
+
+
+@pytest.fixture
+def interface_fleet(monkeypatch):
+    """
+    Copy the mocked interface documents to ROUTER1, ROUTER2 and ROUTER3. Overrides
+    only apply to ROUTER1.
+    """
+    documents = mock_mongo_api.COLLECTION_FACTORY['interface']
+
+    monkeypatch.setitem(
+        mock_mongo_api.COLLECTION_FACTORY,
+        'interface',
+        lambda: [
+            document.model_copy(update={'set_id': set_id})
+            for set_id in ['ROUTER3', 'ROUTER1', 'ROUTER2']
+            for document in documents()
+        ],
+    )
+
+
+def _pages(url: str) -> list:
+    """
+    Follow X-Next-Cursor from url and return the responses of all pages.
+    """
+    responses = [client.get(url)]
+
+    while cursor := responses[-1].headers.get('x-next-cursor'):
+        responses.append(client.get(f"{url}&cursor={cursor}"))
+
+    return responses
+
+
+@pytest.mark.parametrize('server_side_weights', [False, True])
+@pytest.mark.parametrize('show_hidden', [False, True])
+@pytest.mark.parametrize('limit', [1, 2, 5])
+def test_get_column_paged(
+    interface_fleet, monkeypatch, limit, show_hidden, server_side_weights
+):
+    """
+    Test paginated GET requests to the '/column/{column}' endpoint.
+
+    Expected result:
+       Pages of up to limit sets in set_id order which together hold the column.
+
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    query = f"show_hidden={str(show_hidden).lower()}"
+    expected = client.get(f"/column/interface?{query}").json()['out']
+
+    responses = _pages(f"/column/interface?{query}&limit={limit}")
+
+    assert len(responses) == -(-3 // limit)
+    assert all(response.status_code == 200 for response in responses)
+    assert all(len(response.json()['out']) <= limit for response in responses)
+
+    sets = [set_id for response in responses for set_id in response.json()['out']]
+    assert sets == ['ROUTER1', 'ROUTER2', 'ROUTER3']
+
+    out = {k: v for response in responses for k, v in response.json()['out'].items()}
+    assert out == expected
+
+    # Pages have their own validators
+    assert len({response.headers['etag'] for response in responses}) == len(responses)
+    response = client.get(
+        f"/column/interface?{query}&limit={limit}",
+        headers={'If-None-Match': responses[0].headers['etag']},
+    )
+    assert response.status_code == 304
+
+
+def test_get_column_paged_max(interface_fleet, monkeypatch):
+    """
+    Test that page sizes are capped at the `page_max_limit' setting.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'page_max_limit', 2)
+
+    response = client.get("/column/interface?limit=100")
+
+    assert list(response.json()['out']) == ['ROUTER1', 'ROUTER2']
+    assert 'x-next-cursor' in response.headers
+
+    response = client.get(
+        f"/column/interface?cursor={response.headers['x-next-cursor']}"
+    )
+
+    assert list(response.json()['out']) == ['ROUTER3']
+    assert 'x-next-cursor' not in response.headers
+
+
+@pytest.mark.parametrize('limit', [1, 2, 10])
+@pytest.mark.parametrize('query', ['', 'column=bgp&', 'set_id=ROUTER1&'])
+def test_get_override_paged(query, limit):
+    """
+    Test paginated GET requests to the '/override' endpoint.
+
+    Expected result:
+       Pages of up to limit overrides which together hold all matching overrides.
+
+    """
+    expected = client.get(f"/override?{query}").json()['out']
+
+    responses = _pages(f"/override?{query}limit={limit}")
+
+    assert len(responses) == max(1, -(-len(expected) // limit))
+    assert all(len(response.json()['out']) <= limit for response in responses)
+
+    out = [override for response in responses for override in response.json()['out']]
+    assert sorted(out, key=str) == sorted(expected, key=str)
+    assert [override['column_type'] for override in out] == sorted(
+        override['column_type'] for override in expected
+    )
+
+
+@pytest.mark.parametrize('url', ['/column/interface', '/override'])
+@pytest.mark.parametrize('cursor', ['garbage', 'WyJhIiwgMV0='])
+def test_get_paged_invalid_cursor(url, cursor):
+    """
+    Test paginated GET requests with invalid cursors.
+    """
+    response = client.get(f"{url}?cursor={cursor}")
+
+    assert response.status_code == 422
+    assert response.json()['comment'] == 'Invalid page cursor.'
+
+
+def _elements(column: dict, path: tuple = ()) -> dict:
+    """
+    Return the elements (dicts holding meta.netdb) of a pruned column keyed by path.
+    """
+    if 'netdb' in column.get('meta', {}):
+        return {path: column}
+
+    elements = {}
+    for key, value in column.items():
+        if isinstance(value, dict):
+            elements.update(_elements(value, path + (key,)))
+
+    return elements
+
+
+@pytest.mark.parametrize('server_side_weights', [False, True])
+@pytest.mark.parametrize(
+    'column, fields',
+    [
+        ('device', ['location']),
+        ('device', ['node_name', 'location', 'nonexistent']),
+        ('bgp', ['remote_asn', 'family.ipv4.nhs']),
+        ('firewall', ['default_action', 'type']),
+        ('interface', ['type', 'disabled']),
+        ('interface', ['address']),
+    ],
+)
+@pytest.mark.parametrize('url', ['/column/{column}', '/column/{column}/router1'])
+def test_get_column_fields(monkeypatch, url, column, fields, server_side_weights):
+    """
+    Test GET requests projected on element data fields.
+
+    Expected result:
+       The elements of the unprojected column holding only the requested fields
+       (overrides included) and their NetDB meta data.
+
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    url = url.format(column=column)
+
+    expected = _elements(client.get(url).json()['out'])
+    response = client.get(f"{url}?fields={','.join(fields)}")
+
+    assert response.status_code == 200
+
+    elements = _elements(response.json()['out'])
+
+    assert elements.keys() == expected.keys()
+
+    for path, element in elements.items():
+        meta = element.pop('meta')
+
+        assert meta == {'netdb': expected[path]['meta']['netdb']}
+        assert element == project_data(expected[path], fields)
+
+    # Fields may be repeated as well as comma separated
+    assert (
+        client.get(f"{url}?{'&'.join(f'fields={field}' for field in fields)}").json()
+        == response.json()
+    )
+    assert client.get(url).headers['etag'] != response.headers['etag']
+
+
+def test_get_column_fields_stream():
+    """
+    Test that projected streaming and paged GET requests match projected reads.
+    """
+    url = "/column/interface?fields=type,address"
+
+    expected = client.get(url).json()
+
+    assert client.get(f"{url}&stream=true").json() == expected
+    assert client.get(f"{url}&limit=10").json() == expected
+
+
+@pytest.mark.parametrize('fields', ['$where', 'data..type', ''])
+def test_get_column_fields_invalid(fields):
+    """
+    Test GET requests projected on invalid fields.
+    """
+    response = client.get(f"/column/interface?fields={fields}")
+
+    assert response.status_code == 422
+    assert response.json()['comment'] == f'Invalid field: {fields}'
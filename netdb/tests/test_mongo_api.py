@@ -0,0 +1,1251 @@
+import os
+import time
+from datetime import datetime, timezone
+import threading
+from itertools import islice
+import mongomock
+import pymongo
+import pytest
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from mocked_data import device, interface, protocol, bgp, firewall, policy, override  # type: ignore
+
+from config.settings import NetdbSettings
+from models.columns.interface import InterfaceContainer
+from models.types import VISIBLE_FILTER, NetdbDocument, content_hash, visible_query
+from odm.column_odm import ColumnODM
+from util.exception import NetDBException
+from util.mongo_api import _CURSOR_RESUMES, MongoAPI, _retried, _set_ids_pipeline
+from util.mongo_client import MongoClientRegistry
+from util.migrate import backfill_content_hash
+from util.initialize import (
+    DEFAULT_INDEX,
+    OVERRIDE_INDEX,
+    VISIBLE_INDEX,
+    INDEX_LOCK,
+    IndexSpec,
+    build_indexes,
+    check_indexes,
+    explain_query_shapes,
+    index_changes,
+    index_specs,
+    initialize,
+    plan_indexes,
+)
+from util.pagination import after_key
+
+NetdbSettings.initialize()
+
+COLUMN_DOCUMENTS = {
+    'device': device.mock_standard_device_documents,
+    'interface': interface.mock_standard_interface_documents,
+    'protocol': protocol.mock_standard_protocol_documents,
+    'bgp': bgp.mock_standard_bgp_documents,
+    'firewall': firewall.mock_standard_firewall_documents,
+    'policy': policy.mock_standard_policy_documents,
+}
+
+
+def _shadow(document: NetdbDocument, datasource: str, weight: int) -> NetdbDocument:
+    """
+    Return a copy of a document as it might be loaded by another datasource.
+    """
+    data = dict(document.data)
+    data['meta'] = {datasource: {'shadow': True}}
+
+    # Stored without a content hash, as if written before hashes were recorded.
+    return document.model_copy(
+        update={
+            'datasource': datasource,
+            'weight': weight,
+            'data': data,
+            'content_hash': None,
+        }
+    )
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """
+    Back MongoAPI with an in-memory mongomock client loaded with the mocked column
+    and override documents. Each column also gets lower weight and hidden (weight 0)
+    copies of its documents so that weight resolution has losers to discard.
+    """
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoClientRegistry, 'get_client', lambda *args: client)
+
+    settings = NetdbSettings.get_settings()
+
+    for column, documents in COLUMN_DOCUMENTS.items():
+        stored = []
+        for document in documents():
+            stored += [
+                document,
+                _shadow(document, 'lower', 1),
+                _shadow(document, 'mine', 0),
+            ]
+
+        client[settings.db_name][column].insert_many(
+            [document.model_dump() for document in stored]
+        )
+
+    client[settings.db_name][settings.override_table].insert_many(
+        [document.model_dump() for document in override.mock_override_documents()]
+    )
+
+    return client
+
+
+@pytest.mark.parametrize('column_type', list(COLUMN_DOCUMENTS))
+@pytest.mark.parametrize('show_hidden', [False, True])
+@pytest.mark.parametrize('filt', [{}, {'set_id': 'ROUTER1'}, {'datasource': 'mine'}])
+def test_server_side_weights(mongo, monkeypatch, column_type, show_hidden, filt):
+    """
+    Test that aggregation based weight resolution generates the same column as the
+    Python merge in ColumnODM.generate_column().
+    """
+
+    def generate(server_side_weights):
+        monkeypatch.setattr(
+            NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+        )
+
+        return (
+            ColumnODM(column_type=column_type)
+            .fetch(dict(filt), show_hidden)
+            .generate_column()
+            .pruned_column
+        )
+
+    python_column = generate(False)
+
+    assert python_column == generate(True)
+
+
+@pytest.mark.parametrize('datasources', [['alpha', 'zulu'], ['zulu', 'alpha']])
+def test_server_side_weights_tie(mongo, monkeypatch, datasources):
+    """
+    Test that aggregation based weight resolution and the Python merge pick the same
+    winner (the last datasource) of equal weight documents, whatever the order they
+    were stored in.
+    """
+    collection = mongo[NetdbSettings.get_settings().db_name]['interface']
+    collection.delete_many({})
+    collection.insert_many(
+        [
+            _shadow(document, datasource, 100).model_dump()
+            for datasource in datasources
+            for document in interface.mock_standard_interface_documents()
+        ]
+    )
+
+    def generate(server_side_weights):
+        monkeypatch.setattr(
+            NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+        )
+
+        return ColumnODM(column_type='interface').fetch_column(enable_overrides=False)
+
+    column = generate(False)
+
+    assert column == generate(True)
+    assert {
+        data['meta']['netdb']['datasource']
+        for interfaces in column.values()
+        for data in interfaces.values()
+    } == {'zulu'}
+
+
+def test_read_column_resolved_drops_losers(mongo):
+    """
+    Test that only winning documents are read by read_column_resolved().
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    resolved = api.read_column_resolved()
+
+    assert len(api.read_column()) == 3 * len(resolved)
+    assert {document.datasource for document in resolved} == {
+        'netbox',
+        'peering_manager',
+        'repo',
+    }
+    assert len(api.read_column_resolved(show_hidden=True)) == len(resolved)
+    assert {
+        document.datasource
+        for document in api.read_column_resolved({'datasource': 'mine'}, True)
+    } == {'mine'}
+
+
+def test_replace_many(mongo):
+    """
+    Test that replace_many() upserts documents in a single bulk write and reports
+    accurate matched / modified / upserted counts.
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    stored, changed = bgp.mock_standard_bgp_documents()[:2]
+    changed = changed.model_copy(update={'data': {**changed.data, 'changed': True}})
+    new = stored.model_copy(update={'element_id': 'NEW_ELEMENT'})
+
+    assert api.replace_many([stored, changed, new]) == {
+        'matched': 2,
+        'modified': 1,
+        'upserted': 1,
+    }
+    assert api.read_column({'element_id': 'NEW_ELEMENT'}) == [new]
+    assert api.replace_many([]) == {'matched': 0, 'modified': 0, 'upserted': 0}
+
+
+def test_write_delta(mongo):
+    """
+    Test that write_delta() applies inserts, replaces and deletes in one bulk write.
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    removed, changed = bgp.mock_standard_bgp_documents()[:2]
+    changed = changed.model_copy(update={'data': {**changed.data, 'changed': True}})
+    added = removed.model_copy(update={'element_id': 'NEW_ELEMENT'})
+
+    before = len(api.read_column())
+
+    assert api.write_delta([added], [changed], [removed])
+    assert not api.write_delta([], [], [])
+
+    assert len(api.read_column()) == before
+    assert api.read_column({'element_id': 'NEW_ELEMENT'}) == [added]
+    assert changed in api.read_column({'datasource': changed.datasource})
+    assert removed not in api.read_column({'datasource': removed.datasource})
+
+
+def test_backfill_content_hash(mongo):
+    """
+    Test that the content hash migration sets the hash of every stored column
+    document lacking one, and that stored hashes match freshly generated ones.
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    assert len([d for d in api.read_column() if d.content_hash is None]) == 2 * len(
+        bgp.mock_standard_bgp_documents()
+    )
+
+    counts = backfill_content_hash(batch_size=2)
+
+    assert counts == {
+        column: 2 * len(documents()) for column, documents in COLUMN_DOCUMENTS.items()
+    }
+    assert all(d.content_hash == content_hash(d) for d in api.read_column())
+    assert backfill_content_hash() == {column: 0 for column in COLUMN_DOCUMENTS}
+
+
+def test_replace_many_content_hash(mongo):
+    """
+    Test that column documents are always stored with their content hash.
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    document = _shadow(bgp.mock_standard_bgp_documents()[0], 'lower', 1)
+    document = document.model_copy(update={'data': {**document.data, 'changed': True}})
+
+    api.replace_many([document])
+
+    (stored,) = api.read_column(
+        {'datasource': 'lower', 'element_id': document.element_id}
+    )
+    assert stored.content_hash == content_hash(document)
+
+
+def test_read_column_fields(mongo, monkeypatch):
+    """
+    Test projected (partial document) column reads and cursor batch sizes.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'mongo_batch_size', 2)
+
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'bgp')
+
+    documents = api.read_column()
+    partial = api.read_column(fields=['set_id', 'content_hash'])
+
+    assert len(partial) == len(documents)
+    assert [d.set_id for d in partial] == [d.set_id for d in documents]
+    assert [d.content_hash for d in partial] == [d.content_hash for d in documents]
+    assert partial[0].model_fields_set == {'set_id', 'content_hash'}
+    assert list(api.iter_column()) == documents
+
+
+@pytest.mark.parametrize('column_type', list(COLUMN_DOCUMENTS))
+@pytest.mark.parametrize('server_side_weights', [False, True])
+def test_stream_column(mongo, monkeypatch, column_type, server_side_weights):
+    """
+    Test that streaming column generation matches generation from fetched documents.
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    assert (
+        ColumnODM(column_type=column_type).stream_column({'set_id': 'ROUTER1'})
+        == ColumnODM(column_type=column_type)
+        .fetch({'set_id': 'ROUTER1'})
+        .generate_column()
+        .pruned_column
+    )
+
+
+def test_read_set_ids(mongo):
+    """
+    Test that read_set_ids() returns distinct set_ids.
+    """
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'device')
+
+    assert api.read_set_ids() == ['ROUTER1']
+    assert api.read_set_ids({'datasource': 'nonexistent'}) == []
+
+
+def test_raw_export_import(mongo):
+    """
+    Test raw document export and unordered import. Documents clashing with stored
+    ones on the default index are counted as failed without stopping the others.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, 'bgp')
+
+    exported = list(api.iter_raw({'datasource': 'lower'}))
+
+    assert exported
+    assert all('_id' not in document for document in exported)
+    assert all(document['datasource'] == 'lower' for document in exported)
+
+    api.create_index(DEFAULT_INDEX)
+    documents = [NetdbDocument.model_validate(document) for document in exported]
+
+    assert api.insert_unordered(documents) == {
+        'inserted': 0,
+        'failed': len(documents),
+    }
+
+    api.delete_many({'datasource': 'lower'})
+    api.insert_unordered(documents[:1])
+
+    assert api.insert_unordered(documents) == {
+        'inserted': len(documents) - 1,
+        'failed': 1,
+    }
+
+    imported = list(api.iter_raw({'datasource': 'lower'}))
+
+    assert sorted(d['element_id'] for d in imported) == sorted(
+        d['element_id'] for d in exported
+    )
+
+
+def test_read_set_ids_sorted(mongo):
+    """
+    Test that read_set_ids_sorted() returns the first distinct set_ids in order.
+    """
+    settings = NetdbSettings.get_settings()
+    collection = mongo[settings.db_name]['interface']
+
+    for set_id in ['ROUTER3', 'ROUTER2']:
+        collection.insert_many(
+            [
+                {**document, 'set_id': set_id}
+                for document in collection.find({'set_id': 'ROUTER1'}, {'_id': False})
+            ]
+        )
+
+    api = MongoAPI(settings.db_name, 'interface')
+
+    assert api.read_set_ids_sorted({}, 2) == ['ROUTER1', 'ROUTER2']
+    assert api.read_set_ids_sorted({'set_id': {'$gt': 'ROUTER1'}}, 5) == [
+        'ROUTER2',
+        'ROUTER3',
+    ]
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3])
+def test_read_overrides_paged(mongo, limit):
+    """
+    Test that override pages continuing after the index key of the previous page
+    (including missing keys) return every override exactly once in index order.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, settings.override_table)
+    keys = [field for field, _ in OVERRIDE_INDEX]
+
+    expected = api.read_overrides(sort=keys)
+    overrides: list = []
+
+    query: dict = {}
+    while page := api.read_overrides(query, sort=keys, limit=limit):
+        overrides += page
+        query = after_key(keys, [getattr(page[-1], key) for key in keys])
+
+    assert len(expected) == 5
+    assert overrides == expected
+
+
+@pytest.mark.parametrize('server_side_weights', [False, True])
+@pytest.mark.parametrize(
+    'column_type, fields',
+    [
+        ('device', ['location', 'node_name']),
+        ('bgp', ['remote_asn', 'family.ipv4']),
+        ('interface', ['type', 'address']),
+    ],
+)
+def test_column_fields(mongo, monkeypatch, column_type, fields, server_side_weights):
+    """
+    Test that projected reads only transfer the projected element data fields and
+    generate the same elements as unprojected reads.
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    odm = ColumnODM(column_type=column_type).set_fields(fields)
+    documents = list(odm._iter_documents({}, False))  # pylint: disable=W0212
+
+    assert documents
+    assert all(
+        not set(document.model_dump().get('data', {}))
+        - {f.split('.')[0] for f in fields}
+        for document in documents
+    )
+
+    full = ColumnODM(column_type=column_type).stream_column()
+    projected = odm.stream_column()
+
+    assert projected.keys() == full.keys()
+
+
+@pytest.mark.parametrize('server_side_weights', [False, True])
+def test_hidden_documents_not_read(mongo, monkeypatch, server_side_weights):
+    """
+    Test that hidden (weight < 1) documents are only read from MongoDB if requested.
+    """
+    monkeypatch.setattr(
+        NetdbSettings.__settings__, 'server_side_weights', server_side_weights
+    )
+
+    odm = ColumnODM(column_type='interface')
+
+    iter_documents = odm._iter_documents  # pylint: disable=W0212
+
+    assert all(document.weight >= 1 for document in iter_documents({}, False))
+    assert {
+        document.datasource for document in iter_documents({'datasource': 'mine'}, True)
+    } == {'mine'}
+
+    page, _ = odm.fetch_page({'datasource': 'mine'}, False)
+    assert not page
+
+
+def test_initialize_visible_index(mongo):
+    """
+    Test that initialize() creates the partial index on visible column documents.
+    """
+    initialize()
+
+    indexes = mongo[NetdbSettings.get_settings().db_name]['bgp'].index_information()
+
+    visible = [index for index in indexes.values() if index['key'] == VISIBLE_INDEX]
+
+    assert len(visible) == 1
+    assert visible[0]['partialFilterExpression'] == VISIBLE_FILTER
+    assert not visible[0].get('unique')
+
+
+def test_initialize_indexes(mongo, caplog):
+    """
+    Test that initialize() creates exactly the specified indexes, is idempotent and
+    logs its startup timings.
+    """
+    caplog.set_level('INFO', logger='util.initialize')
+
+    initialize()
+
+    settings = NetdbSettings.get_settings()
+    specs = index_specs()
+
+    for collection, changes in check_indexes(specs).items():
+        indexes = mongo[settings.db_name][collection].index_information()
+
+        assert set(indexes) - {'_id_'} == {spec.name for spec in specs[collection]}
+        assert changes == {'create': [], 'rebuild': [], 'unknown': []}
+
+    assert 'index_build' in caplog.messages[-1]
+    assert build_indexes(specs) == {}
+
+    caplog.clear()
+    initialize()
+
+    assert 'Created index' not in caplog.text
+    assert 'index_check' in caplog.messages[-1]
+    assert 'index_build' not in caplog.messages[-1]
+
+
+def test_initialize_read_only(mongo, monkeypatch):
+    """
+    Test that read only workers create the override index but no column indexes.
+    """
+    monkeypatch.setattr(NetdbSettings, '__settings__', NetdbSettings.__settings__)
+    monkeypatch.setenv('READ_ONLY', 'true')
+
+    initialize()
+
+    settings = NetdbSettings.get_settings()
+    overrides = mongo[settings.db_name][settings.override_table].index_information()
+
+    assert settings.read_only
+    assert [index['key'] for index in overrides.values()] == [
+        [('_id', 1)],
+        OVERRIDE_INDEX,
+    ]
+    assert set(mongo[settings.db_name]['bgp'].index_information()) <= {'_id_'}
+
+
+def test_build_indexes(mongo, monkeypatch):
+    """
+    Test that indexes with outdated options are only rebuilt (under another name)
+    when enabled, and that unknown ones are reported.
+    """
+    collection = mongo[NetdbSettings.get_settings().db_name]['bgp']
+
+    collection.create_index(DEFAULT_INDEX)
+    collection.create_index([('weight', 1)])
+
+    specs = [
+        IndexSpec(keys=DEFAULT_INDEX, unique=True),
+        IndexSpec(keys=VISIBLE_INDEX, partial=VISIBLE_FILTER),
+    ]
+
+    assert index_changes('bgp', specs) == {
+        'create': [specs[1]],
+        'rebuild': [specs[0]],
+        'unknown': ['weight_1'],
+    }
+    assert build_indexes({'bgp': specs}) == {
+        'bgp': {'created': [specs[1].name], 'rebuilt': []}
+    }
+    assert not collection.index_information()[specs[0].name].get('unique')
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'index_rebuilds', True)
+
+    assert build_indexes({'bgp': specs}) == {
+        'bgp': {'created': [], 'rebuilt': [specs[0].name]}
+    }
+
+    indexes = collection.index_information()
+
+    assert specs[0].name not in indexes
+    assert indexes[f'{specs[0].name}_rebuilt']['unique']
+    assert index_changes('bgp', specs) == {
+        'create': [],
+        'rebuild': [],
+        'unknown': ['weight_1'],
+    }
+
+
+def test_build_indexes_conflict(mongo, monkeypatch, caplog):
+    """
+    Test that an outdated index MongoDB refuses to rebuild next to itself is kept.
+    """
+    collection = mongo[NetdbSettings.get_settings().db_name]['bgp']
+    collection.create_index(DEFAULT_INDEX)
+
+    specs = [IndexSpec(keys=DEFAULT_INDEX, unique=True)]
+
+    def conflicting(self, index, unique=True, partial=None, name=None):
+        raise OperationFailure('index options conflict', code=85)
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'index_rebuilds', True)
+    monkeypatch.setattr(MongoAPI, 'create_index', conflicting)
+
+    assert build_indexes({'bgp': specs}) == {}
+    assert specs[0].name in collection.index_information()
+    assert 'cannot be built next to the outdated index' in caplog.text
+
+
+def test_index_lock(mongo):
+    """
+    Test that a lock is only held by one owner at a time until released or expired.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, settings.revision_table)
+
+    assert api.acquire_lock('lock', 'a', 60)
+    assert not api.acquire_lock('lock', 'b', 60)
+    assert api.acquire_lock('lock', 'a', 60)
+    assert not api.release_lock('lock', 'b')
+    assert api.release_lock('lock', 'a')
+    assert api.acquire_lock('lock', 'b', -1)
+    assert api.acquire_lock('lock', 'a', 60)
+
+    assert api.read_revision('lock').revision == 0
+
+
+def test_build_indexes_locked(mongo, caplog):
+    """
+    Test that workers do not build indexes while another worker holds the lock.
+    """
+    caplog.set_level('INFO', logger='util.initialize')
+
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, settings.revision_table)
+
+    assert api.acquire_lock(INDEX_LOCK, 'other', 60)
+
+    initialize()
+
+    assert 'being built by another worker' in caplog.text
+    assert set(mongo[settings.db_name]['bgp'].index_information()) <= {'_id_'}
+
+    api.release_lock(INDEX_LOCK, 'other')
+    initialize()
+
+    assert set(mongo[settings.db_name]['bgp'].index_information()) - {'_id_'}
+
+
+def test_plan_indexes():
+    """
+    Test that plan_indexes() returns the indexes scanned by a winning plan.
+    """
+    explain = {
+        'queryPlanner': {
+            'winningPlan': {
+                'stage': 'PROJECTION_SIMPLE',
+                'inputStage': {
+                    'stage': 'FETCH',
+                    'inputStage': {'stage': 'IXSCAN', 'indexName': 'visible'},
+                },
+            },
+            'rejectedPlans': [
+                {'stage': 'FETCH', 'inputStage': {'indexName': 'default'}},
+            ],
+        }
+    }
+
+    assert plan_indexes(explain) == ['visible']
+    assert not plan_indexes({'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}})
+
+
+def test_explain_query_shapes_visible(monkeypatch):
+    """
+    Test that query shapes are explained as the queries of visible column reads.
+    """
+    queries = []
+
+    def explain(self, query=None, sort=None):
+        queries.append(query)
+        return {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+
+    monkeypatch.setattr(MongoAPI, 'explain', explain)
+
+    plans = explain_query_shapes('device')
+
+    assert list(plans) == ['datasource', 'set_id', 'datasource,set_id']
+    assert queries == [
+        {'datasource': 'datasource', **VISIBLE_FILTER},
+        {'set_id': 'set_id', **VISIBLE_FILTER},
+        {'datasource': 'datasource', 'set_id': 'set_id', **VISIBLE_FILTER},
+    ]
+
+
+@pytest.mark.skipif(
+    not os.environ.get('NETDB_TEST_MONGO_URL'),
+    reason='needs a MongoDB server (NETDB_TEST_MONGO_URL), mongomock cannot explain',
+)
+def test_visible_index_explain(monkeypatch):
+    """
+    Test against a MongoDB server that reads of visible documents use the partial
+    index on visible documents rather than scanning hidden ones.
+    """
+    client: pymongo.MongoClient = pymongo.MongoClient(
+        os.environ['NETDB_TEST_MONGO_URL']
+    )
+    monkeypatch.setattr(MongoClientRegistry, 'get_client', lambda *args: client)
+
+    client.drop_database('netdb_test')
+
+    try:
+        documents = []
+        for document in interface.mock_standard_interface_documents():
+            documents += [document] + [
+                _shadow(document, f'mine{count}', 0) for count in range(10)
+            ]
+
+        api = MongoAPI('netdb_test', 'interface')
+        api.collection.insert_many([document.model_dump() for document in documents])
+
+        api.create_index(DEFAULT_INDEX)
+        api.create_index(VISIBLE_INDEX, unique=False, partial=VISIBLE_FILTER)
+
+        name = '_'.join(f'{key}_{direction}' for key, direction in VISIBLE_INDEX)
+
+        query = visible_query({'set_id': 'ROUTER1'}, False)
+
+        assert plan_indexes(api.explain(query)) == [name]
+        assert plan_indexes(api.explain(VISIBLE_FILTER, sort=['set_id'])) == [name]
+        assert name not in plan_indexes(api.explain({'set_id': 'ROUTER1'}))
+    finally:
+        client.drop_database('netdb_test')
+
+
+@pytest.mark.skipif(
+    not os.environ.get('NETDB_TEST_MONGO_URL'),
+    reason='needs a MongoDB server (NETDB_TEST_MONGO_URL), mongomock cannot explain',
+)
+def test_read_set_ids_sorted_explain(monkeypatch):
+    """
+    Test against a MongoDB server that set_id pages are read from an index rather
+    than by a collection scan.
+    """
+    client: pymongo.MongoClient = pymongo.MongoClient(
+        os.environ['NETDB_TEST_MONGO_URL']
+    )
+    monkeypatch.setattr(MongoClientRegistry, 'get_client', lambda *args: client)
+
+    client.drop_database('netdb_test')
+
+    try:
+        api = MongoAPI('netdb_test', 'interface')
+        api.collection.insert_many([document.model_dump() for document in _routers(20)])
+
+        api.create_index(DEFAULT_INDEX)
+        api.create_index(VISIBLE_INDEX, unique=False, partial=VISIBLE_FILTER)
+
+        explain = client['netdb_test'].command(
+            'aggregate',
+            'interface',
+            pipeline=_set_ids_pipeline(
+                visible_query({'set_id': {'$gt': 'ROUTER1'}}, False), 5
+            ),
+            explain=True,
+        )
+
+        assert 'COLLSCAN' not in str(explain)
+        assert 'indexName' in str(explain)
+        assert api.read_set_ids_sorted(visible_query({}, False), 3) == [
+            'ROUTER1',
+            'ROUTER10',
+            'ROUTER11',
+        ]
+    finally:
+        client.drop_database('netdb_test')
+
+
+@pytest.fixture
+def swap(mongo, monkeypatch):
+    """
+    Enable swap reloads on the mongomock client. mongomock does not implement the
+    $merge aggregation stage, which is emulated (insert into the target collection).
+    """
+    initialize()
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_reloads', True)
+
+    aggregate = mongomock.collection.Collection.aggregate
+
+    def merging(self, pipeline, *args, **kwargs):
+        if not pipeline or '$merge' not in pipeline[-1]:
+            return aggregate(self, pipeline, *args, **kwargs)
+
+        into = self.database[pipeline[-1]['$merge']['into']]
+        if documents := list(aggregate(self, pipeline[:-1], *args, **kwargs)):
+            into.insert_many(documents)
+
+        return iter([])
+
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate', merging)
+
+    return mongo[NetdbSettings.get_settings().db_name]
+
+
+def _staging(database) -> list:
+    """
+    Return the interface staging collections left in the database.
+    """
+    return [
+        name
+        for name in database.list_collection_names()
+        if name.startswith('interface.staging')
+    ]
+
+
+def test_reload_swap(swap):
+    """
+    Test that swap reloads replace the documents matching the filter only and keep
+    the collection indexes.
+    """
+    settings = NetdbSettings.get_settings()
+    indexes = swap['interface'].index_information()
+    others = swap['interface'].count_documents({'datasource': {'$ne': 'netbox'}})
+
+    documents = [
+        document.model_copy(update={'set_id': 'ROUTER2'})
+        for document in interface.mock_standard_interface_documents()
+    ]
+
+    assert MongoAPI(settings.db_name, 'interface').reload(
+        documents, {'datasource': 'netbox'}
+    )
+
+    assert swap['interface'].distinct('set_id', {'datasource': 'netbox'}) == ['ROUTER2']
+    assert swap['interface'].count_documents({'datasource': 'netbox'}) == len(documents)
+    assert swap['interface'].count_documents({'datasource': {'$ne': 'netbox'}}) == (
+        others
+    )
+    assert swap['interface'].index_information() == indexes
+    assert not _staging(swap)
+    assert swap[settings.revision_table].count_documents({}) == 0
+
+
+def test_reload_swap_fail(swap):
+    """
+    Test that a failed swap reload leaves the collection as it was.
+    """
+    settings = NetdbSettings.get_settings()
+    stored = list(swap['interface'].find({}, {'_id': False}, sort=DEFAULT_INDEX))
+
+    documents = interface.mock_standard_interface_documents()
+
+    with pytest.raises(NetDBException) as e:
+        MongoAPI(settings.db_name, 'interface').reload(
+            documents + documents, {'datasource': 'netbox'}
+        )
+
+    assert isinstance(e.value.__cause__, BulkWriteError)
+
+    assert (
+        list(swap['interface'].find({}, {'_id': False}, sort=DEFAULT_INDEX)) == stored
+    )
+    assert not _staging(swap)
+    assert swap[settings.revision_table].count_documents({}) == 0
+
+
+def _routers(count: int) -> list:
+    """
+    Return the mocked interface documents of devices ROUTER1 to ROUTER<count>.
+    """
+    return [
+        document.model_copy(update={'set_id': f'ROUTER{i}'})
+        for i in range(1, count + 1)
+        for document in interface.mock_standard_interface_documents()
+    ]
+
+
+def test_reload_swap_concurrent_write(swap, monkeypatch):
+    """
+    Test that column writes wait for a swap in progress and then fail, that swap
+    reloads wait for the writes in progress and then fail, and that writes made while
+    the staging collection is loaded are kept.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, 'interface')
+    lock = MongoAPI(settings.db_name, settings.revision_table)
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_lock_wait', 0.2)
+
+    other = interface.mock_standard_interface_documents()[0].model_copy(
+        update={'datasource': 'other'}
+    )
+
+    # Writes while the staging collection is loaded neither wait nor are lost.
+    def documents():
+        assert api.insert_unordered([other])['inserted'] == 1
+        yield from _routers(2)
+
+    assert api.reload(documents(), {'datasource': 'netbox'})
+    assert swap['interface'].count_documents({'datasource': 'other'}) == 1
+
+    # A swap in progress holds the swap lock: writes wait for it and then fail.
+    assert lock.acquire_lock('lock.reload.interface', 'test', 60)
+
+    started = time.monotonic()
+    with pytest.raises(NetDBException) as e:
+        api.replace_many([other])
+
+    assert e.value.code == 409
+    assert time.monotonic() - started >= 0.2
+
+    with pytest.raises(NetDBException):
+        api.check_reload()
+
+    lock.release_lock('lock.reload.interface', 'test')
+
+    # A write in progress holds a write lock: swap reloads wait for it and then fail.
+    assert lock.acquire_lock('lock.write.interface.test', 'test', 60)
+
+    with pytest.raises(NetDBException) as e:
+        api.reload(_routers(3), {'datasource': 'netbox'})
+
+    assert e.value.code == 503
+    assert sorted(swap['interface'].distinct('set_id', {'datasource': 'netbox'})) == [
+        'ROUTER1',
+        'ROUTER2',
+    ]
+    assert not _staging(swap)
+
+    # Writes do not wait for one another.
+    assert api.replace_many([other])['matched'] == 1
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_lock_wait', 5)
+
+    reload = threading.Thread(
+        target=api.reload, args=(_routers(3), {'datasource': 'netbox'})
+    )
+    reload.start()
+    time.sleep(0.2)
+
+    assert reload.is_alive()
+
+    lock.release_lock('lock.write.interface.test', 'test')
+    reload.join(5)
+
+    assert not reload.is_alive()
+    assert swap['interface'].count_documents({'datasource': 'other'}) == 1
+    assert sorted(swap['interface'].distinct('set_id', {'datasource': 'netbox'})) == [
+        'ROUTER1',
+        'ROUTER2',
+        'ROUTER3',
+    ]
+    assert swap[settings.revision_table].count_documents({}) == 0
+
+
+def test_reload_swap_lock_expired(swap, monkeypatch):
+    """
+    Test that a swap reload whose lock expired while the surviving documents were
+    copied (letting a write through) fails rather than drop the write.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, 'interface')
+    revisions = swap[settings.revision_table]
+
+    other = interface.mock_standard_interface_documents()[0].model_copy(
+        update={'datasource': 'other'}
+    )
+    stored = swap['interface'].count_documents({})
+
+    aggregate = mongomock.collection.Collection.aggregate
+
+    def expiring(self, pipeline, *args, **kwargs):
+        result = aggregate(self, pipeline, *args, **kwargs)
+
+        if pipeline and '$merge' in pipeline[-1]:
+            revisions.update_one(
+                {'_id': 'lock.reload.interface'},
+                {'$set': {'expires': datetime(2000, 1, 1, tzinfo=timezone.utc)}},
+            )
+            assert api.insert_unordered([other])['inserted'] == 1
+
+        return result
+
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate', expiring)
+
+    with pytest.raises(NetDBException) as e:
+        api.reload(_routers(2), {'datasource': 'netbox'})
+
+    assert e.value.code == 503
+    assert swap['interface'].count_documents({}) == stored + 1
+    assert swap['interface'].count_documents({'datasource': 'other'}) == 1
+    assert not _staging(swap)
+    assert revisions.count_documents({}) == 0
+
+
+def test_swap_lock_renewed(mongo, monkeypatch):
+    """
+    Test that column write locks are renewed while held, that an expired lock is
+    not renewed, and that writes take no lock when transactions are enabled.
+    """
+    settings = NetdbSettings.get_settings()
+    api = MongoAPI(settings.db_name, 'interface')
+    lock = MongoAPI(settings.db_name, settings.revision_table)
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_reloads', True)
+    monkeypatch.setattr(NetdbSettings.__settings__, 'swap_lock_ttl', 1)
+
+    with api._column_write():  # pylint: disable=W0212
+        time.sleep(1.5)
+
+        assert lock.count_locks('lock.write.interface.') == 1
+
+    assert lock.count_locks('lock.write.interface.') == 0
+
+    assert lock.acquire_lock('lock', 'a', -1)
+    assert not lock.renew_lock('lock', 'a', 60)
+    assert lock.lock_owner('lock') is None
+    assert lock.release_lock('lock', 'a')
+
+    monkeypatch.setattr(NetdbSettings.__settings__, 'transactions', True)
+
+    assert lock.acquire_lock('lock.reload.interface', 'test', 60)
+
+    with api._column_write():  # pylint: disable=W0212
+        api.check_reload()
+
+    assert lock.release_lock('lock.reload.interface', 'test')
+
+
+@pytest.fixture
+def killed(monkeypatch):
+    """
+    Kill the first interface read cursor after it returned 10 documents, as renaming a
+    staging collection over the collection (see MongoAPI.reload_swap()) would. The
+    documents of ROUTER2 are replaced in the meantime.
+    """
+    find = mongomock.collection.Collection.find
+    cursors = []
+
+    def killing(self, *args, **kwargs):
+        cursor = find(self, *args, **kwargs)
+
+        # MongoAPI reads set a batch size, unlike the finds of mongomock itself.
+        if self.name != 'interface' or 'batch_size' not in kwargs or cursors:
+            return cursor
+
+        cursors.append(cursor)
+
+        def read():
+            yield from islice(cursor, 10)
+
+            self.update_many(
+                {'set_id': 'ROUTER2'}, {'$set': {'data.description': 'replaced'}}
+            )
+            raise OperationFailure('collection dropped', code=175)
+
+        return read()
+
+    monkeypatch.setattr(mongomock.collection.Collection, 'find', killing)
+
+    return cursors
+
+
+def test_iter_sets_resumed(mongo, killed):
+    """
+    Test that reads of sets whose cursor is killed are resumed after the last set
+    read, so that every set is read once and as a whole.
+    """
+    settings = NetdbSettings.get_settings()
+    collection = mongo[settings.db_name]['interface']
+
+    collection.delete_many({})
+    collection.insert_many([document.model_dump() for document in _routers(3)])
+
+    odm = ColumnODM(column_type='interface')
+    sets = list(odm.iter_sets(enable_overrides=False))
+
+    assert killed
+    assert [set_id for set_id, _ in sets] == ['ROUTER1', 'ROUTER2', 'ROUTER3']
+    assert {data['description'] for data in sets[1][1].values()} == {'replaced'}
+    assert dict(sets) == odm.fetch_column(enable_overrides=False)
+
+    killed.clear()
+    exported = list(MongoAPI(settings.db_name, 'interface').iter_raw())
+
+    assert killed
+    assert len(exported) == len(_routers(3))
+    assert len({(d['set_id'], d['element_id']) for d in exported}) == len(exported)
+
+    # Reads not asking for set_id order are resumed too.
+    killed.clear()
+    documents = MongoAPI(settings.db_name, 'interface').read_column()
+
+    assert killed
+    assert len(documents) == len(_routers(3))
+
+
+def test_read_retried():
+    """
+    Test that reads made at once are made again should their cursor be killed, up
+    to _CURSOR_RESUMES times.
+    """
+    attempts = []
+
+    def read():
+        attempts.append(None)
+
+        if len(attempts) < 3:
+            raise OperationFailure('cursor killed', code=237)
+
+        return ['ROUTER1']
+
+    assert _retried(read) == ['ROUTER1']
+    assert len(attempts) == 3
+
+    def failing():
+        attempts.append(None)
+        raise OperationFailure('cursor killed', code=237)
+
+    attempts.clear()
+    with pytest.raises(OperationFailure):
+        _retried(failing)
+
+    assert len(attempts) == _CURSOR_RESUMES + 1
+
+
+def test_reload_generation_fail(mongo, monkeypatch):
+    """
+    Test that a non atomic reload failing to generate its documents part way leaves
+    the collection as it was.
+    """
+    collection = mongo[NetdbSettings.get_settings().db_name]['interface']
+    stored = list(collection.find({}, {'_id': False}, sort=DEFAULT_INDEX))
+
+    odm = ColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    generate = odm._iter_netdb_documents  # pylint: disable=W0212
+
+    def failing():
+        yield from islice(generate(), 1)
+        raise ValueError('generation failed')
+
+    monkeypatch.setattr(odm, '_iter_netdb_documents', failing)
+
+    with pytest.raises(ValueError):
+        odm.reload()
+
+    assert list(collection.find({}, {'_id': False}, sort=DEFAULT_INDEX)) == stored
+
+
+class RecordingCollection:
+    """
+    Collection stand in recording the chunks inserted and the maximum number of
+    concurrent inserts.
+    """
+
+    def __init__(self):
+        self.chunks: list = []
+        self.sessions: set = set()
+        self.running = self.concurrency = 0
+        self.lock = threading.Lock()
+
+    def insert_many(self, documents, ordered=True, session=None):
+        """
+        Record an inserted chunk of documents.
+        """
+        with self.lock:
+            self.running += 1
+            self.concurrency = max(self.concurrency, self.running)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.running -= 1
+            self.chunks.append(documents)
+            self.sessions.add(session)
+
+        return pymongo.results.InsertManyResult([None] * len(documents), True)
+
+
+@pytest.mark.parametrize('session', [None, 'session'])
+def test_insert_chunked(monkeypatch, session):
+    """
+    Test that documents are inserted in chunks, concurrently unless in a session.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_chunk_size', 3)
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_concurrency', 4)
+
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'interface')
+    api.collection = RecordingCollection()
+
+    documents = interface.mock_standard_interface_documents() * 4
+
+    assert api.insert_chunked(iter(documents), session) == len(documents)
+
+    assert sorted(len(chunk) for chunk in api.collection.chunks) == [1] + [3] * 9
+    assert api.collection.sessions == {session}
+    assert api.collection.concurrency == (1 if session else 4)
+
+
+def test_insert_chunked_generated(swap, monkeypatch):
+    """
+    Test chunked (swap) reloads of column documents generated as they are written.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_chunk_size', 2)
+
+    odm = ColumnODM(
+        container=InterfaceContainer(
+            datasource='netbox',
+            weight=150,
+            column=interface.mock_standard_interface_data(),
+        )
+    )
+    odm.reload()
+
+    collection = swap['interface']
+
+    assert collection.count_documents({'datasource': 'netbox'}) == len(
+        interface.mock_standard_interface_documents()
+    )
+    assert odm._documents is None  # pylint: disable=W0212
+
+
+def test_insert_chunked_fail(mongo, monkeypatch):
+    """
+    Test that failed chunk inserts are raised.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_chunk_size', 2)
+
+    initialize()
+
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'interface')
+
+    with pytest.raises(NetDBException) as e:
+        api.insert_chunked(interface.mock_standard_interface_documents())
+
+    assert e.value.code == 500
+    assert e.value.out == {'inserted': 0}
+    assert isinstance(e.value.__cause__, BulkWriteError)
+
+
+class FailingCollection(RecordingCollection):
+    """
+    RecordingCollection whose second chunk insert fails.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def insert_many(self, documents, ordered=True, session=None):
+        """
+        Record an inserted chunk of documents, failing the second one.
+        """
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+
+        if calls == 2:
+            raise OperationFailure('insert failed')
+
+        return super().insert_many(documents, ordered, session)
+
+
+def test_insert_chunked_partial(monkeypatch):
+    """
+    Test that the chunks in flight when a chunk fails to insert are completed, that
+    no further chunk is inserted, and that the inserted documents are reported.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_chunk_size', 3)
+    monkeypatch.setattr(NetdbSettings.__settings__, 'insert_concurrency', 4)
+
+    api = MongoAPI(NetdbSettings.get_settings().db_name, 'interface')
+    api.collection = FailingCollection()
+
+    documents = interface.mock_standard_interface_documents() * 4
+
+    with pytest.raises(NetDBException) as e:
+        api.insert_chunked(iter(documents))
+
+    inserted = sum(len(chunk) for chunk in api.collection.chunks)
+
+    assert e.value.code == 500
+    assert e.value.out == {'inserted': inserted}
+    assert 0 < inserted < len(documents)
+    assert api.collection.running == 0
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from pymongo import ReadPreference
+
+from config.settings import NetdbSettings
+from util.mongo_client import MongoClientRegistry, PoolMetrics
+
+NetdbSettings.initialize()
+
+
+def test_registry_reuses_client():
+    """
+    Test that the registry hands out one pooled client per read preference.
+    """
+    try:
+        primary = MongoClientRegistry.get_client()
+        nearest = MongoClientRegistry.get_client(ReadPreference.NEAREST)
+
+        assert MongoClientRegistry.get_client() is primary
+        assert MongoClientRegistry.get_client(ReadPreference.NEAREST) is nearest
+        assert primary is not nearest
+        assert MongoClientRegistry.get_metrics()['clients'] == 2
+    finally:
+        MongoClientRegistry.close_all()
+
+    assert MongoClientRegistry.get_metrics()['clients'] == 0
+
+
+def test_registry_pool_settings():
+    """
+    Test that pool settings are passed through to the pooled client.
+    """
+    settings = NetdbSettings.get_settings()
+
+    try:
+        options = MongoClientRegistry.get_client().options.pool_options
+
+        assert options.max_pool_size == settings.mongo_max_pool_size
+        assert options.min_pool_size == settings.mongo_min_pool_size
+    finally:
+        MongoClientRegistry.close_all()
+
+
+def test_pool_metrics():
+    """
+    Test connection pool checkout / wait accounting.
+    """
+    metrics = PoolMetrics()
+    event = SimpleNamespace(reason='timeout')
+
+    metrics.connection_created(event)
+    metrics.connection_check_out_started(event)
+    metrics.connection_checked_out(event)
+    metrics.connection_check_out_started(event)
+    metrics.connection_check_out_failed(event)
+    metrics.connection_checked_in(event)
+
+    out = metrics.as_dict()
+
+    assert out['connections_open'] == 1
+    assert out['checkouts'] == 1
+    assert out['checked_out'] == 0
+    assert out['checkout_failures'] == {'timeout': 1}
+    assert out['wait_time_max_ms'] >= 0.0
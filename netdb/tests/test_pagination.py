@@ -0,0 +1,80 @@
+import pytest
+
+from config.settings import NetdbSettings
+from util.exception import NetDBException
+from util.pagination import (
+    encode_cursor,
+    decode_cursor,
+    page_limit,
+    after_key,
+    set_id_range,
+)
+
+NetdbSettings.initialize()
+
+
+@pytest.mark.parametrize(
+    'values', [['ROUTER1'], ['bgp', 'ROUTER1', None, 'ipv4', 'ü'], [None]]
+)
+def test_cursor(values):
+    """
+    Test that cursors round trip and are URL safe.
+    """
+    cursor = encode_cursor(values)
+
+    assert decode_cursor(cursor, len(values)) == values
+    assert cursor.replace('=', '').replace('-', '').replace('_', '').isalnum()
+
+
+@pytest.mark.parametrize(
+    'cursor, size',
+    [('garbage', 1), (encode_cursor(['a']), 2), ('WzFd', 1), ('', 1)],
+)
+def test_cursor_invalid(cursor, size):
+    """
+    Test that invalid cursors are rejected.
+    """
+    with pytest.raises(NetDBException) as e:
+        decode_cursor(cursor, size)
+
+    assert e.value.code == 422
+
+
+def test_page_limit(monkeypatch):
+    """
+    Test that page sizes default to and are capped at the `page_max_limit' setting.
+    """
+    monkeypatch.setattr(NetdbSettings.__settings__, 'page_max_limit', 50)
+
+    assert page_limit(None) == 50
+    assert page_limit(10) == 10
+    assert page_limit(100) == 50
+
+
+def test_after_key():
+    """
+    Test the index range filter continuing after a compound index key.
+    """
+    assert after_key(['a', 'b', 'c'], ['x', None, 'z']) == {
+        '$or': [
+            {'a': {'$gt': 'x'}},
+            {'a': 'x', 'b': {'$ne': None}},
+            {'a': 'x', 'b': None, 'c': {'$gt': 'z'}},
+        ]
+    }
+
+
+@pytest.mark.parametrize(
+    'filt, after, last, result',
+    [
+        ({}, None, None, {}),
+        ({'datasource': 'x'}, 'R1', None, {'datasource': 'x', 'set_id': {'$gt': 'R1'}}),
+        ({}, 'R1', 'R3', {'set_id': {'$gt': 'R1', '$lte': 'R3'}}),
+        ({'set_id': 'R2'}, None, 'R2', {'set_id': {'$eq': 'R2', '$lte': 'R2'}}),
+    ],
+)
+def test_set_id_range(filt, after, last, result):
+    """
+    Test set_id range filters for column pages.
+    """
+    assert set_id_range(filt, after, last) == result
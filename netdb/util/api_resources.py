@@ -1,7 +1,34 @@
 import json
-from typing import Union, Any
-from pydantic import BaseModel
-from starlette.responses import Response
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime
+from typing import (
+    Union,
+    Any,
+    Optional,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from beartype.typing import List
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from models.types import RevisionDocument, schema_version
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None  # type: ignore
+
+try:
+    import cbor2  # type: ignore
+except ImportError:
+    cbor2 = None  # type: ignore
 
 DESCRIPTION = """
 Version 2 of the NetDB API. 🚀
@@ -32,6 +59,10 @@ tags = [
         "name": "override",
         "description": "endpoints and methods for querying and manipulating overrides",
     },
+    {
+        "name": "export",
+        "description": "export and import raw column and override documents as NDJSON",
+    },
 ]
 
 ERR_READONLY = {
@@ -58,6 +89,116 @@ class NetDBReturn(BaseModel):
     comment: Union[str, None] = None
 
 
+class DeviceBatchRequest(BaseModel):
+    """
+    Request body of the batch device endpoint.
+
+    """
+
+    set_ids: List[str] = Field(min_length=1)
+    column: Optional[List[str]] = None
+    show_hidden: bool = False
+
+
+def _netdb_return_head(comment: str) -> bytes:
+    """
+    Return the compact JSON encoding of a successful NetDBReturn up to and including
+    the opening brace of its `out' dict.
+
+    """
+    head = NetDBReturn(comment=comment).model_dump(exclude={'out'})
+
+    return to_json(head)[:-1] + b',"out":{'
+
+
+def _netdb_return_item(count: int, key: str, value: Any) -> bytes:
+    """
+    Return the compact JSON encoding of the count-th key / value pair of `out'.
+
+    """
+    return (b',' if count else b'') + to_json(key) + b':' + to_json(value)
+
+
+def iter_netdb_return(
+    out: Union[dict, Iterable[tuple[str, Any]]], comment: str
+) -> Iterator[bytes]:
+    """
+    Encode a successful NetDBReturn with a dict `out' as compact JSON, yielding one
+    chunk per key of out so that large returns can be streamed to the consumer.
+
+    out:
+        The return data (e.g. sets keyed by set_id), or an iterator over its key /
+        value pairs (e.g. ColumnODM.iter_sets())
+
+    comment:
+        The return comment
+
+    """
+    yield _netdb_return_head(comment)
+
+    items = out.items() if isinstance(out, dict) else out
+
+    for count, (key, value) in enumerate(items):
+        yield _netdb_return_item(count, key, value)
+
+    yield b'}}'
+
+
+async def aiter_netdb_return(
+    out: AsyncIterable[tuple[str, Any]], comment: str
+) -> AsyncIterator[bytes]:
+    """
+    Async version of iter_netdb_return() for an async iterator over the key / value
+    pairs of `out' (e.g. AsyncColumnODM.iter_sets()).
+
+    """
+    yield _netdb_return_head(comment)
+
+    count = 0
+    async for key, value in out:
+        yield _netdb_return_item(count, key, value)
+        count += 1
+
+    yield b'}}'
+
+
+async def aiter_line_chunks(
+    stream: AsyncIterable[bytes], size: int
+) -> AsyncIterator[List[bytes]]:
+    """
+    Split a byte stream (e.g. an NDJSON request body) into lines, yielding them in
+    chunks of up to size lines. Only the current chunk is held in memory.
+
+    stream:
+        The byte stream (e.g. Request.stream())
+
+    size:
+        Maximum number of lines per chunk
+
+    """
+    tail = b''
+    lines: List[bytes] = []
+
+    async for data in stream:
+        *complete, tail = (tail + data).split(b'\n')
+        lines.extend(complete)
+
+        if len(lines) < size:
+            continue
+
+        full = len(lines) - len(lines) % size
+        for start in range(0, full, size):
+            yield lines[start : start + size]
+
+        lines = lines[full:]
+
+    if tail:
+        lines.append(tail)
+
+    if lines:
+        yield lines
+
+
 def generate_filter(*args, **kwargs) -> dict:
     """
     A helper function to create MongoDB compatible query filters. Filters for
@@ -87,6 +228,98 @@ def generate_filter(*args, **kwargs) -> dict:
     return ret
 
 
+def parse_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Return the element data fields of a `fields' query parameter, which may be given
+    more than once and / or as a comma separated list (e.g. `fields=type,address').
+
+    fields:
+        The query parameter values, if any
+
+    """
+    if not fields:
+        return None
+
+    return [field.strip() for value in fields for field in value.split(',')]
+
+
+def column_validators(
+    revision: RevisionDocument,
+    filt: dict,
+    show_hidden: bool = False,
+    media_type: str = 'application/json',
+    pretty: bool = False,
+) -> dict:
+    """
+    Return the ETag and (if known) Last-Modified headers for a column query. The
+    strong ETag is derived from the column revision (which is bumped by every column
+    or override write), the query itself, the column schema version and the response
+    representation, so it changes whenever the response body can.
+
+    revision:
+        Column revision read before any column documents were read
+
+    filt:
+        Column query filter as returned by generate_filter()
+
+    show_hidden: ``False``
+        Whether elements with weight < 1 are included
+
+    media_type: ``application/json``
+        Media type of the response as returned by negotiate_media_type()
+
+    pretty: ``False``
+        Whether the response holds indented JSON. Ignored for other media types.
+
+    """
+    digest = hashlib.sha256(
+        json.dumps(
+            [
+                revision.column_type,
+                revision.revision,
+                revision.updated,
+                sorted(filt.items()),
+                show_hidden,
+                schema_version(revision.column_type),
+                media_type,
+                pretty and media_type == 'application/json',
+            ],
+            default=str,
+        ).encode('utf-8')
+    ).hexdigest()[:16]
+
+    headers = {'ETag': f'"{revision.column_type}-{revision.revision}-{digest}"'}
+
+    if updated := revision.updated:
+        # MongoDB returns naive UTC datetimes
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+
+        headers['Last-Modified'] = format_datetime(updated, usegmt=True)
+
+    return headers
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Return true if an If-None-Match request header matches etag. Uses the weak
+    comparison required for If-None-Match (RFC 9110 13.1.2).
+
+    if_none_match:
+        The If-None-Match request header, if any
+
+    etag:
+        The current ETag of the resource
+
+    """
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+
+    return '*' in tags or etag.removeprefix('W/') in tags
+
+
 class PrettyJSONResponse(Response):
     """
     Class to implement a FastAPI Response. Used to return a 'prettified' JSON
@@ -108,3 +341,183 @@ class PrettyJSONResponse(Response):
             indent=2,
             separators=(", ", ": "),
         ).encode("utf-8")
+
+
+class NetDBJSONResponse(Response):
+    """
+    Class to implement a FastAPI Response. Used to return compact JSON rendered
+    directly to bytes by the pydantic-core (Rust) serializer.
+
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Implements FastAPI Response.render(). Returns compact JSON output.
+
+        """
+        return to_json(content)
+
+
+class MsgPackResponse(Response):
+    """
+    Class to implement a FastAPI Response. Used to return MessagePack encoded
+    content. Requires the (optional) msgpack package.
+
+    """
+
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Implements FastAPI Response.render(). Returns MessagePack output.
+
+        """
+        return msgpack.packb(content, use_bin_type=True)
+
+
+class CBORResponse(Response):
+    """
+    Class to implement a FastAPI Response. Used to return CBOR encoded content.
+    Requires the (optional) cbor2 package.
+
+    """
+
+    media_type = "application/cbor"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Implements FastAPI Response.render(). Returns CBOR output.
+
+        """
+        return cbor2.dumps(content)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Class to implement a FastAPI Response. Used to stream a response while the
+    request body is still being read (e.g. progress of a streamed import).
+
+    StreamingResponse consumes the request messages to watch for disconnects, which
+    would swallow the unread parts of the request body. This response leaves them to
+    the endpoint instead: a disconnect surfaces as ClientDisconnect when reading the
+    body.
+
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Implements the ASGI application. Streams the response without listening for
+        disconnects.
+
+        """
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+# Media types offered by netdb_response() in order of preference. MessagePack and
+# CBOR are only offered if the msgpack and cbor2 packages are installed.
+MEDIA_TYPES = (
+    ['application/json']
+    + (['application/msgpack', 'application/x-msgpack'] if msgpack is not None else [])
+    + (['application/cbor'] if cbor2 is not None else [])
+)
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Return the offered media type with the highest quality according to an Accept
+    request header (RFC 9110 12.5.1). Falls back to JSON if none is acceptable.
+
+    accept:
+        The Accept request header, if any
+
+    """
+    if not accept:
+        return 'application/json'
+
+    weights = {}
+    for item in accept.split(','):
+        media_range, *params = item.split(';')
+
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+
+        weights[media_range.strip().lower()] = weight
+
+    best, best_weight = 'application/json', 0.0
+    for media_type in MEDIA_TYPES:
+        weight = weights.get(
+            media_type,
+            weights.get(
+                media_type.split('/', maxsplit=1)[0] + '/*', weights.get('*/*', 0.0)
+            ),
+        )
+
+        if weight > best_weight:
+            best, best_weight = media_type, weight
+
+    return best
+
+
+def netdb_response(
+    out: Union[dict, list, None],
+    comment: str,
+    pretty: bool = False,
+    headers: Optional[Mapping[str, str]] = None,
+    media_type: str = 'application/json',
+) -> Response:
+    """
+    Return a successful NetDBReturn as a ready made response. Returning a response
+    skips FastAPI's revalidation and encoding of the (already validated) return data
+    against the NetDBReturn response model.
+
+    out:
+        The return data
+
+    comment:
+        The return comment
+
+    pretty: ``False``
+        Return indented JSON (PrettyJSONResponse) instead of compact JSON
+
+    headers: ``None``
+        Additional response headers (e.g. ETag)
+
+    media_type: ``application/json``
+        Media type as returned by negotiate_media_type(). MessagePack and CBOR
+        responses hold the same NetDBReturn structure as JSON responses.
+
+    """
+    headers = {**(headers or {}), 'Vary': 'Accept'}
+
+    if media_type in ['application/msgpack', 'application/x-msgpack']:
+        return MsgPackResponse(
+            content={'result': True, 'error': False, 'out': out, 'comment': comment},
+            headers=headers,
+            media_type=media_type,
+        )
+
+    if media_type == 'application/cbor':
+        return CBORResponse(
+            content={'result': True, 'error': False, 'out': out, 'comment': comment},
+            headers=headers,
+        )
+
+    content = NetDBReturn.model_construct(
+        result=True, error=False, out=out, comment=comment
+    )
+
+    if pretty:
+        return PrettyJSONResponse(content=content.model_dump(), headers=headers)
+
+    return NetDBJSONResponse(content=content, headers=headers)
@@ -0,0 +1,282 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from starlette.requests import Request
+from starlette.responses import Response
+
+from config.settings import NetdbSettings
+from util.api_resources import etag_matches, negotiate_media_type
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None  # type: ignore
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None  # type: ignore
+
+
+# Supported content codings in order of preference. zstd and br are only offered if
+# the (optional) zstandard and brotli packages are installed.
+ENCODERS: 'OrderedDict[str, Callable[[bytes], bytes]]' = OrderedDict()
+
+if zstandard is not None:
+    ENCODERS['zstd'] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+
+if brotli is not None:
+    ENCODERS['br'] = lambda body: brotli.compress(body, quality=4)
+
+ENCODERS['gzip'] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Return the preferred supported content coding acceptable according to an
+    Accept-Encoding request header (RFC 9110 12.5.3), or None for identity.
+
+    accept_encoding:
+        The Accept-Encoding request header, if any
+
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[coding.strip().lower()] = weight
+
+    for encoding in ENCODERS:
+        if weights.get(encoding, weights.get('*', 0.0)) > 0:
+            return encoding
+
+    return None
+
+
+CacheKey = tuple[str, str, bool, str]
+
+
+class CompressedResponseCache:
+    """
+    Process wide, size bounded LRU cache of compressed column response bodies.
+
+    Entries are keyed by (ETag, media type, pretty, content coding). Column ETags
+    change with every column revision, filter and hidden element setting, so entries
+    never go stale and are simply evicted once no longer requested.
+
+    """
+
+    __entries__: 'OrderedDict[CacheKey, bytes]' = OrderedDict()
+
+    __lock__ = threading.Lock()
+
+    @classmethod
+    def get(cls, key: CacheKey) -> Optional[bytes]:
+        """
+        Return the cached compressed body for key, if any.
+
+        key:
+            (ETag, media type, pretty, content coding)
+
+        """
+        with cls.__lock__:
+            body = cls.__entries__.get(key)
+
+            if body is not None:
+                cls.__entries__.move_to_end(key)
+
+            return body
+
+    @classmethod
+    def put(cls, key: CacheKey, body: bytes) -> None:
+        """
+        Store a compressed body, evicting the least recently used entries beyond the
+        `compress_cache_size' setting.
+
+        key:
+            (ETag, media type, pretty, content coding)
+
+        body:
+            The compressed response body
+
+        """
+        size = NetdbSettings.get_settings().compress_cache_size
+
+        with cls.__lock__:
+            cls.__entries__[key] = body
+            cls.__entries__.move_to_end(key)
+
+            while len(cls.__entries__) > size:
+                cls.__entries__.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Drop all cached entries.
+
+        """
+        with cls.__lock__:
+            cls.__entries__.clear()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Return the ETag of the encoded variant of the representation tagged etag. The
+    content coding is appended to the opaque tag (e.g. `"bgp-3-1f2e-gzip"'), so
+    identity and encoded variants never match under strong comparison.
+
+    etag:
+        ETag of the identity representation
+
+    encoding:
+        The content coding (e.g. `gzip')
+
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _encoded_headers(headers: dict, encoding: str) -> dict:
+    """
+    Return response headers for an encoded representation, tagged by encoded_etag().
+
+    """
+    headers = {**headers, 'Content-Encoding': encoding}
+
+    if etag := headers.get('ETag'):
+        headers['ETag'] = encoded_etag(etag, encoding)
+
+    return headers
+
+
+def not_modified(request: Request, headers: dict) -> Optional[Response]:
+    """
+    Return a 304 response if the request's If-None-Match matches the ETag in headers
+    or, with compression enabled, its encoded variant for the content coding
+    preferred by the request's Accept-Encoding. Returns None otherwise.
+
+    request:
+        The HTTP request context
+
+    headers:
+        The column validators (see column_validators())
+
+    """
+    if_none_match = request.headers.get('if-none-match')
+    etags = [headers['ETag']]
+
+    if NetdbSettings.get_settings().compress_min_size and (
+        encoding := negotiate_encoding(request.headers.get('accept-encoding'))
+    ):
+        etags.append(encoded_etag(headers['ETag'], encoding))
+
+    for etag in etags:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={**headers, 'ETag': etag})
+
+    return None
+
+
+def cached_response(
+    request: Request, headers: dict, pretty: bool = False
+) -> Optional[Response]:
+    """
+    Return a response with a cached compressed body matching the request's Accept
+    and Accept-Encoding and the ETag in headers, if any.
+
+    request:
+        The HTTP request context
+
+    headers:
+        The column validators (see column_validators())
+
+    pretty: ``False``
+        Whether the request asked for indented JSON
+
+    """
+    settings = NetdbSettings.get_settings()
+
+    if not settings.compress_min_size or not settings.compress_cache_size:
+        return None
+
+    if not (encoding := negotiate_encoding(request.headers.get('accept-encoding'))):
+        return None
+
+    media_type = negotiate_media_type(request.headers.get('accept'))
+
+    body = CompressedResponseCache.get((headers['ETag'], media_type, pretty, encoding))
+    if body is None:
+        return None
+
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={
+            **_encoded_headers(headers, encoding),
+            'Vary': 'Accept, Accept-Encoding',
+        },
+    )
+
+
+def compress_response(
+    request: Request, response: Response, pretty: bool = False, cache: bool = True
+) -> Response:
+    """
+    Compress the body of a rendered response with the content coding preferred by
+    the request's Accept-Encoding if it is at least `compress_min_size' bytes. If the
+    response carries an ETag the compressed body is cached for cached_response().
+
+    request:
+        The HTTP request context
+
+    response:
+        A rendered (i.e. not streaming) response
+
+    pretty: ``False``
+        Whether the response holds indented JSON
+
+    cache: ``True``
+        Cache the compressed body. Disable for responses whose headers are not all
+        restored by cached_response() (e.g. column pages).
+
+    """
+    settings = NetdbSettings.get_settings()
+
+    if not settings.compress_min_size:
+        return response
+
+    if vary := response.headers.get('vary'):
+        response.headers['Vary'] = f'{vary}, Accept-Encoding'
+    else:
+        response.headers['Vary'] = 'Accept-Encoding'
+
+    if len(response.body) < settings.compress_min_size:
+        return response
+
+    if not (encoding := negotiate_encoding(request.headers.get('accept-encoding'))):
+        return response
+
+    etag = response.headers.get('etag')
+    body = ENCODERS[encoding](bytes(response.body))
+
+    if cache and etag and settings.compress_cache_size:
+        CompressedResponseCache.put(
+            (etag, str(response.media_type), pretty, encoding), body
+        )
+
+    response.body = body
+    response.headers['Content-Length'] = str(len(body))
+    response.headers.update(_encoded_headers({'ETag': etag} if etag else {}, encoding))
+
+    return response
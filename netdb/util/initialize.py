@@ -1,13 +1,25 @@
+import os
+import time
+import uuid
+import socket
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Any, Optional
+from beartype.typing import Iterator, List
+from pydantic import BaseModel, ConfigDict
+from pymongo.errors import OperationFailure
 
 from config.settings import NetdbSettings
-from models.types import COLUMN_TYPES
+from models.types import COLUMN_FACTORY, COLUMN_TYPES, VISIBLE_FILTER, visible_query
+from .api_resources import generate_filter
 from .mongo_api import MongoAPI
 
 logger = logging.getLogger(__name__)
 
 # Column default index. We're currently using default for all column types
-# as mongodb will allow / ignore non-existent keys when indexing.
+# as mongodb will allow / ignore non-existent keys when indexing. Serves all queries
+# filtering by set_id.
 DEFAULT_INDEX = [
     ('set_id', 1),
     ('category', 1),
@@ -16,6 +28,42 @@ DEFAULT_INDEX = [
     ('datasource', 1),
 ]
 
+# Non unique partial index on visible column documents only, used by reads of visible
+# documents (see models.types.visible_query()). Hidden documents, which may outnumber
+# visible ones, are not indexed and never read by such reads.
+VISIBLE_INDEX = DEFAULT_INDEX + [
+    ('weight', 1),
+]
+
+# Non unique index serving queries filtering by datasource but not by set_id (e.g.
+# reload deletes and `DELETE /column?datasource=')
+DATASOURCE_INDEX = [
+    ('datasource', 1),
+    ('category', 1),
+    ('family', 1),
+    ('element_id', 1),
+]
+
+# Non unique index serving queries filtering by category but not by set_id or
+# datasource. Only used by column types with categories.
+CATEGORY_INDEX = [
+    ('category', 1),
+    ('family', 1),
+    ('element_id', 1),
+]
+
+# Non unique index serving queries filtering by element_id only (e.g. an interface
+# across all devices). Not used by flat column types.
+ELEMENT_INDEX = [
+    ('element_id', 1),
+    ('set_id', 1),
+]
+
+# Non unique index on document content hashes (see models.types.content_hash)
+CONTENT_HASH_INDEX = [
+    ('content_hash', 1),
+]
+
 # Index used for overrides in override table
 OVERRIDE_INDEX = [
     ('column_type', 1),
@@ -25,13 +73,384 @@ OVERRIDE_INDEX = [
     ('element_id', 1),
 ]
 
+# MongoDB error codes of indexes conflicting with an existing index of the same keys
+# (IndexOptionsConflict, IndexKeySpecsConflict)
+_INDEX_CONFLICTS = {85, 86}
+
+# Name of the lock document (held in the revision collection) taken by the worker
+# building indexes at startup.
+INDEX_LOCK = 'lock.indexes'
+
+# Number of concurrent index builds. MongoDB runs up to 3 user index builds at a
+# time by default (maxNumActiveUserIndexBuilds) and queues the rest.
+INDEX_BUILD_WORKERS = 3
+
+
+class IndexSpec(BaseModel):
+    """
+    Declarative specification of a MongoDB collection index.
+
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    keys: List[tuple[str, int]]
+    unique: bool = False
+    partial: Optional[dict] = None
+
+    @property
+    def name(self) -> str:
+        """
+        Return the index name, as generated by MongoDB for the index keys.
+
+        """
+        return '_'.join(f'{key}_{direction}' for key, direction in self.keys)
+
+    def matches(self, info: dict) -> bool:
+        """
+        Return true if an existing index (as returned by index_information()) has
+        the keys and options of this specification.
+
+        """
+        return (
+            [(key, int(direction)) for key, direction in info['key']] == self.keys
+            and bool(info.get('unique')) == self.unique
+            and info.get('partialFilterExpression') == self.partial
+        )
+
+
+def filter_keys(column_type: str) -> List[str]:
+    """
+    Return the document keys which generate_filter() queries on a column type may
+    filter by, i.e. those its documents can hold.
+
+    column_type:
+        A column type (e.g. `bgp')
+
+    """
+    container = COLUMN_FACTORY[column_type]
+
+    if container.__flat__:
+        return ['datasource', 'set_id']
+
+    if not container.__categories__:
+        return ['datasource', 'set_id', 'element_id']
+
+    return ['datasource', 'set_id', 'category', 'family', 'element_id']
+
+
+def query_shapes(column_type: str) -> List[tuple[str, ...]]:
+    """
+    Return the query shapes (i.e. the sets of filtered keys) of generate_filter()
+    queries on a column type.
+
+    column_type:
+        A column type (e.g. `bgp')
+
+    """
+    keys = filter_keys(column_type)
+
+    return [
+        shape for size in range(1, len(keys) + 1) for shape in combinations(keys, size)
+    ]
+
+
+def column_indexes(column_type: str) -> List[IndexSpec]:
+    """
+    Return the index specification of a column type. Every query shape returned by
+    query_shapes() other than family only queries is served by one of its indexes.
+
+    column_type:
+        A column type (e.g. `bgp')
+
+    """
+    keys = filter_keys(column_type)
+
+    indexes = [
+        IndexSpec(keys=DEFAULT_INDEX, unique=True),
+        IndexSpec(keys=VISIBLE_INDEX, partial=VISIBLE_FILTER),
+        IndexSpec(keys=DATASOURCE_INDEX),
+    ]
+
+    if 'category' in keys:
+        indexes.append(IndexSpec(keys=CATEGORY_INDEX))
+
+    if 'element_id' in keys:
+        indexes.append(IndexSpec(keys=ELEMENT_INDEX))
+
+    return indexes + [IndexSpec(keys=CONTENT_HASH_INDEX)]
+
+
+def index_specs() -> dict[str, List[IndexSpec]]:
+    """
+    Return the index specification of every NetDB collection keyed by collection.
+
+    """
+    settings = NetdbSettings.get_settings()
+
+    specs = {column: column_indexes(column) for column in COLUMN_TYPES}
+
+    if settings.overrides_enabled:
+        specs[settings.override_table] = [IndexSpec(keys=OVERRIDE_INDEX, unique=True)]
+
+    return specs
+
+
+def _outdated_indexes(spec: IndexSpec, existing: dict) -> List[str]:
+    """
+    Return the names of the existing indexes (as returned by index_information())
+    which an index specification replaces, i.e. those with its name or keys.
+
+    """
+    return [
+        name
+        for name, info in existing.items()
+        if name == spec.name
+        or [(key, int(direction)) for key, direction in info['key']] == spec.keys
+    ]
+
+
+def index_changes(collection: str, specs: List[IndexSpec]) -> dict:
+    """
+    Compare the indexes of a collection, as listed by MongoDB, with its
+    specification. Returns the missing (`create') and outdated (`rebuild') index
+    specifications and the names of the indexes not in the specification (`unknown').
+    Outdated indexes are those with the name or keys, but not the options, of a
+    specification.
+
+    collection:
+        The collection (e.g. `bgp')
+
+    specs:
+        The index specification of the collection
+
+    """
+    mongo = MongoAPI(NetdbSettings.get_settings().db_name, collection)
+
+    existing = {
+        name: info for name, info in mongo.index_information().items() if name != '_id_'
+    }
+
+    out: dict = {'create': [], 'rebuild': [], 'unknown': []}
+
+    for spec in specs:
+        if any(spec.matches(info) for info in existing.values()):
+            continue
+
+        out['rebuild' if _outdated_indexes(spec, existing) else 'create'].append(spec)
+
+    out['unknown'] = [
+        name
+        for name, info in existing.items()
+        if not any(
+            spec.matches(info) or name in _outdated_indexes(spec, existing)
+            for spec in specs
+        )
+    ]
+
+    return out
+
+
+def check_indexes(specs: dict[str, List[IndexSpec]]) -> dict:
+    """
+    Return the index_changes() of several collections keyed by collection. The
+    collections are checked concurrently.
+
+    specs:
+        Index specifications keyed by collection, as returned by index_specs()
+
+    """
+    with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+        return dict(zip(specs, executor.map(index_changes, specs, specs.values())))
+
+
+def _build_index(collection: str, spec: IndexSpec, rebuild: bool) -> bool:
+    """
+    Create an index. If rebuild, the index is built under another name than the
+    outdated index (see _outdated_indexes()), which is only dropped afterwards, so
+    that the collection is never left without it. Returns false if MongoDB refuses
+    to build the index next to the outdated one (e.g. the options differing are not
+    part of the index signature, such as `unique'), which is then kept.
+
+    """
+    mongo = MongoAPI(NetdbSettings.get_settings().db_name, collection)
+
+    if not rebuild:
+        mongo.create_index(spec.keys, unique=spec.unique, partial=spec.partial)
+        return True
+
+    existing = mongo.index_information()
+
+    name = next(
+        name
+        for name in [
+            spec.name,
+            f'{spec.name}_rebuilt',
+            f'{spec.name}_{uuid.uuid4().hex}',
+        ]
+        if name not in existing
+    )
+
+    try:
+        mongo.create_index(
+            spec.keys, unique=spec.unique, partial=spec.partial, name=name
+        )
+    except OperationFailure as e:
+        if e.code not in _INDEX_CONFLICTS:
+            raise
+
+        logger.warning(
+            "%s: Index %s cannot be built next to the outdated index, drop it to "
+            "rebuild",
+            collection,
+            spec.name,
+        )
+        return False
+
+    for outdated in _outdated_indexes(spec, existing):
+        mongo.drop_index(outdated)
+
+    return True
+
+
+def build_indexes(specs: dict[str, List[IndexSpec]]) -> Optional[dict]:
+    """
+    Create the missing indexes of several collections, and rebuild the outdated ones
+    if the `index_rebuilds' setting is enabled. The index builds run concurrently
+    while holding the INDEX_LOCK lock document, so that only one worker (of any host)
+    builds indexes at a time. Returns the created and rebuilt index names keyed by
+    collection, or None if the lock is held by another worker.
+
+    specs:
+        Index specifications keyed by collection, as returned by index_specs()
+
+    """
+    settings = NetdbSettings.get_settings()
+
+    lock = MongoAPI(settings.db_name, settings.revision_table)
+    owner = f'{socket.gethostname()}:{os.getpid()}'
+
+    if not lock.acquire_lock(INDEX_LOCK, owner, settings.index_lock_ttl):
+        return None
+
+    try:
+        # Checked again, as another worker may have built indexes in the meantime.
+        changes = check_indexes(specs)
+
+        if not settings.index_rebuilds:
+            for change in changes.values():
+                change['rebuild'] = []
+
+        builds = [
+            (collection, spec, rebuild)
+            for collection, change in changes.items()
+            for rebuild in [False, True]
+            for spec in change['rebuild' if rebuild else 'create']
+        ]
+
+        if builds:
+            with ThreadPoolExecutor(max_workers=INDEX_BUILD_WORKERS) as executor:
+                built = list(executor.map(lambda build: _build_index(*build), builds))
+
+            # Outdated indexes MongoDB refused to rebuild are kept.
+            for (collection, spec, rebuild), ok in zip(builds, built):
+                if rebuild and not ok:
+                    changes[collection]['rebuild'].remove(spec)
+
+    finally:
+        lock.release_lock(INDEX_LOCK, owner)
+
+    return {
+        collection: {
+            'created': [spec.name for spec in change['create']],
+            'rebuilt': [spec.name for spec in change['rebuild']],
+        }
+        for collection, change in changes.items()
+        if change['create'] or change['rebuild']
+    }
+
+
+def plan_indexes(explain: dict) -> List[str]:
+    """
+    Return the names of the indexes scanned by the winning plan of a query, as
+    returned by MongoAPI.explain(). An empty list means a collection scan.
+
+    explain:
+        The explain output of a query
+
+    """
+
+    def walk(stage: Any) -> Iterator[str]:
+        if isinstance(stage, dict):
+            if 'indexName' in stage:
+                yield stage['indexName']
+
+            for value in stage.values():
+                yield from walk(value)
+
+        elif isinstance(stage, list):
+            for value in stage:
+                yield from walk(value)
+
+    return list(dict.fromkeys(walk(explain['queryPlanner']['winningPlan'])))
+
+
+def explain_query_shapes(column_type: str) -> dict:
+    """
+    Return the indexes used by MongoDB for each query shape of a column type (see
+    query_shapes()). An empty list means that the shape is read by a collection
+    scan (COLLSCAN). Each shape is explained as the query of a column read of
+    visible documents, built by the same helpers as the read itself
+    (generate_filter() and visible_query()).
+
+    column_type:
+        A column type (e.g. `bgp')
+
+    """
+    mongo = MongoAPI(NetdbSettings.get_settings().db_name, column_type)
+
+    return {
+        ','.join(shape): plan_indexes(
+            mongo.explain(
+                visible_query(generate_filter(**{key: key for key in shape}), False)
+            )
+        )
+        for shape in query_shapes(column_type)
+    }
+
+
+def index_report() -> dict:
+    """
+    Return the index specification of each column together with the indexes used
+    by each of its query shapes and the shapes read by collection scans.
+
+    """
+    out = {}
+
+    for column in COLUMN_TYPES:
+        plans = explain_query_shapes(column)
+
+        out[column] = {
+            'indexes': [spec.name for spec in column_indexes(column)],
+            'query_shapes': plans,
+            'collscan': [shape for shape, indexes in plans.items() if not indexes],
+        }
+
+    return out
+
 
 def initialize():
     """
     Code to be run at API start time. Currently limited to making sure
     that the required MongoDB collection indexes are in place.
 
+    Indexes are only built if missing, or outdated and the `index_rebuilds' setting
+    is enabled, so that most workers merely list the indexes of each collection.
+    Outdated indexes are otherwise logged. Read only workers only handle the override
+    index.
+
     """
+    start = time.perf_counter()
 
     # Load NetdbSettings
     NetdbSettings.initialize()
@@ -39,17 +458,62 @@ def initialize():
     # Get the loaded NetDB settings
     settings = NetdbSettings.get_settings()
 
-    if not settings.read_only:
-        for column in COLUMN_TYPES:
-            logger.info("%s: Creating index for column %s", settings.db_name, column)
+    timings = {'settings': time.perf_counter() - start}
 
-            # This call will be a no-op if index already exists.
-            MongoAPI(settings.db_name, column).create_index(DEFAULT_INDEX)
+    specs = index_specs()
 
-    if settings.overrides_enabled:
-        logger.info(
-            "%s: Creating index for override table %s",
-            settings.db_name,
-            settings.override_table,
-        )
-        MongoAPI(settings.db_name, settings.override_table).create_index(OVERRIDE_INDEX)
+    if settings.read_only:
+        # Read only workers do not write columns, but still maintain the override
+        # index as overrides may be written.
+        specs = {
+            collection: spec
+            for collection, spec in specs.items()
+            if collection == settings.override_table
+        }
+
+    if not specs:
+        return
+
+    start = time.perf_counter()
+    changes = check_indexes(specs)
+    timings['index_check'] = time.perf_counter() - start
+
+    for collection, change in changes.items():
+        for name in change['unknown']:
+            logger.warning("%s: Index %s not in index specification", collection, name)
+
+        if not settings.index_rebuilds:
+            for spec in change['rebuild']:
+                logger.warning(
+                    "%s: Index %s is outdated, rebuilds are disabled",
+                    collection,
+                    spec.name,
+                )
+
+    if any(
+        change['create'] or (change['rebuild'] and settings.index_rebuilds)
+        for change in changes.values()
+    ):
+        start = time.perf_counter()
+        built = build_indexes(specs)
+        timings['index_build'] = time.perf_counter() - start
+
+        if built is None:
+            logger.info(
+                "%s: Indexes are being built by another worker", settings.db_name
+            )
+
+        for collection, names in (built or {}).items():
+            for name in names['created']:
+                logger.info("%s: Created index %s", collection, name)
+
+            for name in names['rebuilt']:
+                logger.warning("%s: Rebuilt index %s", collection, name)
+
+    logger.info(
+        "%s: Startup timings: %s",
+        settings.db_name,
+        ', '.join(
+            f'{phase} {seconds * 1000:.1f} ms' for phase, seconds in timings.items()
+        ),
+    )
@@ -0,0 +1,67 @@
+"""
+Migrations for existing NetDB collections. Run from the NetDB base directory, e.g.:
+
+    python -m util.migrate backfill_content_hash
+
+"""
+
+import sys
+import logging
+import argparse
+
+from config.settings import NetdbSettings
+from models.types import COLUMN_TYPES
+from odm.column_odm import ColumnODM
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_content_hash(batch_size: int = 1000) -> dict:
+    """
+    Set the content hash of all column documents stored without one. Returns the
+    number of documents updated per column.
+
+    batch_size: ``1000``
+        Number of documents updated per bulk write
+
+    """
+    out = {}
+
+    for column in COLUMN_TYPES:
+        out[column] = ColumnODM(column_type=column).backfill_content_hash(batch_size)
+        logger.info("%s: content hash set on %d documents", column, out[column])
+
+    return out
+
+
+MIGRATIONS = {
+    'backfill_content_hash': backfill_content_hash,
+}
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('migration', choices=list(MIGRATIONS))
+    parser.add_argument('--batch-size', type=int, default=1000)
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    NetdbSettings.initialize()
+
+    if NetdbSettings.get_settings().read_only:
+        logger.error("NetDB is running in read only mode.")
+        return 1
+
+    MIGRATIONS[args.migration](args.batch_size)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
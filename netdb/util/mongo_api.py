@@ -1,18 +1,704 @@
-from typing import Union, List
-from pymongo import MongoClient, ReadPreference
-from models.types import NetdbDocument, OverrideDocument
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Union,
+    List,
+    Optional,
+)
+from pymongo import (
+    ASCENDING,
+    MongoClient,
+    ReadPreference,
+    ReturnDocument,
+    InsertOne,
+    ReplaceOne,
+    UpdateOne,
+    DeleteOne,
+)
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult
+from motor.motor_asyncio import AsyncIOMotorClient
+from models.types import (
+    COLUMN_TYPES,
+    NetdbDocument,
+    OverrideDocument,
+    RevisionDocument,
+    content_hash,
+    visible_query,
+)
 from config.settings import NetdbSettings
+from util.exception import NetDBException
+from .mongo_client import MongoClientRegistry
 
 
-class MongoAPI:
+def _read_preference():
     """
-    A basic MongoDB API which provides the operations needed by netdb.
+    Return the read preference to be used by NetDB MongoDB clients.
+
+    """
+    if NetdbSettings.get_settings().transactions:
+        # Transactions implies a replica set. Read from first available (which should
+        # just be local instance)
+        return ReadPreference.NEAREST
+
+    return ReadPreference.PRIMARY
+
+
+def _netdb_document(document: dict) -> NetdbDocument:
+    """
+    Convert a raw MongoDB column document into a NetdbDocument.
+
+    """
+    return NetdbDocument(
+        set_id=document['set_id'],
+        datasource=document['datasource'],
+        weight=document['weight'],
+        flat=document['flat'],
+        category=document['category'],
+        family=document['family'],
+        element_id=document['element_id'],
+        data=document['data'],
+        schema_version=document.get('schema_version'),
+        content_hash=document.get('content_hash'),
+    )
+
+
+def _partial_document(document: dict) -> NetdbDocument:
+    """
+    Convert a raw MongoDB column document read with a field projection into a
+    partial NetdbDocument. Only the projected fields (and defaults) are set.
+
+    """
+    return NetdbDocument.model_construct(**document)
+
+
+def _projection(fields: Optional[List[str]]) -> dict:
+    """
+    Return the find() projection for a column read. The MongoDB `_id' is never read.
+
+    """
+    projection = {field: True for field in fields or []}
+    projection['_id'] = False
+
+    return projection
+
+
+def _sort(fields: Optional[List[str]]) -> Optional[List[tuple]]:
+    """
+    Return a pymongo sort specification sorting by fields in ascending order.
+
+    """
+    if not fields:
+        return None
+
+    return [(field, ASCENDING) for field in fields]
+
+
+def _batch_size() -> int:
+    """
+    Return the cursor batch size to be used for column reads. 0: driver default.
+
+    """
+    return NetdbSettings.get_settings().mongo_batch_size
+
+
+def _dump(document: Union[NetdbDocument, OverrideDocument]) -> dict:
+    """
+    Return the MongoDB representation of a document. Column documents are stored
+    with their content hash, which is computed here if not already set.
+
+    """
+    if isinstance(document, NetdbDocument) and document.content_hash is None:
+        document.content_hash = content_hash(document)
+
+    return document.model_dump()
+
+
+def _dump_chunks(
+    documents: Iterable[Union[NetdbDocument, OverrideDocument]], size: int
+) -> Iterator[list]:
+    """
+    Return the MongoDB representations of documents in chunks of up to size
+    documents. Documents are consumed (e.g. generated) one chunk at a time.
+
+    """
+    documents = iter(documents)
+
+    while chunk := [_dump(document) for document in islice(documents, max(size, 1))]:
+        yield chunk
+
+
+def _insert_counts(inserted: int, error: Optional[BulkWriteError] = None) -> dict:
+    """
+    Return the inserted and failed (e.g. duplicate key) document counts of an
+    unordered insert.
+
+    """
+    if error is None:
+        return {'inserted': inserted, 'failed': 0}
+
+    return {
+        'inserted': error.details.get('nInserted', 0),
+        'failed': len(error.details.get('writeErrors', [])),
+    }
+
+
+def _backfill_operations(documents: list) -> list:
+    """
+    Return the bulk write operations setting the content hash of raw MongoDB column
+    documents.
+
+    """
+    return [
+        UpdateOne(
+            {'_id': document['_id']},
+            {'$set': {'content_hash': content_hash(_netdb_document(document))}},
+        )
+        for document in documents
+    ]
+
+
+# Matches column documents stored without a content hash
+_MISSING_CONTENT_HASH = {'content_hash': None}
+
+
+def _override_document(document: dict) -> OverrideDocument:
+    """
+    Convert a raw MongoDB override document into an OverrideDocument.
+
+    """
+    return OverrideDocument(
+        column_type=document['column_type'],
+        set_id=document['set_id'],
+        category=document['category'],
+        family=document['family'],
+        element_id=document['element_id'],
+        data=document['data'],
+    )
+
+
+def _revision_document(
+    column_type: str, document: Union[dict, None]
+) -> RevisionDocument:
+    """
+    Convert a raw MongoDB revision document into a RevisionDocument.
+
+    """
+    document = document or {}
+
+    return RevisionDocument(
+        column_type=column_type,
+        revision=document.get('revision', 0),
+        updated=document.get('updated'),
+    )
+
+
+def _lock_query(name: str, owner: str) -> dict:
+    """
+    Return the filter matching a lock document which may be taken by owner, i.e. one
+    already held by owner or expired.
+
+    """
+    return {
+        '_id': name,
+        '$or': [{'owner': owner}, {'expires': {'$lt': datetime.now(timezone.utc)}}],
+    }
+
+
+def _lock_update(owner: str, ttl: int) -> dict:
+    """
+    Return the update taking a lock document for owner for ttl seconds.
+
+    """
+    expires = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+
+    return {'$set': {'owner': owner, 'expires': expires}}
+
+
+# Seconds between attempts to take the swap lock of a column, or to find the lock
+# free (see reload_swap() and _column_write())
+_SWAP_LOCK_POLL = 0.05
+
+
+def _swap_lock(collection: str) -> str:
+    """
+    Return the name of the lock document held by a swap reload of a collection while
+    its staging collection replaces the collection (the swap window).
+
+    """
+    return f'lock.reload.{collection}'
+
+
+def _write_locks(collection: str) -> str:
+    """
+    Return the name prefix of the lock documents held by the writes in progress to a
+    collection, one per write (see _column_write()).
+
+    """
+    return f'lock.write.{collection}.'
+
+
+def _locks_writes(collection: str) -> bool:
+    """
+    Return whether writes to a collection are serialized with its swap reloads, i.e.
+    whether swap reloads are enabled (and not superseded by transactions) and the
+    collection is a column.
+
+    """
+    settings = NetdbSettings.get_settings()
+
+    return (
+        settings.swap_reloads
+        and not settings.transactions
+        and collection in COLUMN_TYPES
+    )
+
+
+def _check_swap(collection: str, owner: Optional[str]) -> None:
+    """
+    Raise a NetDBException (409) if the swap lock of a collection is held, i.e. a
+    swap reload is replacing the collection.
+
+    """
+    if owner:
+        raise NetDBException(
+            code=409, message=f'{collection}: column is being reloaded, retry later.'
+        )
+
+
+def _swap_timeout(collection: str, waiting_for: str) -> NetDBException:
+    """
+    Return the exception raised by a swap reload which waited `swap_lock_wait'
+    seconds for a lock in vain.
+
+    """
+    return NetDBException(
+        code=503,
+        message=f'{collection}: reload timed out waiting for {waiting_for}, retry later.',
+    )
+
+
+@contextmanager
+def _renewing(lock: Any, name: str, owner: str, ttl: int) -> Iterator[None]:
+    """
+    Renew a lock taken by acquire_lock() every third of its ttl while the context
+    runs, so that only a crashed holder lets it expire. An expired lock is not
+    renewed (see MongoAdminAPI.renew_lock()).
+
+    """
+    stop = threading.Event()
+
+    def renew() -> None:
+        while not stop.wait(ttl / 3):
+            if not lock.renew_lock(name, owner, ttl):
+                return
+
+    thread = threading.Thread(target=renew, daemon=True)
+    thread.start()
+
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+# MongoDB error codes of cursors killed by renameCollection (e.g. by swap reloads)
+_CURSOR_KILLED = {43, 175, 237}
+
+# Number of times a read is resumed (or retried) after its cursor was killed
+_CURSOR_RESUMES = 3
+
+
+def _after_set(query: Union[dict, None], after: Optional[str]) -> dict:
+    """
+    Return query restricted to the sets after set_id after (all sets if None).
+
+    """
+    if after is None:
+        return query or {}
+
+    return {'$and': [query or {}, {'set_id': {'$gt': after}}]}
+
+
+# Unique key of column documents (see util.initialize.DEFAULT_INDEX). Column reads
+# are sorted by it last, so that the documents of an element are read in datasource
+# order (see weight_resolution_pipeline()).
+_DOCUMENT_KEY = ['set_id', 'category', 'family', 'element_id', 'datasource']
+
+
+def _set_sort(sort: Optional[List[str]]) -> List[str]:
+    """
+    Return the sort of a resumable column read, i.e. by set_id, by the fields of sort
+    and then by document key.
+
+    """
+    return list(dict.fromkeys(['set_id', *(sort or []), *_DOCUMENT_KEY]))
+
+
+def _resumable(find: Callable[[Optional[str]], Iterable[dict]]) -> Iterator[dict]:
+    """
+    Iterate over the documents read in set_id order by find(after), which reads the
+    sets after set_id after (see _after_set()). The documents of a set are only
+    yielded once the whole set has been read, so that a read whose cursor is killed
+    (e.g. by a swap reload renaming the staging collection) is resumed after the last
+    set yielded rather than mixing sets of the old and new collection. The read fails
+    if its cursor is killed more than _CURSOR_RESUMES times.
+
+    """
+    after: Optional[str] = None
+    resumes = 0
+
+    while True:
+        documents: list = []
+
+        try:
+            for document in find(after):
+                if documents and document['set_id'] != documents[0]['set_id']:
+                    yield from documents
+                    after = documents[0]['set_id']
+                    documents = []
+
+                documents.append(document)
+
+        except OperationFailure as e:
+            if e.code not in _CURSOR_KILLED or resumes >= _CURSOR_RESUMES:
+                raise
+
+            resumes += 1
+            continue
+
+        yield from documents
+        return
+
+
+async def _resumable_async(
+    find: Callable[[Optional[str]], AsyncIterable[dict]],
+) -> AsyncIterator[dict]:
+    """
+    Async version of _resumable()
+
+    """
+    after: Optional[str] = None
+    resumes = 0
+
+    while True:
+        documents: list = []
+
+        try:
+            async for document in find(after):
+                if documents and document['set_id'] != documents[0]['set_id']:
+                    for buffered in documents:
+                        yield buffered
+
+                    after = documents[0]['set_id']
+                    documents = []
+
+                documents.append(document)
+
+        except OperationFailure as e:
+            if e.code not in _CURSOR_KILLED or resumes >= _CURSOR_RESUMES:
+                raise
+
+            resumes += 1
+            continue
+
+        for buffered in documents:
+            yield buffered
+
+        return
+
+
+def _retried(read: Callable[[], Any]) -> Any:
+    """
+    Return read(), which reads its documents at once (e.g. as a list), reading again
+    should its cursor be killed (see _resumable()).
+
+    """
+    for attempt in range(_CURSOR_RESUMES + 1):
+        try:
+            return read()
+        except OperationFailure as e:
+            if e.code not in _CURSOR_KILLED or attempt == _CURSOR_RESUMES:
+                raise
+
+    return None
+
+
+async def _retried_async(read: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Async version of _retried()
+
+    """
+    for attempt in range(_CURSOR_RESUMES + 1):
+        try:
+            return await read()
+        except OperationFailure as e:
+            if e.code not in _CURSOR_KILLED or attempt == _CURSOR_RESUMES:
+                raise
+
+    return None
+
+
+def _staging_indexes(indexes: Mapping[str, dict]) -> list:
+    """
+    Return the create_index() arguments (keys and options) rebuilding the indexes
+    of a collection, as returned by index_information(), on its staging collection.
+
+    """
+    return [
+        (
+            info['key'],
+            {
+                'name': name,
+                **{k: v for k, v in info.items() if k not in ['key', 'v', 'ns']},
+            },
+        )
+        for name, info in indexes.items()
+        if name != '_id_'
+    ]
+
+
+def _merge_pipeline(filt: dict, staging: str) -> list:
+    """
+    Return the aggregation pipeline copying the documents of a collection not
+    matching filt (i.e. those surviving a reload) into its staging collection.
+
+    """
+    return [
+        {'$match': {'$nor': [filt]}},
+        {
+            '$merge': {
+                'into': staging,
+                'whenMatched': 'fail',
+                'whenNotMatched': 'insert',
+            }
+        },
+    ]
+
+
+# Update used to bump a column revision counter
+_BUMP_REVISION = {'$inc': {'revision': 1}, '$currentDate': {'updated': True}}
+
+
+def _replace_operations(documents: list) -> list:
+    """
+    Return the bulk write operations upserting documents in place of their stored
+    copies.
+
+    """
+    return [
+        ReplaceOne(_replace_filter(document), _dump(document), upsert=True)
+        for document in documents
+    ]
+
+
+def _delta_operations(added: list, changed: list, removed: list) -> list:
+    """
+    Return the bulk write operations applying a delta reload.
+
+    """
+    return (
+        [InsertOne(_dump(document)) for document in added]
+        + [
+            ReplaceOne(_replace_filter(document), _dump(document))
+            for document in changed
+        ]
+        + [DeleteOne(_replace_filter(document)) for document in removed]
+    )
+
+
+def _bulk_counts(result: Union[BulkWriteResult, None]) -> dict:
+    """
+    Return the matched / modified / upserted counts of a bulk write.
+
+    """
+    if result is None:
+        return {'matched': 0, 'modified': 0, 'upserted': 0}
+
+    return {
+        'matched': result.matched_count,
+        'modified': result.modified_count,
+        'upserted': result.upserted_count,
+    }
+
+
+def _column_read(collection, query: dict, resolved: bool, show_hidden: bool, **kwargs):
+    """
+    Return a cursor reading column documents, either all matching ones or only the
+    winning documents (see weight_resolution_pipeline()) if resolved. Hidden documents
+    are not read unless show_hidden.
+
+    """
+    if resolved:
+        return collection.aggregate(
+            weight_resolution_pipeline(query, show_hidden), allowDiskUse=True, **kwargs
+        )
+
+    return collection.find(
+        visible_query(query, show_hidden), _projection(None), **kwargs
+    )
+
+
+def _column_find(
+    collection, query: Union[dict, None], fields: Optional[List[str]], sort
+) -> Callable[..., Any]:
+    """
+    Return find(after) reading the column documents of a (pymongo or motor)
+    collection filtered by query, continuing after set_id after if given (see
+    _after_set()).
+
+    """
+
+    def find(after: Optional[str] = None):
+        return collection.find(
+            _after_set(query, after),
+            _projection(fields),
+            sort=_sort(sort),
+            batch_size=_batch_size(),
+        )
+
+    return find
+
+
+def _resolved_find(
+    collection,
+    query: Union[dict, None],
+    show_hidden: bool,
+    fields: Optional[List[str]],
+) -> Callable[..., Any]:
+    """
+    Return find(after) reading the winning column documents of a (pymongo or motor)
+    collection filtered by query (see weight_resolution_pipeline()), continuing after
+    set_id after if given.
+
+    """
+
+    def find(after: Optional[str] = None):
+        return collection.aggregate(
+            weight_resolution_pipeline(_after_set(query, after), show_hidden, fields),
+            allowDiskUse=True,
+        ).batch_size(_batch_size())
+
+    return find
+
+
+def _set_ids_pipeline(query: dict, limit: int) -> list:
+    """
+    Return the aggregation pipeline reading the first limit distinct set_ids of the
+    column documents filtered by query in ascending order. Grouping on set_id right
+    after sorting by it lets MongoDB read one index key per set (DISTINCT_SCAN) rather
+    than every document of each set.
+
+    """
+    return [
+        {'$match': query},
+        {'$sort': {'set_id': 1}},
+        {'$group': {'_id': '$set_id'}},
+        {'$sort': {'_id': 1}},
+        {'$limit': limit},
+    ]
+
+
+def _snapshot_overrides(query: dict, column_types: List[str]) -> dict:
+    """
+    Return the override table query of a snapshot read of column_types.
+
+    """
+    return {**query, 'column_type': {'$in': column_types}}
+
+
+def weight_resolution_pipeline(
+    query: Union[dict, None], show_hidden: bool, fields: Optional[List[str]] = None
+) -> list:
+    """
+    Return an aggregation pipeline which performs NetDB weight resolution server side,
+    i.e. only the highest weight document for each column element (or set in the case
+    of flat columns) is returned. Documents are returned in element key order, i.e.
+    sorted by set_id first.
+
+    Of documents with equal weights, the one with the last datasource (in ascending
+    order) wins, as in the Python merge (ColumnODM.generate_column()), where the
+    document read last wins and documents are read in datasource order (see
+    _DOCUMENT_KEY).
+
+    query:
+        Filter to use when reading documents from the collection
+
+    show_hidden:
+        Also consider elements with weight < 1
+
+    fields: ``None``
+        Only keep these fields (which must include the element key and weight). The
+        projection is applied before documents are grouped.
+
+    """
+    match = visible_query(query, show_hidden)
+
+    element_key = ['set_id', 'category', 'family', 'element_id']
+
+    project = [{'$project': _projection(fields)}] if fields else []
+
+    return [
+        {'$match': match},
+        *project,
+        {'$sort': {'weight': -1, 'datasource': -1}},
+        {
+            '$group': {
+                '_id': {key: f'${key}' for key in element_key},
+                'document': {'$first': '$$ROOT'},
+            }
+        },
+        {'$replaceRoot': {'newRoot': '$document'}},
+        {'$sort': {key: 1 for key in element_key}},
+        {'$project': {'_id': False}},
+    ]
+
+
+def _replace_filter(document: Union[NetdbDocument, OverrideDocument]) -> dict:
+    """
+    Return the filter matching the stored copy of a document.
+
+    """
+    filt = {
+        'set_id': document.set_id,
+        'category': document.category,
+        'family': document.family,
+        'element_id': document.element_id,
+    }
+
+    if isinstance(document, NetdbDocument):
+        filt.update({'datasource': document.datasource})
+
+    return filt
+
+
+class MongoAdminAPI:
+    """
+    The administrative operations of MongoAPI: revision counters, locks and
+    indexes.
 
     """
 
     def __init__(self, database: str, collection: str):
         """
-        Initialize a MongoDB connection.
+        Initialize a MongoDB connection. The underlying MongoClient is taken from the
+        process wide MongoClientRegistry so that its connection pool is shared by all
+        MongoAPI instances.
 
         database:
             MongoDB database to connect to
@@ -21,100 +707,661 @@ class MongoAPI:
             MongoDB collection to use
 
 
-        """
-        settings = NetdbSettings.get_settings()
+        """
+        self.client: MongoClient = MongoClientRegistry.get_client(_read_preference())
+
+        self.collection_name = collection
+
+        cursor = self.client[database]
+        self.database = cursor
+        self.collection = cursor[collection]
+
+    def explain(
+        self, query: Union[dict, None] = None, sort: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Return the MongoDB query plan of a column read of the documents in the
+        collection filtered by query (see plan_indexes()). The read is built as by
+        MongoAPI.iter_column(), i.e. sorted by set_id and document key.
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        sort: ``None``
+            Fields to sort the documents of a set by in ascending order
+
+        """
+        return _column_find(self.collection, query, None, _set_sort(sort))().explain()
+
+    def read_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Read the revision counter of a column from the (revision) collection.
+
+        column_type:
+            The column type (e.g. `bgp')
+
+        """
+        return _revision_document(
+            column_type, self.collection.find_one({'_id': column_type})
+        )
+
+    def bump_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Increment the revision counter of a column in the (revision) collection.
+
+        column_type:
+            The column type (e.g. `bgp')
+
+        """
+        return _revision_document(
+            column_type,
+            self.collection.find_one_and_update(
+                {'_id': column_type},
+                _BUMP_REVISION,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            ),
+        )
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        """
+        Take a named lock held in a lock document of the collection (e.g. the revision
+        collection) for ttl seconds. Returns false if the lock is held by another owner
+        and has not expired.
+
+        name:
+            The lock (document _id). Must not conflict with column names.
+
+        owner:
+            Identifies the lock holder (e.g. host and process id)
+
+        ttl:
+            Seconds after which the lock expires unless released
+
+        """
+        try:
+            self.collection.update_one(
+                _lock_query(name, owner), _lock_update(owner, ttl), upsert=True
+            )
+        except DuplicateKeyError:
+            # Held by another owner: the upsert collided with its lock document.
+            return False
+
+        return True
+
+    def release_lock(self, name: str, owner: str) -> bool:
+        """
+        Release a named lock taken by acquire_lock(). Returns false if the lock was not
+        held by owner (e.g. expired and taken by another owner).
+
+        name:
+            The lock (document _id)
+
+        owner:
+            The lock holder passed to acquire_lock()
+
+        """
+        result = self.collection.delete_one({'_id': name, 'owner': owner})
+
+        return result.deleted_count == 1
+
+    def lock_owner(self, name: str) -> Optional[str]:
+        """
+        Return the holder of a named lock taken by acquire_lock(), or None if the lock
+        is not held (or expired).
+
+        name:
+            The lock (document _id)
+
+        """
+        document = self.collection.find_one(
+            {'_id': name, 'expires': {'$gte': datetime.now(timezone.utc)}}
+        )
+
+        return document['owner'] if document else None
+
+    def renew_lock(self, name: str, owner: str, ttl: int) -> bool:
+        """
+        Extend a named lock taken by acquire_lock() by ttl seconds. Returns false if
+        the lock is no longer held by owner, including when it has expired, even if
+        it was not taken by another owner since.
+
+        name:
+            The lock (document _id)
+
+        owner:
+            The lock holder passed to acquire_lock()
+
+        ttl:
+            Seconds after which the lock expires unless renewed again
+
+        """
+        result = self.collection.update_one(
+            {
+                '_id': name,
+                'owner': owner,
+                'expires': {'$gte': datetime.now(timezone.utc)},
+            },
+            _lock_update(owner, ttl),
+        )
+
+        return result.matched_count == 1
+
+    def count_locks(self, prefix: str) -> int:
+        """
+        Return the number of named locks held (and not expired) whose name starts
+        with prefix.
+
+        prefix:
+            The lock name (document _id) prefix, e.g. `lock.write.bgp.'
+
+        """
+        return self.collection.count_documents(
+            {
+                '_id': {'$regex': f'^{re.escape(prefix)}'},
+                'expires': {'$gte': datetime.now(timezone.utc)},
+            }
+        )
+
+    def create_index(
+        self,
+        index: list,
+        unique: bool = True,
+        partial: Optional[dict] = None,
+        name: Optional[str] = None,
+    ) -> bool:
+        """
+        Index a collection using a compound (multi-key) index
+
+        index:
+            the set of keys (i.e. compound index) used to index the collection
+
+        unique: ``True``
+            Whether the index is a unique index
+
+        partial: ``None``
+            Only index documents matching this filter (partial index)
+
+        name: ``None``
+            The index name. Generated by MongoDB from the keys if not given.
+
+        """
+        options: dict = {'unique': unique}
+        if partial:
+            options['partialFilterExpression'] = partial
+        if name:
+            options['name'] = name
+
+        self.collection.create_index(index, **options)
+
+        return True
+
+    def index_information(self) -> dict:
+        """
+        Return the indexes of the collection keyed by index name, each with its keys
+        and options (e.g. `unique', `partialFilterExpression').
+
+        """
+        return dict(self.collection.index_information())
+
+    def drop_index(self, name: str) -> bool:
+        """
+        Drop an index from the collection
+
+        name:
+            The index name, as returned by index_information()
+
+        """
+        self.collection.drop_index(name)
+
+        return True
+
+
+class MongoAPI(MongoAdminAPI):
+    """
+    A basic MongoDB API which provides the operations needed by netdb.
+
+    """
+
+    def iter_column(
+        self,
+        query: Union[dict, None] = None,
+        fields: Optional[List[str]] = None,
+        sort: Optional[List[str]] = None,
+    ) -> Iterator[NetdbDocument]:
+        """
+        Iterate over column (NetdbDocument) documents in the collection filtered by
+        query. Documents are converted as they are received from the cursor rather
+        than materialized as a list. Documents are read in set_id order, a set at a
+        time, and the read is resumed should its cursor be killed (see _resumable()).
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        sort: ``None``
+            Return the documents of a set in ascending order of these fields, and
+            then of their document key
+
+        """
+        convert = _partial_document if fields else _netdb_document
+
+        for document in _resumable(
+            _column_find(self.collection, query, fields, _set_sort(sort))
+        ):
+            yield convert(document)
+
+    def read_column(
+        self, query: Union[dict, None] = None, fields: Optional[List[str]] = None
+    ) -> List[NetdbDocument]:
+        """
+        Read column (NetdbDocument) documents from the collection filtered by query.
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        fields: ``None``
+            Only read these fields (e.g. `['set_id']'). Partial documents are
+            returned.
+
+        """
+        return list(self.iter_column(query, fields))
+
+    def iter_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[NetdbDocument]:
+        """
+        Iterate over the winning (highest weight) column documents filtered by query.
+        See read_column_resolved(). Documents are received a set at a time and the
+        read is resumed should its cursor be killed (see _resumable()).
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        show_hidden: ``False``
+            Also consider elements with weight < 1
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        """
+        convert = _partial_document if fields else _netdb_document
+
+        for document in _resumable(
+            _resolved_find(self.collection, query, show_hidden, fields)
+        ):
+            yield convert(document)
+
+    def read_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> List[NetdbDocument]:
+        """
+        Read column (NetdbDocument) documents from the collection filtered by query,
+        returning only the winning (highest weight) document for each element. See
+        weight_resolution_pipeline().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        show_hidden: ``False``
+            Also consider elements with weight < 1
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        """
+        return list(self.iter_column_resolved(query, show_hidden, fields))
+
+    def iter_raw(self, query: Union[dict, None] = None) -> Iterator[dict]:
+        """
+        Iterate over the raw stored documents (without MongoDB _id) in the collection
+        filtered by query, as received from the cursor. Column documents are read in
+        set_id order, a set at a time, and the read is resumed should its cursor be
+        killed (see _resumable()).
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        """
+        if self.collection_name not in COLUMN_TYPES:
+            yield from _column_find(self.collection, query, None, None)()
+            return
+
+        yield from _resumable(_column_find(self.collection, query, None, ['set_id']))
+
+    def read_set_ids(self, query: Union[dict, None] = None) -> List[str]:
+        """
+        Read the distinct set_ids in the collection filtered by query. Only the set_ids
+        are returned by MongoDB.
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        """
+        return self.collection.distinct('set_id', query or {})
+
+    def read_set_ids_sorted(self, query: dict, limit: int) -> List[str]:
+        """
+        Read the first limit distinct set_ids in the collection filtered by query in
+        ascending order, grouped by MongoDB (see _set_ids_pipeline()). The read is
+        made again should its cursor be killed (see _retried()).
+
+        query:
+            Filter to use when reading documents from the collection
+
+        limit:
+            Maximum number of set_ids to read
+
+        """
+
+        def read() -> List[str]:
+            return [
+                document['_id']
+                for document in self.collection.aggregate(
+                    _set_ids_pipeline(query, limit)
+                )
+            ]
+
+        return _retried(read)
+
+    def read_snapshot(
+        self,
+        query: dict,
+        column_types: List[str],
+        resolved: bool = False,
+        show_hidden: bool = False,
+    ) -> tuple[dict, List[OverrideDocument]]:
+        """
+        Read the documents matching query from several column collections together
+        with the matching overrides for these columns from this (override) collection.
+        All reads are made in a single snapshot session, so they see the same point in
+        time, and are made again should a cursor be killed (see _retried()). Requires a
+        replica set (MongoDB 5.0 or later).
+
+        Returns a dict of column documents keyed by column type and the overrides.
+
+        query:
+            Filter to use when reading documents (e.g. `{'set_id': 'ROUTER1'}')
 
-        if settings.transactions:
-            # Transactions implies a replica set. Read from first available (which should
-            # just be local instance)
-            self.client: MongoClient = MongoClient(
-                settings.mongo_url, read_preference=ReadPreference.NEAREST
-            )
-        else:
-            self.client = MongoClient(settings.mongo_url)
+        column_types:
+            The column collections to read
 
-        self.collection_name = collection
+        resolved: ``False``
+            Only read the winning document for each element (as read_column_resolved())
 
-        cursor = self.client[database]
-        self.collection = cursor[collection]
+        show_hidden: ``False``
+            Also consider elements with weight < 1 when resolved
 
-    def read_column(self, query: Union[dict, None] = None) -> List[NetdbDocument]:
         """
-        Read column (NetdbDocument) documents from the collection filtered by query.
 
-        query: ``None``
-            Filter to use when reading documents from the collection
+        def read() -> tuple[dict, List[OverrideDocument]]:
+            with self.client.start_session(snapshot=True) as session:
+                columns = {
+                    column_type: [
+                        _netdb_document(document)
+                        for document in _column_read(
+                            self.database[column_type],
+                            query,
+                            resolved,
+                            show_hidden,
+                            session=session,
+                        )
+                    ]
+                    for column_type in column_types
+                }
 
-        """
-        return [
-            NetdbDocument(
-                set_id=document['set_id'],
-                datasource=document['datasource'],
-                weight=document['weight'],
-                flat=document['flat'],
-                category=document['category'],
-                family=document['family'],
-                element_id=document['element_id'],
-                data=document['data'],
-            )
-            for document in self.collection.find(query or {})
-        ]
+                overrides = [
+                    _override_document(document)
+                    for document in self.collection.find(
+                        _snapshot_overrides(query, column_types), session=session
+                    )
+                ]
 
-    def read_overrides(self, query: Union[dict, None] = None) -> List[OverrideDocument]:
+            return columns, overrides
+
+        return _retried(read)
+
+    def read_overrides(
+        self,
+        query: Union[dict, None] = None,
+        sort: Optional[List[str]] = None,
+        limit: int = 0,
+    ) -> List[OverrideDocument]:
         """
         Read override (OverrideDocument) documents from the collection filtered by query.
 
         query: ``None``
             Filter to use when reading documents from the collection
 
+        sort: ``None``
+            Return documents in ascending order of these fields
+
+        limit: ``0``
+            Maximum number of documents to read. 0: no limit.
+
         """
         return [
-            OverrideDocument(
-                column_type=document['datasource'],
-                set_id=document['set_id'],
-                category=document['category'],
-                family=document['family'],
-                element_id=document['element_id'],
-                data=document['data'],
+            _override_document(document)
+            for document in self.collection.find(
+                query or {}, sort=_sort(sort), limit=limit
             )
-            for document in self.collection.find(query or {})
         ]
 
-    def reload(self, documents: list, filt: dict) -> bool:
+    def reload(self, documents: Iterable, filt: dict) -> bool:
         """
         Delete all documents in a collection matching a filter and then load new documents
         into the collection. This is done as a single transaction provided that transactions
-        are enabled (requires a MongoDB replica set).
+        are enabled (requires a MongoDB replica set), or by a swap reload (see
+        reload_swap()). Otherwise a failed insert leaves the collection partially loaded
+        (see insert_chunked()).
 
         This method implements the netdb reload operation whereby a SoT will delete all the
         documents in the collections associated with its intent (identified by datasource)
         and then load documents representing its current intent in their place.
 
         documents:
-            New list of documents to load into the collection
+            New documents to load into the collection (e.g. a generator)
 
         filt:
             Filter to use when deleting documents from the collection (e.g. `{'datasource':
             'netbox'}`)
 
         """
-        if NetdbSettings.get_settings().transactions:
+        settings = NetdbSettings.get_settings()
+
+        if settings.transactions:
             with self.client.start_session() as session:
                 with session.start_transaction():
                     self.collection.delete_many(filt, session=session)
-                    self.collection.insert_many(
-                        [document.model_dump() for document in documents],
-                        ordered=False,
-                        session=session,
-                    )
+                    self.insert_chunked(documents, session)
+        elif settings.swap_reloads:
+            self.reload_swap(documents, filt)
         else:
             self.collection.delete_many(filt)
-            self.collection.insert_many(
-                [document.model_dump for document in documents], ordered=False
-            )
+            self.insert_chunked(documents)
+
+        return True
+
+    def insert_chunked(self, documents: Iterable, session=None) -> int:
+        """
+        Insert documents into the collection using unordered inserts of up to
+        `insert_chunk_size' documents, up to `insert_concurrency' of which run
+        concurrently in worker threads. Each chunk is produced (e.g. generated by
+        ColumnODM) and dumped while earlier chunks are BSON encoded and sent, so only
+        the chunks in flight are held in memory. Returns the number of inserted
+        documents.
+
+        Should a chunk fail to insert no further chunk is started, but the chunks in
+        flight are left to complete. A NetDBException (500) then reports the number
+        of documents inserted (`out'), e.g. those of a non atomic reload which left
+        the collection partially loaded.
+
+        documents:
+            Documents to insert (e.g. a generator)
+
+        session: ``None``
+            Session (e.g. of a transaction) to insert with. Chunks are then inserted
+            one at a time, as a session may not be used concurrently.
+
+        """
+        settings = NetdbSettings.get_settings()
+        workers = 1 if session else max(settings.insert_concurrency, 1)
+
+        def insert(chunk: list) -> int:
+            result = self.collection.insert_many(chunk, ordered=False, session=session)
+
+            return len(result.inserted_ids)
+
+        inserted = 0
+        errors: list = []
+        pending: set = set()
+
+        def collect(done: set) -> None:
+            nonlocal inserted
+
+            for future in done:
+                error = future.exception()
+
+                if error is None:
+                    inserted += future.result()
+                    continue
+
+                # Unordered inserts insert the other documents of a failed chunk.
+                if isinstance(error, BulkWriteError):
+                    inserted += error.details.get('nInserted', 0)
+
+                errors.append(error)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for chunk in _dump_chunks(documents, settings.insert_chunk_size):
+                    if len(pending) >= workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+
+                    if errors:
+                        break
+
+                    pending.add(executor.submit(insert, chunk))
+
+            finally:
+                collect(wait(pending).done)
+
+        if errors:
+            raise NetDBException(
+                code=500,
+                message=f'{self.collection_name}: insert failed after {inserted} '
+                f'documents were inserted: {errors[0]}',
+                out={'inserted': inserted},
+            ) from errors[0]
+
+        return inserted
+
+    def reload_swap(self, documents: Iterable, filt: dict) -> bool:
+        """
+        Reload the collection without a replica set (see reload()) by way of a
+        staging collection, which replaces the collection once fully loaded. Readers
+        thus see either the old or the new collection but never a partial reload.
+
+        The staging collection is created with the indexes of the collection and the
+        new documents are bulk loaded into it. The surviving documents (i.e. those not
+        matching filt) are then copied into it by MongoDB ($merge) and it is renamed
+        to the collection (renameCollection, which is atomic). Only this copy and
+        rename (the swap window) are serialized with the other writes to the
+        collection, by its swap lock (see _swap_window() and _column_write()), so that
+        no write is lost. Column reads whose cursor is killed by the rename are resumed
+        (see _resumable()).
+
+        documents:
+            New documents to load into the collection (e.g. a generator)
+
+        filt:
+            Filter matching the documents to be replaced (e.g. `{'datasource':
+            'netbox'}`)
+
+        """
+        owner = uuid.uuid4().hex
+
+        # Concurrent swap reloads of the collection each load their own staging
+        # collection.
+        staging = self.database[f'{self.collection_name}.staging.{owner}']
+
+        try:
+            for keys, options in _staging_indexes(self.collection.index_information()):
+                staging.create_index(keys, **options)
+
+            MongoAPI(self.database.name, staging.name).insert_chunked(documents)
+
+            with self._swap_window(owner) as lock:
+                self.collection.aggregate(_merge_pipeline(filt, staging.name))
+
+                # Writes may have been made since the lock expired (e.g. while the
+                # documents were copied): they would be dropped by the rename.
+                if not lock():
+                    raise NetDBException(
+                        code=503,
+                        message=f'{self.collection_name}: reload lock expired, '
+                        'retry later.',
+                    )
+
+                staging.rename(self.collection_name, dropTarget=True)
+
+        except Exception:
+            staging.drop()
+            raise
 
         return True
 
+    @contextmanager
+    def _swap_window(self, owner: str) -> Iterator[Callable[[], bool]]:
+        """
+        Hold the swap lock of the collection for a swap reload (see reload_swap()),
+        once the writes in progress are done. Column writes wait for the lock to be
+        released (see _column_write()). The lock is renewed while held (see
+        _renewing()). Yields renew(), which renews the lock once more and returns
+        false if it expired in the meantime.
+
+        Raises a NetDBException (503) if the lock is not taken or the writes are not
+        done within `swap_lock_wait' seconds.
+
+        owner:
+            Identifies the swap reload
+
+        """
+        settings = NetdbSettings.get_settings()
+
+        lock = MongoAPI(self.database.name, settings.revision_table)
+        lock_name = _swap_lock(self.collection_name)
+        deadline = time.monotonic() + settings.swap_lock_wait
+
+        while not lock.acquire_lock(lock_name, owner, settings.swap_lock_ttl):
+            if time.monotonic() >= deadline:
+                raise _swap_timeout(self.collection_name, 'another reload')
+
+            time.sleep(_SWAP_LOCK_POLL)
+
+        try:
+            with _renewing(lock, lock_name, owner, settings.swap_lock_ttl):
+                # Writes starting from now on wait for the lock to be released.
+                while lock.count_locks(_write_locks(self.collection_name)):
+                    if time.monotonic() >= deadline:
+                        raise _swap_timeout(self.collection_name, 'writes in progress')
+
+                    time.sleep(_SWAP_LOCK_POLL)
+
+                yield lambda: lock.renew_lock(lock_name, owner, settings.swap_lock_ttl)
+
+        finally:
+            lock.release_lock(lock_name, owner)
+
     def write_one(self, document: Union[NetdbDocument, OverrideDocument]) -> str:
         """
         Add a single document to a collection
@@ -123,7 +1370,8 @@ class MongoAPI:
             A dict representing the new document to load into the collection
 
         """
-        return str(self.collection.insert_one(document.model_dump).inserted_id)
+        with self._column_write():
+            return str(self.collection.insert_one(_dump(document)).inserted_id)
 
     def replace_one(self, document: Union[NetdbDocument, OverrideDocument]) -> bool:
         """
@@ -134,19 +1382,95 @@ class MongoAPI:
             place of an existing document
 
         """
-        filt = {
-            'set_id': document.set_id,
-            'category': document.category,
-            'family': document.family,
-            'element_id': document.element_id,
-        }
+        with self._column_write():
+            return bool(
+                self.collection.replace_one(
+                    _replace_filter(document), _dump(document)
+                ).modified_count
+            )
+
+    def write_delta(self, added: list, changed: list, removed: list) -> bool:
+        """
+        Apply a delta reload, i.e. insert added documents, replace changed ones and
+        delete removed ones, using a single unordered bulk write. This is done as a
+        single transaction provided that transactions are enabled.
 
-        if isinstance(document, NetdbDocument):
-            filt.update({'datasource': document.datasource})
+        added:
+            Documents to insert into the collection
 
-        return bool(
-            self.collection.replace_one(filt, document.model_dump()).modified_count
-        )
+        changed:
+            Documents to replace their stored copies with
+
+        removed:
+            Stored documents to delete from the collection
+
+        """
+        operations = _delta_operations(added, changed, removed)
+
+        if not operations:
+            return False
+
+        with self._column_write():
+            if NetdbSettings.get_settings().transactions:
+                with self.client.start_session() as session:
+                    with session.start_transaction():
+                        self.collection.bulk_write(
+                            operations, ordered=False, session=session
+                        )
+            else:
+                self.collection.bulk_write(operations, ordered=False)
+
+            return True
+
+    def replace_many(self, documents: list) -> dict:
+        """
+        Upsert documents in place of their stored copies using a single unordered bulk
+        write. This is done as a single transaction provided that transactions are
+        enabled. Returns the matched, modified and upserted document counts.
+
+        documents:
+            List of documents to upsert into the collection
+
+        """
+        if not documents:
+            return _bulk_counts(None)
+
+        operations = _replace_operations(documents)
+
+        with self._column_write():
+            if NetdbSettings.get_settings().transactions:
+                with self.client.start_session() as session:
+                    with session.start_transaction():
+                        result = self.collection.bulk_write(
+                            operations, ordered=False, session=session
+                        )
+            else:
+                result = self.collection.bulk_write(operations, ordered=False)
+
+            return _bulk_counts(result)
+
+    def insert_unordered(self, documents: list) -> dict:
+        """
+        Insert documents with a single unordered insert. Documents failing to insert
+        (e.g. clashing with stored ones) do not stop the others from being inserted.
+        Returns the inserted and failed document counts.
+
+        documents:
+            List of documents to insert into the collection
+
+        """
+        if not documents:
+            return _insert_counts(0)
+
+        with self._column_write():
+            try:
+                self.collection.insert_many(
+                    [_dump(document) for document in documents], ordered=False
+                )
+            except BulkWriteError as e:
+                return _insert_counts(0, e)
+
+            return _insert_counts(len(documents))
 
     def delete_many(self, filt: dict) -> int:
         """
@@ -156,16 +1480,364 @@ class MongoAPI:
             Filter to use when deleting documents from the collection
 
         """
-        return self.collection.delete_many(filt).deleted_count
+        with self._column_write():
+            return self.collection.delete_many(filt).deleted_count
 
-    def create_index(self, index: list) -> bool:
+    def check_reload(self) -> None:
         """
-        Index a collection using a compound (multi-key) index
+        Raise a NetDBException (409) if a swap reload is replacing the (column)
+        collection, e.g. before writing overrides of the column.
 
-        index:
-            the set of keys (i.e. compound index) used to index the collection
+        """
+        settings = NetdbSettings.get_settings()
+
+        if _locks_writes(self.collection_name):
+            lock = MongoAPI(self.database.name, settings.revision_table)
+            _check_swap(
+                self.collection_name, lock.lock_owner(_swap_lock(self.collection_name))
+            )
 
+    @contextmanager
+    def _column_write(self) -> Iterator[None]:
         """
-        self.collection.create_index(index, unique=True)
+        Hold a write lock of the collection while writing to it, so that no swap
+        reload replaces the collection (see _swap_window()), and drops the write, in
+        the meantime. Each write holds its own lock document, so writes do not wait
+        for one another. A write waits for a swap reload replacing the collection for
+        up to `swap_lock_wait' seconds, and then raises a NetDBException (409). Only
+        column writes with swap reloads enabled (and transactions disabled) take a
+        lock.
 
-        return True
+        """
+        settings = NetdbSettings.get_settings()
+
+        if not _locks_writes(self.collection_name):
+            yield
+            return
+
+        lock = MongoAPI(self.database.name, settings.revision_table)
+        owner = uuid.uuid4().hex
+        lock_name = f'{_write_locks(self.collection_name)}{owner}'
+        deadline = time.monotonic() + settings.swap_lock_wait
+
+        # The write lock is taken before the swap lock is checked, and the swap lock
+        # taken before the write locks are checked, so either the write or the swap
+        # reload waits for the other.
+        while True:
+            lock.acquire_lock(lock_name, owner, settings.swap_lock_ttl)
+
+            swap = lock.lock_owner(_swap_lock(self.collection_name))
+            if not swap:
+                break
+
+            lock.release_lock(lock_name, owner)
+
+            if time.monotonic() >= deadline:
+                _check_swap(self.collection_name, swap)
+
+            time.sleep(_SWAP_LOCK_POLL)
+
+        try:
+            with _renewing(lock, lock_name, owner, settings.swap_lock_ttl):
+                yield
+        finally:
+            lock.release_lock(lock_name, owner)
+
+    def backfill_content_hash(self, batch_size: int = 1000) -> int:
+        """
+        Set the content hash of column documents stored without one. Documents are
+        updated in unordered bulk writes of up to batch_size documents. Returns the
+        number of documents updated.
+
+        batch_size: ``1000``
+            Number of documents updated per bulk write
+
+        """
+        with self._column_write():
+            count = 0
+
+            while documents := list(
+                self.collection.find(_MISSING_CONTENT_HASH, limit=batch_size)
+            ):
+                result = self.collection.bulk_write(
+                    _backfill_operations(documents), ordered=False
+                )
+                count += result.modified_count
+
+            return count
+
+
+class AsyncMongoAPI:
+    """
+    asyncio (motor) implementation of the MongoAPI reads. Used by the async ODM path
+    when the `async_driver' setting is enabled. Reads are built by the same helpers as
+    those of MongoAPI. Writes, which are comparatively rare and long running, are
+    made with the blocking MongoAPI in self.blocking, run in the threadpool by the
+    async ODMs.
+
+    """
+
+    def __init__(self, database: str, collection: str):
+        """
+        Initialize a MongoDB connection. The underlying AsyncIOMotorClient is taken from
+        the process wide MongoClientRegistry.
+
+        database:
+            MongoDB database to connect to
+
+        collection:
+            MongoDB collection to use
+
+        """
+        self.client: AsyncIOMotorClient = MongoClientRegistry.get_async_client(
+            _read_preference()
+        )
+
+        self.collection_name = collection
+
+        cursor = self.client[database]
+        self.database = cursor
+        self.collection = cursor[collection]
+
+        self.blocking = MongoAPI(database, collection)
+
+    async def read_revision(self, column_type: str) -> RevisionDocument:
+        """
+        Read the revision counter of a column from the (revision) collection.
+
+        column_type:
+            The column type (e.g. `bgp')
+
+        """
+        return _revision_document(
+            column_type, await self.collection.find_one({'_id': column_type})
+        )
+
+    async def iter_column(
+        self,
+        query: Union[dict, None] = None,
+        fields: Optional[List[str]] = None,
+        sort: Optional[List[str]] = None,
+    ) -> AsyncIterator[NetdbDocument]:
+        """
+        Iterate over column (NetdbDocument) documents in the collection filtered by
+        query. See MongoAPI.iter_column().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        sort: ``None``
+            Return the documents of a set in ascending order of these fields, and
+            then of their document key
+
+        """
+        convert = _partial_document if fields else _netdb_document
+
+        async for document in _resumable_async(
+            _column_find(self.collection, query, fields, _set_sort(sort))
+        ):
+            yield convert(document)
+
+    async def read_column(
+        self, query: Union[dict, None] = None, fields: Optional[List[str]] = None
+    ) -> List[NetdbDocument]:
+        """
+        Read column (NetdbDocument) documents from the collection filtered by query.
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        fields: ``None``
+            Only read these fields (e.g. `['set_id']'). Partial documents are
+            returned.
+
+        """
+        return [document async for document in self.iter_column(query, fields)]
+
+    async def iter_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[NetdbDocument]:
+        """
+        Iterate over the winning (highest weight) column documents filtered by query.
+        See MongoAPI.iter_column_resolved().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        show_hidden: ``False``
+            Also consider elements with weight < 1
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        """
+        convert = _partial_document if fields else _netdb_document
+
+        async for document in _resumable_async(
+            _resolved_find(self.collection, query, show_hidden, fields)
+        ):
+            yield convert(document)
+
+    async def read_column_resolved(
+        self,
+        query: Union[dict, None] = None,
+        show_hidden: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> List[NetdbDocument]:
+        """
+        Read the winning (highest weight) column documents filtered by query. See
+        MongoAPI.read_column_resolved().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        show_hidden: ``False``
+            Also consider elements with weight < 1
+
+        fields: ``None``
+            Only read these fields. Partial documents are returned.
+
+        """
+        return [
+            document
+            async for document in self.iter_column_resolved(query, show_hidden, fields)
+        ]
+
+    async def iter_raw(self, query: Union[dict, None] = None) -> AsyncIterator[dict]:
+        """
+        Iterate over the raw stored documents in the collection filtered by query.
+        See MongoAPI.iter_raw().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        """
+        cursor: AsyncIterable[dict]
+
+        if self.collection_name not in COLUMN_TYPES:
+            cursor = _column_find(self.collection, query, None, None)()
+        else:
+            cursor = _resumable_async(
+                _column_find(self.collection, query, None, ['set_id'])
+            )
+
+        async for document in cursor:
+            yield document
+
+    async def read_set_ids(self, query: Union[dict, None] = None) -> List[str]:
+        """
+        Read the distinct set_ids in the collection filtered by query. See
+        MongoAPI.read_set_ids().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        """
+        return await self.collection.distinct('set_id', query or {})
+
+    async def read_set_ids_sorted(self, query: dict, limit: int) -> List[str]:
+        """
+        Read the first limit distinct set_ids in the collection filtered by query in
+        ascending order. See MongoAPI.read_set_ids_sorted().
+
+        query:
+            Filter to use when reading documents from the collection
+
+        limit:
+            Maximum number of set_ids to read
+
+        """
+
+        async def read() -> List[str]:
+            return [
+                document['_id']
+                async for document in self.collection.aggregate(
+                    _set_ids_pipeline(query, limit)
+                )
+            ]
+
+        return await _retried_async(read)
+
+    async def read_snapshot(
+        self,
+        query: dict,
+        column_types: List[str],
+        resolved: bool = False,
+        show_hidden: bool = False,
+    ) -> tuple[dict, List[OverrideDocument]]:
+        """
+        Read the documents matching query from several column collections together
+        with their overrides from a single snapshot. See MongoAPI.read_snapshot().
+
+        query:
+            Filter to use when reading documents
+
+        column_types:
+            The column collections to read
+
+        resolved: ``False``
+            Only read the winning document for each element
+
+        show_hidden: ``False``
+            Also consider elements with weight < 1 when resolved
+
+        """
+
+        async def read() -> tuple[dict, List[OverrideDocument]]:
+            async with await self.client.start_session(snapshot=True) as session:
+                columns = {}
+                for column_type in column_types:
+                    columns[column_type] = [
+                        _netdb_document(document)
+                        async for document in _column_read(
+                            self.database[column_type],
+                            query,
+                            resolved,
+                            show_hidden,
+                            session=session,
+                        )
+                    ]
+
+                overrides = [
+                    _override_document(document)
+                    async for document in self.collection.find(
+                        _snapshot_overrides(query, column_types), session=session
+                    )
+                ]
+
+            return columns, overrides
+
+        return await _retried_async(read)
+
+    async def read_overrides(
+        self,
+        query: Union[dict, None] = None,
+        sort: Optional[List[str]] = None,
+        limit: int = 0,
+    ) -> List[OverrideDocument]:
+        """
+        Read override (OverrideDocument) documents from the collection filtered by query.
+        See MongoAPI.read_overrides().
+
+        query: ``None``
+            Filter to use when reading documents from the collection
+
+        sort: ``None``
+            Return documents in ascending order of these fields
+
+        limit: ``0``
+            Maximum number of documents to read. 0: no limit.
+
+        """
+        return [
+            _override_document(document)
+            async for document in self.collection.find(
+                query or {}, sort=_sort(sort), limit=limit
+            )
+        ]
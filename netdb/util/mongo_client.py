@@ -0,0 +1,243 @@
+import os
+import time
+import threading
+import logging
+from typing import Optional, Dict, Tuple
+from pymongo import MongoClient, ReadPreference
+from pymongo.monitoring import ConnectionPoolListener
+from motor.motor_asyncio import AsyncIOMotorClient
+from config.settings import NetdbSettings
+
+logger = logging.getLogger(__name__)
+
+# Pool event counters kept by PoolMetrics.
+COUNTERS = (
+    'pools_created',
+    'pools_cleared',
+    'connections_created',
+    'connections_closed',
+    'checkouts',
+    'checkins',
+)
+
+
+class PoolMetrics(ConnectionPoolListener):
+    """
+    pymongo connection pool listener which keeps running counters of connection
+    checkouts and of the time spent waiting for a pooled connection. Shared by all
+    clients in the MongoClientRegistry.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Zero all counters.
+
+        """
+        with self._lock:
+            self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+            self.checkout_failures: Dict[str, int] = {}
+            self.wait_time_total_ms = 0.0
+            self.wait_time_max_ms = 0.0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counts[counter] += 1
+
+    def _wait_done(self) -> float:
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+
+        if started is None:
+            return 0.0
+
+        return (time.monotonic() - started) * 1000
+
+    def pool_created(self, event):
+        self._count('pools_created')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count('pools_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count('connections_created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count('connections_closed')
+
+    def connection_check_out_started(self, event):
+        # Check out events are published on the thread doing the checkout.
+        self._local.started = time.monotonic()
+
+    def connection_check_out_failed(self, event):
+        waited = self._wait_done()
+
+        with self._lock:
+            self.checkout_failures[event.reason] = (
+                self.checkout_failures.get(event.reason, 0) + 1
+            )
+            self.wait_time_total_ms += waited
+            self.wait_time_max_ms = max(self.wait_time_max_ms, waited)
+
+    def connection_checked_out(self, event):
+        waited = self._wait_done()
+
+        with self._lock:
+            self.counts['checkouts'] += 1
+            self.wait_time_total_ms += waited
+            self.wait_time_max_ms = max(self.wait_time_max_ms, waited)
+
+    def connection_checked_in(self, event):
+        self._count('checkins')
+
+    def as_dict(self) -> dict:
+        """
+        Return a snapshot of the pool counters.
+
+        """
+        with self._lock:
+            counts = self.counts
+            attempts = counts['checkouts'] + sum(self.checkout_failures.values())
+
+            return {
+                'pools_created': counts['pools_created'],
+                'pools_cleared': counts['pools_cleared'],
+                'connections_created': counts['connections_created'],
+                'connections_closed': counts['connections_closed'],
+                'connections_open': (
+                    counts['connections_created'] - counts['connections_closed']
+                ),
+                'checkouts': counts['checkouts'],
+                'checkins': counts['checkins'],
+                'checked_out': counts['checkouts'] - counts['checkins'],
+                'checkout_failures': dict(self.checkout_failures),
+                'wait_time_total_ms': round(self.wait_time_total_ms, 3),
+                'wait_time_max_ms': round(self.wait_time_max_ms, 3),
+                'wait_time_avg_ms': (
+                    round(self.wait_time_total_ms / attempts, 3) if attempts else 0.0
+                ),
+            }
+
+
+class MongoClientRegistry:
+    """
+    Process wide registry of pooled MongoClient instances keyed by (mongo_url, read
+    preference). MongoAPI instances are short lived (one or more per request) and take
+    their client from here rather than opening a new connection pool of their own.
+    AsyncMongoAPI instances take their AsyncIOMotorClient from here in the same way.
+
+    """
+
+    __clients__: Dict[Tuple[str, str], MongoClient] = {}
+
+    __async_clients__: Dict[Tuple[str, str], AsyncIOMotorClient] = {}
+
+    __lock__ = threading.Lock()
+
+    # pid of the process which created the pooled clients. MongoClient is not fork
+    # safe, so pre-fork clients are discarded by a forked (e.g. gunicorn) worker.
+    __pid__: Optional[int] = None
+
+    __metrics__ = PoolMetrics()
+
+    @classmethod
+    def _get(cls, clients: dict, client_class, read_preference):
+        settings = NetdbSettings.get_settings()
+
+        key = (settings.mongo_url, read_preference.name)
+
+        with cls.__lock__:
+            if cls.__pid__ != os.getpid():
+                cls.__clients__.clear()
+                cls.__async_clients__.clear()
+                cls.__pid__ = os.getpid()
+
+            client = clients.get(key)
+
+            if client is None:
+                logger.info(
+                    "Creating pooled %s (read preference %s)",
+                    client_class.__name__,
+                    read_preference.name,
+                )
+
+                client = client_class(
+                    settings.mongo_url,
+                    read_preference=read_preference,
+                    maxPoolSize=settings.mongo_max_pool_size,
+                    minPoolSize=settings.mongo_min_pool_size,
+                    maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+                    waitQueueTimeoutMS=settings.mongo_wait_queue_timeout_ms,
+                    event_listeners=[cls.__metrics__],
+                )
+                clients[key] = client
+
+        return client
+
+    @classmethod
+    def get_client(cls, read_preference=ReadPreference.PRIMARY) -> MongoClient:
+        """
+        Return the pooled client for the configured mongo_url and the requested read
+        preference, creating it on first use.
+
+        read_preference: ``ReadPreference.PRIMARY``
+            pymongo read preference to be used by the client
+
+        """
+        return cls._get(cls.__clients__, MongoClient, read_preference)
+
+    @classmethod
+    def get_async_client(
+        cls, read_preference=ReadPreference.PRIMARY
+    ) -> AsyncIOMotorClient:
+        """
+        Return the pooled asyncio (motor) client for the configured mongo_url and the
+        requested read preference, creating it on first use.
+
+        read_preference: ``ReadPreference.PRIMARY``
+            pymongo read preference to be used by the client
+
+        """
+        return cls._get(cls.__async_clients__, AsyncIOMotorClient, read_preference)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Close all pooled clients. Called at API shutdown time.
+
+        """
+        with cls.__lock__:
+            for client in cls.__clients__.values():
+                client.close()
+
+            for async_client in cls.__async_clients__.values():
+                async_client.close()
+
+            cls.__clients__.clear()
+            cls.__async_clients__.clear()
+
+    @classmethod
+    def get_metrics(cls) -> dict:
+        """
+        Return connection pool metrics for this worker process.
+
+        """
+        return {
+            'pid': os.getpid(),
+            'clients': len(cls.__clients__) + len(cls.__async_clients__),
+            **cls.__metrics__.as_dict(),
+        }
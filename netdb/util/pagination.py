@@ -0,0 +1,125 @@
+import json
+import base64
+import binascii
+from typing import Any, Optional
+from beartype.typing import List
+
+from config.settings import NetdbSettings
+from util.exception import NetDBException
+
+
+def encode_cursor(values: List[Optional[str]]) -> str:
+    """
+    Return an opaque page cursor holding the index key values (e.g. set_id, category,
+    family, element_id) of the last item on a page.
+
+    values:
+        Index key values of the last item returned
+
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Optional[str]]:
+    """
+    Return the index key values held by a cursor returned by encode_cursor(). Raises
+    a NetDBException if the cursor is not a valid cursor for size index keys.
+
+    cursor:
+        The opaque cursor passed in by the consumer
+
+    size:
+        Expected number of index key values
+
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(value is None or isinstance(value, str) for value in values)
+    ):
+        raise NetDBException(code=422, message='Invalid page cursor.')
+
+    return values
+
+
+def page_limit(limit: Optional[int]) -> int:
+    """
+    Return the number of items on a page, capped at the `page_max_limit' setting.
+
+    limit:
+        Page size requested by the consumer. Maximum if not given.
+
+    """
+    max_limit = NetdbSettings.get_settings().page_max_limit
+
+    return min(limit or max_limit, max_limit)
+
+
+def after_key(fields: List[str], values: List[Optional[str]]) -> dict:
+    """
+    Return a MongoDB filter matching documents sorting after the given compound index
+    key, i.e. continuing an ascending scan of an index on fields. The filter only
+    holds index range predicates so that each page is an index range scan rather
+    than a skip.
+
+    Missing (None) keys sort before all strings, as in MongoDB.
+
+    fields:
+        Index key fields in index order (e.g. `['set_id', 'category']')
+
+    values:
+        Index key values of the last item on the previous page
+
+    """
+
+    def greater(value: Any) -> dict:
+        return {'$ne': None} if value is None else {'$gt': value}
+
+    return {
+        '$or': [
+            {
+                **dict(zip(fields[:count], values[:count])),
+                fields[count]: greater(values[count]),
+            }
+            for count in range(len(fields))
+        ]
+    }
+
+
+def set_id_range(
+    filt: dict, after: Optional[str] = None, last: Optional[str] = None
+) -> dict:
+    """
+    Return filt restricted to the sets after set_id after up to and including set_id
+    last, e.g. for reading the sets of a page.
+
+    filt:
+        Column query filter as returned by generate_filter()
+
+    after: ``None``
+        set_id of the last set on the previous page, if any
+
+    last: ``None``
+        set_id of the last set on the page, if known
+
+    """
+    condition: dict = {}
+
+    if 'set_id' in filt:
+        condition['$eq'] = filt['set_id']
+
+    if after is not None:
+        condition['$gt'] = after
+
+    if last is not None:
+        condition['$lte'] = last
+
+    if not condition:
+        return filt
+
+    return {**filt, 'set_id': condition}